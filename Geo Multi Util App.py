@@ -7,14 +7,80 @@ import os
 from glob import glob
 import sys
 import random
+import bisect
+import gzip
+import csv
+import json
+import zlib
+import mmap
+import tempfile
+import concurrent.futures
 import time
+import argparse
+import socket
+import struct
+import threading
+import queue
+import select
+from array import array
+from collections import deque, OrderedDict
+import asyncio
+import ipaddress
+import shlex
+import signal
+import locale
+import errno
+import functools
+import codecs
+import hmac
+import base64
 
 # Conditional import for Windows console minimization
 if platform.system() == "Windows":
     import ctypes
 
+# Conditional import for the native Linux network reader (interface ioctls)
+if platform.system() == "Linux":
+    import fcntl
+
 # --- Configuration ---
 LAUNCHER_FOLDER_NAME = "Program Launcher"
+NETWORK_FIXTURES_FOLDER_NAME = "Network Fixtures"
+NETWORK_DATA_FOLDER_NAME = "Network Data"
+OUI_DATABASE_FILE = "oui.bin.gz" # Ships as a partial seed; rebuild from the IEEE registry with --build-oui
+OUI_REGISTRY_FILE = "oui.csv" # The full IEEE MA-L export (standards-oui.ieee.org/oui/oui.csv), used when present
+OUI_FULL_REGISTRY_MIN = 20000 # The IEEE MA-L registry has ~38,000 assignments; fewer means a partial list
+HISTORY_FILE_NAME = "network_history.ring"
+HISTORY_CAPACITY = 1024 # Snapshots kept before the oldest is overwritten
+HISTORY_RECORD_SIZE = 2048 # Bytes per snapshot slot (compressed JSON of all adapters)
+THROUGHPUT_TEST_PORT = 5201
+THROUGHPUT_TEST_FILE_SIZE = 16 << 20 # Payload file sent repeatedly with sendfile
+LATENCY_HISTORY_SAMPLES = 120 # Points per target in the live latency graph
+LATENCY_DEFAULT_TARGETS = "1.1.1.1:443, 8.8.8.8:53"
+DNS_TIMEOUT = 1.0 # Seconds per reverse lookup attempt
+DNS_MAX_WORKERS = 8
+METRICS_DEFAULT_PORT = 9477
+FLEET_AGENT_PORT = 9478
+FLEET_MAX_MESSAGE = 4 << 20 # Largest length-prefixed frame the agent or collector accepts
+FLEET_TOKEN_ENV = "GEO_FLEET_TOKEN" # Shared token for agents and collectors, kept off the command line
+SYSFS_NET_PATH = "/sys/class/net"
+PROC_NET_DEV_PATH = "/proc/net/dev"
+PROC_NET_WIRELESS_PATH = "/proc/net/wireless"
+LINK_STATS_INTERVAL_MS = 1000
+PROC_PATH = "/proc"
+THROUGHPUT_HISTORY_SECONDS = 60
+NETWORK_SNAPSHOT_TTL = 5.0 # Seconds a cached adapter snapshot is served before re-querying the OS
+SWEEP_PORTS = (22, 53, 80, 135, 139, 443, 445, 3389, 8080) # Common services used to find live hosts
+SWEEP_MAX_HOSTS = 4096
+COMMAND_TIMEOUT = 20.0 # Seconds before a system command (and its children) is killed
+COMMAND_MAX_CONCURRENCY = 4 # System commands allowed to run at once, app-wide
+COMMAND_CACHE_MAX_BYTES = 4 << 20 # Captured output kept by the command-result cache before LRU eviction
+NETWORK_COMMAND_CACHE_TTL = 1.0 # Lets overlapping refreshes share one 'ipconfig /all' / 'ifconfig' run
+CONVERTER_BACKGROUND_DIGITS = 20000 # Longer inputs are converted off the Tk thread
+CONVERTER_PREVIEW_DIGITS = 120 # Longer results are shown abbreviated (Copy still copies all of it)
+DIAGNOSTIC_TIMEOUT = 300.0 # Streamed diagnostics (ping, traceroute) may legitimately run for minutes
+DIAGNOSTIC_SCROLLBACK = 5000 # Lines kept in the diagnostic console
+DIAGNOSTIC_TICK_MS = 50 # How often queued console output is flushed into the Text widget
 
 # --- Utility Functions for App Launcher (Unchanged) ---
 
@@ -71,81 +137,3558 @@ def load_launcher_apps(script_dir):
 
     return app_data, None
 
-# --- Utility Functions for Network Information (Unchanged) ---
+# --- Utility Functions for Network Information ---
 
-def get_network_info():
-    """Retrieves network information."""
-    if platform.system() == "Windows":
-        command = "ipconfig /all"
-    elif platform.system() == "Linux":
-        command = "ip a"
-    elif platform.system() == "Darwin": # macOS
-        command = "ifconfig"
+def get_network_adapters():
+    """
+    Retrieves every adapter on this machine.
+    Returns ({name: AdapterRecord}, None) or ({}, error message).
+    """
+    system = platform.system()
+    if system == "Linux":
+        try:
+            return get_netlink_adapters(), None
+        except OSError:
+            # Netlink unavailable (e.g. restricted sandbox): fall back to reading /sys
+            return get_sysfs_adapters()
+
+    if system == "Windows":
+        command, parser = ["ipconfig", "/all"], parse_ipconfig_output
+    elif system == "Darwin": # macOS
+        command, parser = ["ifconfig"], parse_ifconfig_output
     else:
-        return {"Error": {"ipv4": "OS Not Supported", "mac": "OS Not Supported"}}
+        return {}, "OS Not Supported"
         
-    output, error = run_command(command)
+    output, error = run_command(command, cache_ttl=NETWORK_COMMAND_CACHE_TTL)
     
     if error:
-        return {"Error": {"ipv4": f"Command Failed: {error}", "mac": ""}}
+        return {}, f"Command Failed: {error}"
+
+    return build_adapter_records(parser(output)), None
+
+def get_network_info():
+    """Retrieves network information as the original {name: {"ipv4", "mac", "state"}} dictionary."""
+    adapters, error = get_network_adapters()
+    if error:
+        return {"Error": {"ipv4": error, "mac": ""}}
+    if not adapters:
+        return {"No Active Connection": {"ipv4": "N/A", "mac": "N/A"}}
+    return {name: {"ipv4": record.primary_ipv4 or "Not Found",
+                   "mac": record.mac or "Not Found",
+                   "state": record.state}
+            for name, record in adapters.items()}
+
+def _new_interface(name):
+    """Common per-interface record produced by every network backend and text parser."""
+    return {"name": name, "mac": None, "mtu": None, "state": "unknown", "loopback": False,
+            "ipv4": [], "ipv6": [], "gateway": [], "dns": [],
+            "dhcp_enabled": None, "dhcp_server": None}
+
+def normalize_mac(mac):
+    """Formats a MAC like the Windows 'Physical Address' (upper case, hyphens); None if unset."""
+    if not mac:
+        return None
+    mac = mac.upper().replace(':', '-')
+    return None if mac == "00-00-00-00-00-00" else mac
+
+class AdapterRecord:
+    """
+    Immutable snapshot of one network adapter. Addresses are tuples of (address, prefix
+    length), so two records compare (and diff) field by field without any parsing.
+    """
 
+    __slots__ = ("name", "mac", "state", "mtu", "speed", "ipv4", "ipv6", "gateway", "dns",
+                 "dhcp_server")
+    FIELDS = __slots__
+
+    def __init__(self, name, mac=None, state="unknown", mtu=None, speed=None, ipv4=(), ipv6=(),
+                 gateway=(), dns=(), dhcp_server=None):
+        for field, value in (("name", name), ("mac", mac), ("state", state), ("mtu", mtu),
+                             ("speed", speed), ("ipv4", tuple(ipv4)), ("ipv6", tuple(ipv6)),
+                             ("gateway", tuple(gateway)), ("dns", tuple(dns)),
+                             ("dhcp_server", dhcp_server)):
+            object.__setattr__(self, field, value)
+
+    def __setattr__(self, field, value):
+        raise AttributeError("AdapterRecord is immutable")
+
+    @classmethod
+    def from_interface(cls, interface, speed=None):
+        """Builds a record from the dictionaries produced by the backends and parsers."""
+        return cls(interface["name"], mac=normalize_mac(interface["mac"]), state=interface["state"],
+                   mtu=interface["mtu"], speed=speed if speed is not None else interface.get("speed"),
+                   ipv4=interface["ipv4"], ipv6=interface["ipv6"], gateway=interface["gateway"],
+                   dns=interface["dns"], dhcp_server=interface["dhcp_server"])
+
+    def _key(self):
+        return (self.name, self.mac, self.state, self.mtu, self.speed, self.ipv4, self.ipv6,
+                self.gateway, self.dns, self.dhcp_server)
+
+    def __eq__(self, other):
+        return isinstance(other, AdapterRecord) and self._key() == other._key()
+
+    def __hash__(self):
+        return hash(self._key())
+
+    def __repr__(self):
+        return f"AdapterRecord({', '.join(f'{f}={getattr(self, f)!r}' for f in self.FIELDS)})"
+
+    def diff(self, other):
+        """Returns the names of the fields that differ from another record."""
+        return [field for field in self.FIELDS if getattr(self, field) != getattr(other, field)]
+
+    @property
+    def primary_ipv4(self):
+        """The first usable IPv4 address, as the original parser reported it."""
+        return next((addr for addr, _prefix in self.ipv4 if addr not in ('0.0.0.0', '127.0.0.1')), None)
+
+    def to_dict(self):
+        """JSON-friendly representation (tuples become lists)."""
+        return {field: list(map(list, value)) if field in ("ipv4", "ipv6") else
+                       list(value) if isinstance(value, tuple) else value
+                for field, value in ((f, getattr(self, f)) for f in self.FIELDS)}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["name"], mac=data.get("mac"), state=data.get("state", "unknown"),
+                   mtu=data.get("mtu"), speed=data.get("speed"),
+                   ipv4=(tuple(a) for a in data.get("ipv4", ())),
+                   ipv6=(tuple(a) for a in data.get("ipv6", ())),
+                   gateway=data.get("gateway", ()), dns=data.get("dns", ()),
+                   dhcp_server=data.get("dhcp_server"))
+
+def build_adapter_records(interfaces):
+    """Turns parsed interfaces into {name: AdapterRecord}, skipping loopback and empty adapters."""
+    adapters = {}
+    for interface in interfaces:
+        if interface.get("loopback"):
+            continue
+        record = AdapterRecord.from_interface(interface)
+        if record.primary_ipv4 or record.mac:
+            adapters[record.name] = record
+    return adapters
+
+# --- Single-Pass Command Output Parsers ---
+# Each pattern is one alternation of named groups run with finditer over the whole
+# output. Every alternative is wrapped in an outer group so match.lastgroup names the
+# kind of line that matched. Patterns start with a literal newline rather than a
+# MULTILINE '^' so the regex engine can skip ahead to line starts with its fast literal
+# scan (callers prepend '\n' for the first line), and the (?=\S) after the indentation
+# stops a failed line from backtracking through every leading space. Line ends accept an
+# optional '\r' so raw CRLF captures parse the same as normalised text.
+#
+# Every ipconfig field carries a single value, so IPCONFIG_PATTERN drops the outer
+# groups: each alternative starts with a plain literal and ends in one named group, which
+# is what lastgroup reports. A branch that starts with a literal is rejected by sre on its
+# first character without entering it, which is where the saving over wrapped groups is.
+
+_IPCONFIG_ADDRESS_LIST = r"[^\r\n]*(?:\r?\n[ \t]+[0-9A-Fa-f][0-9A-Fa-f.:%]*[ \t]*(?=\r?$))*"
+
+IPCONFIG_PATTERN = re.compile(r"""
+    \n(?:
+        \S[^\r\n]*?adapter\ (?P<adapter_name>[^:\r\n]+):[ \t]*\r?$
+      | [ \t]+(?=\S)(?:
+            IPv4\ Address[.\ ]*:\ (?P<ipv4_address>\d{1,3}(?:\.\d{1,3}){3})
+          | Autoconfiguration\ IPv4\ Address[.\ ]*:\ (?P<autoconf_ipv4_address>\d{1,3}(?:\.\d{1,3}){3})
+          | IPv6\ Address[.\ ]*:\ (?P<ipv6_address>[0-9A-Fa-f:]+)
+          | Temporary\ IPv6\ Address[.\ ]*:\ (?P<temporary_ipv6_address>[0-9A-Fa-f:]+)
+          | Link-local\ IPv6\ Address[.\ ]*:\ (?P<link_local_ipv6_address>[0-9A-Fa-f:]+)
+          | Subnet\ Mask[.\ ]*:\ (?P<netmask>\d{1,3}(?:\.\d{1,3}){3})
+          | Physical\ Address[.\ ]*:\ (?P<mac>[0-9A-Fa-f]{2}(?:[-:][0-9A-Fa-f]{2}){5})
+          | Media\ State[.\ ]*:\ (?P<media_state>[^\r\n]+)
+          | DHCP\ Enabled[.\ ]*:\ (?P<dhcp_enabled>\w+)
+          | DHCP\ Server[.\ ]*:\ (?P<dhcp_server>\S+)
+          | Default\ Gateway[.\ ]*:(?P<gateways>""" + _IPCONFIG_ADDRESS_LIST + r""")
+          | DNS\ Servers[.\ ]*:(?P<dns_servers>""" + _IPCONFIG_ADDRESS_LIST + r""")
+        )
+    )
+""", re.MULTILINE | re.VERBOSE)
+
+_IPCONFIG_IPV6_KINDS = frozenset(("ipv6_address", "temporary_ipv6_address", "link_local_ipv6_address"))
+
+IP_ADDR_PATTERN = re.compile(r"""
+    \n(?:
+        (?P<link>\d+:\ (?P<ifname>[^:@\s]+)(?:@\S+)?:\ <(?P<flags>[^>]*)>[^\r\n]*?\ mtu\ (?P<mtu>\d+)[^\r\n]*?\ state\ (?P<state>\S+))
+      | [ \t]+(?=\S)(?:
+            (?P<inet>inet\ (?P<ipv4_address>[\d.]+)/(?P<ipv4_prefix>\d+))
+          | (?P<inet6>inet6\ (?P<ipv6_address>[0-9a-f:]+)/(?P<ipv6_prefix>\d+))
+          | (?P<linkaddr>link/\S+\ (?P<mac>[0-9a-f]{2}(?::[0-9a-f]{2}){5}))
+        )
+    )
+""", re.MULTILINE | re.VERBOSE)
+
+IFCONFIG_PATTERN = re.compile(r"""
+    \n(?:
+        (?P<header>(?P<ifname>[^\s:]+):\ flags=\d+<(?P<flags>[^>]*)>(?:[^\r\n]*?mtu\ (?P<mtu>\d+))?)
+      | [ \t]+(?=\S)(?:
+            (?P<inet>inet\ (?P<ipv4_address>[\d.]+)(?:\ -->\ \S+)?\s+netmask\ (?P<netmask>0x[0-9a-fA-F]{8}|[\d.]+))
+          | (?P<inet6>inet6\ (?P<ipv6_address>[0-9a-fA-F:]+)(?:%\S+)?\s+prefixlen\ (?P<ipv6_prefix>\d+))
+          | (?P<ether>ether\ (?P<mac>[0-9a-fA-F]{2}(?::[0-9a-fA-F]{2}){5}))
+          | (?P<status>status:\ (?P<state>\w+))
+        )
+    )
+""", re.MULTILINE | re.VERBOSE)
+
+@functools.lru_cache(maxsize=64) # A machine only ever shows a handful of distinct masks
+def _netmask_to_prefix(netmask):
+    """Converts a dotted ('255.255.255.0') or hex ('0xffffff00') netmask to a prefix length."""
+    value = int(netmask, 16) if netmask.startswith("0x") else int.from_bytes(socket.inet_aton(netmask), "big")
+    return bin(value).count("1")
+
+def parse_ipconfig_output(output):
+    """Parses 'ipconfig /all' output in one finditer pass. Returns a list of interface records."""
+    interfaces = []
+    current = None
+
+    for match in IPCONFIG_PATTERN.finditer('\n' + output):
+        kind = match.lastgroup
+        value = match[kind]
+        if kind == "adapter_name":
+            current = _new_interface(value.strip())
+            current["state"] = "up"
+            interfaces.append(current)
+        elif current is None:
+            continue # Host-wide lines before the first adapter block
+        elif kind in _IPCONFIG_IPV6_KINDS:
+            current["ipv6"].append((value, None))
+        elif kind == "ipv4_address" or kind == "autoconf_ipv4_address":
+            current["ipv4"].append((value, None))
+        elif kind == "netmask":
+            if current["ipv4"] and current["ipv4"][-1][1] is None:
+                current["ipv4"][-1] = (current["ipv4"][-1][0], _netmask_to_prefix(value))
+        elif kind == "mac":
+            current["mac"] = current["mac"] or value
+        elif kind == "media_state":
+            if "disconnected" in value.lower():
+                current["state"] = "down"
+        elif kind == "dhcp_enabled":
+            current["dhcp_enabled"] = value.lower() == "yes"
+        elif kind == "dhcp_server":
+            current["dhcp_server"] = value
+        elif kind == "gateways":
+            current["gateway"] = [g.split('%')[0] for g in value.split()]
+        elif kind == "dns_servers":
+            current["dns"] = value.split()
+
+    return interfaces
+
+def parse_ip_addr_output(output):
+    """Parses iproute2 'ip addr' output in one finditer pass. Returns a list of interface records."""
+    interfaces = []
+    current = None
+
+    for match in IP_ADDR_PATTERN.finditer('\n' + output):
+        kind = match.lastgroup
+        if kind == "link":
+            current = _new_interface(match.group("ifname"))
+            current["loopback"] = "LOOPBACK" in match.group("flags").split(",")
+            current["mtu"] = int(match.group("mtu"))
+            current["state"] = match.group("state").lower()
+            interfaces.append(current)
+        elif current is None:
+            continue
+        elif kind == "linkaddr":
+            current["mac"] = match.group("mac")
+        elif kind == "inet":
+            current["ipv4"].append((match.group("ipv4_address"), int(match.group("ipv4_prefix"))))
+        elif kind == "inet6":
+            current["ipv6"].append((match.group("ipv6_address"), int(match.group("ipv6_prefix"))))
+
+    return interfaces
+
+def parse_ifconfig_output(output):
+    """Parses BSD/macOS or net-tools 'ifconfig' output in one finditer pass."""
+    interfaces = []
+    current = None
+
+    for match in IFCONFIG_PATTERN.finditer('\n' + output):
+        kind = match.lastgroup
+        if kind == "header":
+            current = _new_interface(match.group("ifname"))
+            flags = match.group("flags").split(",")
+            current["loopback"] = "LOOPBACK" in flags
+            current["mtu"] = int(match.group("mtu")) if match.group("mtu") else None
+            current["state"] = "up" if "RUNNING" in flags else "down"
+            interfaces.append(current)
+        elif current is None:
+            continue
+        elif kind == "ether":
+            current["mac"] = match.group("mac")
+        elif kind == "inet":
+            current["ipv4"].append((match.group("ipv4_address"), _netmask_to_prefix(match.group("netmask"))))
+        elif kind == "inet6":
+            current["ipv6"].append((match.group("ipv6_address"), int(match.group("ipv6_prefix"))))
+        elif kind == "status":
+            # macOS reports link state separately from the RUNNING flag
+            current["state"] = "up" if match.group("state") == "active" else "down"
+
+    return interfaces
+
+def parse_ipconfig_output_linewise(output):
+    """
+    The original line-by-line 'ipconfig /all' parser (three regexes per stripped line).
+    Kept as the baseline for --bench-parsers.
+    """
     all_adapters = {}
     current_adapter_name = "N/A"
     
-    if platform.system() == "Windows":
-        adapter_name_pattern = re.compile(r"adapter ([^:]+):") 
-        ipv4_pattern = re.compile(r"IPv4 Address[.\s]*: (\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})")
-        mac_pattern = re.compile(r"Physical Address[.\s]*: ([0-9a-fA-F]{2}[-:][0-9a-fA-F]{2}[-:][0-9a-fA-F]{2}[-:][0-9a-fA-F]{2}[-:][0-9a-fA-F]{2}[-:][0-9a-fA-F]{2})")
-        
-        lines = output.split('\n')
-        all_adapters[current_adapter_name] = {"ipv4": "Not Found", "mac": "Not Found"}
+    adapter_name_pattern = re.compile(r"adapter ([^:]+):") 
+    ipv4_pattern = re.compile(r"IPv4 Address[.\s]*: (\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})")
+    mac_pattern = re.compile(r"Physical Address[.\s]*: ([0-9a-fA-F]{2}[-:][0-9a-fA-F]{2}[-:][0-9a-fA-F]{2}[-:][0-9a-fA-F]{2}[-:][0-9a-fA-F]{2}[-:][0-9a-fA-F]{2})")
+    
+    lines = output.split('\n')
+    all_adapters[current_adapter_name] = {"ipv4": "Not Found", "mac": "Not Found"}
 
-        for line in lines:
-            line = line.strip()
+    for line in lines:
+        line = line.strip()
 
-            adapter_match = adapter_name_pattern.search(line)
-            if adapter_match:
-                current_adapter_name = adapter_match.group(1).strip()
-                all_adapters[current_adapter_name] = {"ipv4": "Not Found", "mac": "Not Found"}
-                continue
+        adapter_match = adapter_name_pattern.search(line)
+        if adapter_match:
+            current_adapter_name = adapter_match.group(1).strip()
+            all_adapters[current_adapter_name] = {"ipv4": "Not Found", "mac": "Not Found"}
+            continue
 
-            if current_adapter_name in all_adapters:
-                data = all_adapters[current_adapter_name]
-                
-                ipv4_match = ipv4_pattern.search(line)
-                if ipv4_match and data["ipv4"] == "Not Found":
-                     ip = ipv4_match.group(1)
-                     if ip != '0.0.0.0' and ip != '127.0.0.1':
-                        data["ipv4"] = ip
-
-                mac_match = mac_pattern.search(line)
-                if mac_match and data["mac"] == "Not Found":
-                    data["mac"] = mac_match.group(1).replace(':', '-')
+        if current_adapter_name in all_adapters:
+            data = all_adapters[current_adapter_name]
+            
+            ipv4_match = ipv4_pattern.search(line)
+            if ipv4_match and data["ipv4"] == "Not Found":
+                 ip = ipv4_match.group(1)
+                 if ip != '0.0.0.0' and ip != '127.0.0.1':
+                    data["ipv4"] = ip
+
+            mac_match = mac_pattern.search(line)
+            if mac_match and data["mac"] == "Not Found":
+                data["mac"] = mac_match.group(1).replace(':', '-')
     
-    filtered_adapters = {name: data for name, data in all_adapters.items() 
-                         if name != "N/A" and (data.get("ipv4") != "Not Found" or data.get("mac") != "Not Found")}
-                         
-    return filtered_adapters if filtered_adapters else {"No Active Connection": {"ipv4": "N/A", "mac": "N/A"}}
+    return {name: data for name, data in all_adapters.items() 
+            if name != "N/A" and (data.get("ipv4") != "Not Found" or data.get("mac") != "Not Found")}
 
-def run_command(command):
-    """Executes a shell command and returns the output."""
+FIXTURE_PARSERS = {
+    "ipconfig_": parse_ipconfig_output,
+    "ip_addr_": parse_ip_addr_output,
+    "ifconfig_": parse_ifconfig_output,
+}
+
+def load_network_fixtures(script_dir):
+    """Loads the captured command outputs in the fixtures folder as {file name: (parser, text)}."""
+    fixtures_path = os.path.join(script_dir, NETWORK_FIXTURES_FOLDER_NAME)
+    fixtures = {}
+    for full_path in sorted(glob(os.path.join(fixtures_path, '*.txt'))):
+        file_name = os.path.basename(full_path)
+        parser = next((p for prefix, p in FIXTURE_PARSERS.items() if file_name.startswith(prefix)), None)
+        if parser:
+            with open(full_path, encoding="utf-8", newline="") as f: # Keep CRLF captures as captured
+                fixtures[file_name] = (parser, f.read())
+    return fixtures
+
+def benchmark_parsers(script_dir, iterations=2000):
+    """Times every parser on its fixtures. Returns [(fixture, parser name, adapters, seconds per parse)]."""
+    results = []
+    for file_name, (parser, text) in load_network_fixtures(script_dir).items():
+        candidates = [parser]
+        if parser is parse_ipconfig_output:
+            candidates.append(parse_ipconfig_output_linewise)
+        for candidate in candidates:
+            start = time.perf_counter()
+            for _ in range(iterations):
+                parsed = candidate(text)
+            elapsed = (time.perf_counter() - start) / iterations
+            results.append((file_name, candidate.__name__, len(parsed), elapsed))
+    return results
+
+def _read_sysfs_value(path):
+    """Reads a single sysfs attribute, returning None if it is missing or unreadable."""
     try:
-        result = subprocess.run(
-            command, 
-            shell=True, 
-            capture_output=True, 
-            text=True, 
-            check=False,
-            **({'creationflags': subprocess.CREATE_NO_WINDOW} if platform.system() == "Windows" else {})
-        )
-        
-        if result.returncode != 0:
-            return None, result.stderr.strip()
-        
-        return result.stdout, None
+        with open(path) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+def _get_interface_ipv4(ifname):
+    """Asks the kernel for an interface's primary IPv4 address (SIOCGIFADDR) without a subprocess."""
+    SIOCGIFADDR = 0x8915
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+            request = struct.pack('256s', ifname[:15].encode())
+            response = fcntl.ioctl(s.fileno(), SIOCGIFADDR, request)
+            return socket.inet_ntoa(response[20:24])
+    except OSError:
+        # EADDRNOTAVAIL: the interface exists but has no IPv4 address assigned
+        return None
+
+def _read_linux_default_gateways():
+    """Returns {ifname: [gateway, ...]} for the default routes in /proc/net/route and ipv6_route."""
+    gateways = {}
+    for _family, _destination, prefixlen, gateway, ifname, _metric in read_linux_routes():
+        if prefixlen == 0 and gateway:
+            gateways.setdefault(ifname, []).append(gateway)
+    return gateways
+
+def _enrich_linux_interfaces(interfaces):
+    """Adds the link speed (sysfs) and default gateways (/proc/net/route) to parsed interfaces."""
+    gateways = _read_linux_default_gateways()
+    for interface in interfaces:
+        speed = _read_sysfs_value(os.path.join(SYSFS_NET_PATH, interface["name"], "speed"))
+        # Unknown or down links report -1 (or fail with EINVAL)
+        interface["speed"] = int(speed) if speed and speed.lstrip('-').isdigit() and int(speed) > 0 else None
+        interface["gateway"] = gateways.get(interface["name"], [])
+    return interfaces
+
+def get_sysfs_adapters():
+    """
+    Native Linux fallback reader: /sys/class/net (name, MAC, operstate, MTU) plus an ioctl
+    for the primary IPv4 address. Returns ({name: AdapterRecord}, error message or None).
+    """
+    try:
+        interface_names = sorted(os.listdir(SYSFS_NET_PATH))
+    except OSError as e:
+        return {}, f"Cannot read {SYSFS_NET_PATH}: {e}"
+
+    interfaces = []
+    for name in interface_names:
+        base_path = os.path.join(SYSFS_NET_PATH, name)
+        interface = _new_interface(name)
+        interface["loopback"] = name == "lo"
+        interface["mac"] = _read_sysfs_value(os.path.join(base_path, "address"))
+        interface["state"] = _read_sysfs_value(os.path.join(base_path, "operstate")) or "unknown"
+        mtu = _read_sysfs_value(os.path.join(base_path, "mtu"))
+        interface["mtu"] = int(mtu) if mtu and mtu.isdigit() else None
+        ipv4 = _get_interface_ipv4(name)
+        if ipv4:
+            interface["ipv4"].append((ipv4, None))
+        interfaces.append(interface)
+
+    return build_adapter_records(_enrich_linux_interfaces(interfaces)), None
+
+# --- Netlink (rtnetlink) Adapter Enumeration ---
+
+NETLINK_ROUTE = 0
+NLMSG_ERROR, NLMSG_DONE = 2, 3
+NLM_F_REQUEST, NLM_F_DUMP = 0x1, 0x300
+RTM_NEWLINK, RTM_GETLINK = 16, 18
+RTM_NEWADDR, RTM_GETADDR = 20, 22
+RTM_NEWNEIGH, RTM_GETNEIGH = 28, 30
+IFLA_ADDRESS, IFLA_IFNAME, IFLA_MTU, IFLA_OPERSTATE = 1, 3, 4, 16
+IFA_ADDRESS, IFA_LOCAL, IFA_LABEL = 1, 2, 3
+NDA_DST, NDA_LLADDR = 1, 2
+IFF_LOOPBACK = 0x8
+IF_OPER_STATES = {0: "unknown", 1: "notpresent", 2: "down", 3: "lowerlayerdown",
+                  4: "testing", 5: "dormant", 6: "up"}
+NUD_STATES = {0x01: "INCOMPLETE", 0x02: "REACHABLE", 0x04: "STALE", 0x08: "DELAY",
+              0x10: "PROBE", 0x20: "FAILED", 0x40: "NOARP", 0x80: "PERMANENT"}
+
+_NLMSGHDR = struct.Struct("=IHHII")   # length, type, flags, seq, pid
+_IFINFOMSG = struct.Struct("=BxHiII") # family, type, index, flags, change
+_IFADDRMSG = struct.Struct("=BBBBI")  # family, prefixlen, flags, scope, index
+_NDMSG = struct.Struct("=BxxxiHBB")   # family, ifindex, state, flags, type
+_RTATTR = struct.Struct("=HH")        # length, type
+
+def _nl_align(length):
+    return (length + 3) & ~3
+
+def _parse_rtattrs(view):
+    """Splits a block of rtattr TLVs into {type: memoryview} without copying the payloads."""
+    attrs = {}
+    offset = 0
+    end = len(view)
+    while offset + _RTATTR.size <= end:
+        attr_len, attr_type = _RTATTR.unpack_from(view, offset)
+        if attr_len < _RTATTR.size:
+            break
+        attrs[attr_type] = view[offset + _RTATTR.size:offset + attr_len]
+        offset += _nl_align(attr_len)
+    return attrs
+
+class NetlinkRouteClient:
+    """
+    Minimal rtnetlink client built on the stdlib socket module. Link and address dumps
+    are requested together on two sockets so the kernel works on both before either
+    reply is read, then decoded straight out of a reused receive buffer. Neighbor
+    (ARP/NDP) dumps use the same request and decode path.
+    """
+
+    RECV_BUFFER_SIZE = 65536
+
+    def __init__(self):
+        self._seq = int(time.time())
+        self._buffer = bytearray(self.RECV_BUFFER_SIZE)
+
+    def _send_dump_request(self, msg_type, body):
+        sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+        try:
+            sock.bind((0, 0))
+            self._seq += 1
+            header = _NLMSGHDR.pack(_NLMSGHDR.size + len(body), msg_type,
+                                    NLM_F_REQUEST | NLM_F_DUMP, self._seq, 0)
+            sock.send(header + body)
+        except OSError:
+            sock.close()
+            raise
+        return sock, self._seq
+
+    def _iter_dump(self, sock, seq):
+        """
+        Yields (msg_type, payload memoryview) for every message of a dump reply. The views
+        point into the shared receive buffer, so callers must decode them before resuming.
+        """
+        view = memoryview(self._buffer)
+        while True:
+            received = sock.recv_into(self._buffer)
+            offset = 0
+            while offset + _NLMSGHDR.size <= received:
+                msg_len, msg_type, _flags, msg_seq, _pid = _NLMSGHDR.unpack_from(view, offset)
+                if msg_len < _NLMSGHDR.size:
+                    return
+                if msg_seq == seq:
+                    if msg_type == NLMSG_DONE:
+                        return
+                    if msg_type == NLMSG_ERROR:
+                        (error,) = struct.unpack_from("=i", view, offset + _NLMSGHDR.size)
+                        if error:
+                            raise OSError(-error, os.strerror(-error))
+                        return
+                    yield msg_type, view[offset + _NLMSGHDR.size:offset + msg_len]
+                offset += _nl_align(msg_len)
+
+    def dump_interfaces(self):
+        """
+        Returns {ifindex: interface record} (see _new_interface) with every IPv4 and IPv6
+        address as (addr, prefix) for every interface the kernel knows about.
+        """
+        link_sock, link_seq = self._send_dump_request(
+            RTM_GETLINK, _IFINFOMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0))
+        try:
+            addr_sock, addr_seq = self._send_dump_request(
+                RTM_GETADDR, _IFADDRMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0))
+        except OSError:
+            link_sock.close()
+            raise
+
+        interfaces = {}
+        with link_sock, addr_sock:
+            for msg_type, payload in self._iter_dump(link_sock, link_seq):
+                if msg_type != RTM_NEWLINK:
+                    continue
+                _family, _type, index, flags, _change = _IFINFOMSG.unpack_from(payload)
+                attrs = _parse_rtattrs(payload[_IFINFOMSG.size:])
+                name = attrs.get(IFLA_IFNAME)
+                mac = attrs.get(IFLA_ADDRESS)
+                mtu = attrs.get(IFLA_MTU)
+                operstate = attrs.get(IFLA_OPERSTATE)
+                interface = _new_interface(
+                    bytes(name).rstrip(b"\0").decode(errors="replace") if name is not None else str(index))
+                interface["mac"] = "-".join(f"{b:02X}" for b in mac) if mac is not None and len(mac) == 6 else None
+                interface["mtu"] = struct.unpack_from("=I", mtu)[0] if mtu is not None else None
+                interface["state"] = IF_OPER_STATES.get(operstate[0], "unknown") if operstate is not None else "unknown"
+                interface["loopback"] = bool(flags & IFF_LOOPBACK)
+                interface["flags"] = flags
+                interfaces[index] = interface
+
+            for msg_type, payload in self._iter_dump(addr_sock, addr_seq):
+                if msg_type != RTM_NEWADDR:
+                    continue
+                family, prefixlen, _flags, _scope, index = _IFADDRMSG.unpack_from(payload)
+                interface = interfaces.get(index)
+                if interface is None:
+                    continue
+                attrs = _parse_rtattrs(payload[_IFADDRMSG.size:])
+                # IFA_LOCAL is the interface's own address on point-to-point links
+                raw = attrs.get(IFA_LOCAL, attrs.get(IFA_ADDRESS))
+                if raw is None:
+                    continue
+                if family == socket.AF_INET:
+                    interface["ipv4"].append((socket.inet_ntop(socket.AF_INET, raw), prefixlen))
+                elif family == socket.AF_INET6:
+                    interface["ipv6"].append((socket.inet_ntop(socket.AF_INET6, raw), prefixlen))
+
+        return interfaces
+
+    def dump_neighbors(self):
+        """Returns [(ip, mac, ifname, state)] for the IPv4 ARP and IPv6 NDP caches."""
+        sock, seq = self._send_dump_request(RTM_GETNEIGH, _NDMSG.pack(socket.AF_UNSPEC, 0, 0, 0, 0))
+        neighbors = []
+        ifnames = {}
+        with sock:
+            for msg_type, payload in self._iter_dump(sock, seq):
+                if msg_type != RTM_NEWNEIGH:
+                    continue
+                family, index, state, _flags, _type = _NDMSG.unpack_from(payload)
+                if family not in (socket.AF_INET, socket.AF_INET6):
+                    continue
+                attrs = _parse_rtattrs(payload[_NDMSG.size:])
+                dst = attrs.get(NDA_DST)
+                if dst is None:
+                    continue
+                lladdr = attrs.get(NDA_LLADDR)
+                if index not in ifnames:
+                    try:
+                        ifnames[index] = socket.if_indextoname(index)
+                    except OSError:
+                        ifnames[index] = str(index)
+                neighbors.append((socket.inet_ntop(family, dst),
+                                  normalize_mac(bytes(lladdr).hex(":")) if lladdr is not None and len(lladdr) == 6 else None,
+                                  ifnames[index], NUD_STATES.get(state, f"0x{state:02x}")))
+        return neighbors
+
+def get_netlink_adapters():
+    """Preferred Linux backend: {name: AdapterRecord} from a single rtnetlink dump. Raises OSError."""
+    interfaces = list(NetlinkRouteClient().dump_interfaces().values())
+    return build_adapter_records(_enrich_linux_interfaces(interfaces))
+
+# --- Netlink Change Notifications ---
+
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+RTMGRP_IPV6_IFADDR = 0x100
+
+def diff_adapters(old_adapters, new_adapters):
+    """
+    Compares two {name: AdapterRecord} maps. Returns {"added": [...], "removed": [...],
+    "changed": {name: [field, ...]}}, or None when nothing differs.
+    """
+    added = [name for name in new_adapters if name not in old_adapters]
+    removed = [name for name in old_adapters if name not in new_adapters]
+    changed = {}
+    for name, new_record in new_adapters.items():
+        old_record = old_adapters.get(name)
+        if old_record is None or old_record == new_record:
+            continue
+        changed[name] = old_record.diff(new_record)
+
+    if not (added or removed or changed):
+        return None
+    return {"added": added, "removed": removed, "changed": changed}
+
+class NetlinkChangeMonitor(threading.Thread):
+    """
+    Background thread subscribed to the rtnetlink link and address multicast groups.
+    It blocks in select() until the kernel announces a change, re-reads the adapters and
+    calls on_change(adapters, diff) from this thread, so the callback must hand off to Tk.
+    If the monitor has to give up, on_error(exception) is called once from this thread.
+    """
+
+    def __init__(self, on_change, settle_delay=0.02, on_error=None):
+        super().__init__(name="NetlinkChangeMonitor", daemon=True)
+        self.on_change = on_change
+        self.on_error = on_error
+        self.settle_delay = settle_delay # Lets a burst of events (e.g. DHCP renew) coalesce
+        self._stop_event = threading.Event()
+        self._wake_reader, self._wake_writer = socket.socketpair()
+        self._sock = socket.socket(socket.AF_NETLINK, socket.SOCK_RAW, NETLINK_ROUTE)
+        self._sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR | RTMGRP_IPV6_IFADDR))
+
+    def stop(self):
+        self._stop_event.set()
+        try:
+            self._wake_writer.send(b"\0")
+        except OSError:
+            pass
+
+    def _drain(self):
+        """Discards queued notifications; their content is re-read as one dump."""
+        while True:
+            try:
+                self._sock.recv(65536, socket.MSG_DONTWAIT)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                # A burst overflowed the socket buffer and some events were lost. The full
+                # re-dump that follows every wake-up recovers them, so keep going.
+                if e.errno != errno.ENOBUFS:
+                    raise
+
+    def run(self):
+        try:
+            previous = get_netlink_adapters()
+            while not self._stop_event.is_set():
+                readable, _, _ = select.select([self._sock, self._wake_reader], [], [])
+                if self._stop_event.is_set():
+                    break
+                if self._sock not in readable:
+                    continue
+
+                self._stop_event.wait(self.settle_delay)
+                self._drain()
+
+                current = get_netlink_adapters()
+                diff = diff_adapters(previous, current)
+                if diff:
+                    previous = current
+                    self.on_change(current, diff)
+        except OSError as e:
+            # Closed by stop() is expected; anything else ends live updates, so say so
+            if not self._stop_event.is_set() and self.on_error:
+                self.on_error(e)
+        finally:
+            self._sock.close()
+            self._wake_reader.close()
+            self._wake_writer.close()
+
+# --- Shared Network Snapshot ---
+
+class NetworkSnapshotService:
+    """
+    Holds the latest {name: AdapterRecord} for every consumer in the app. get() serves
+    the cache while it is younger than the TTL; otherwise exactly one caller queries the
+    OS (single-flight) while concurrent callers wait for and share that result.
+    Change notifications call update() or invalidate() so the cache never lags the OS.
+    A caller never joins a query that started before the latest invalidation: it starts
+    a fresh one instead, so a forced refresh is not held up by a stuck older query.
+    """
+
+    def __init__(self, loader=get_network_adapters, ttl=NETWORK_SNAPSHOT_TTL):
+        self.loader = loader
+        self.ttl = ttl
+        self.version = 0          # Bumped whenever the adapter data actually changes
+        self._lock = threading.Lock()
+        self._adapters = {}
+        self._error = None
+        self._taken_at = None     # time.monotonic() of the cached data; None means stale
+        self._inflight = None     # threading.Event set when the running query finishes
+        self._inflight_invalidations = 0 # _invalidations when the running query started
+        self._invalidations = 0
+
+    def peek(self):
+        """Returns the cached (adapters, error, taken_at) without ever querying the OS."""
+        with self._lock:
+            return self._adapters, self._error, self._taken_at
+
+    def invalidate(self):
+        """Marks the cache stale; the next get() queries the OS."""
+        with self._lock:
+            self._taken_at = None
+            self._invalidations += 1
+
+    def update(self, adapters, error=None):
+        """Replaces the cache with data obtained elsewhere (e.g. a netlink change notification)."""
+        with self._lock:
+            self._store(adapters, error)
+            self._invalidations += 1 # An in-flight query started before this data is older
+
+    def _store(self, adapters, error):
+        if adapters != self._adapters or error != self._error:
+            self.version += 1
+        self._adapters = adapters
+        self._error = error
+        self._taken_at = time.monotonic()
+
+    def get(self, max_age=None):
+        """Returns (adapters, error), querying the OS only if the cache is older than max_age/TTL."""
+        max_age = self.ttl if max_age is None else max_age
+        with self._lock:
+            if self._taken_at is not None and time.monotonic() - self._taken_at <= max_age:
+                return self._adapters, self._error
+            event = self._inflight
+            leader = event is None or self._inflight_invalidations != self._invalidations
+            if leader:
+                event = self._inflight = threading.Event()
+                invalidations = self._inflight_invalidations = self._invalidations
+
+        if not leader:
+            event.wait()
+            with self._lock:
+                return self._adapters, self._error
+
+        try:
+            adapters, error = self.loader()
+        except Exception as e:
+            adapters, error = {}, f"Network query failed: {e}"
+
+        with self._lock:
+            if invalidations == self._invalidations:
+                self._store(adapters, error)
+            elif self._taken_at is None:
+                # Invalidated mid-query: keep the result but leave it stale for the next caller
+                self._store(adapters, error)
+                self._taken_at = None
+            if self._inflight is event: # A newer query may have taken over
+                self._inflight = None
+            event.set()
+            return self._adapters, self._error
+
+# --- Network State History (On-Disk Ring Buffer) ---
+
+class NetworkHistoryLog:
+    """
+    Keeps the last `capacity` distinct adapter snapshots in a fixed-size file. Each
+    snapshot is one fixed-size slot holding a small header, a CRC and the zlib-compressed
+    JSON of its records. Slots are written append-only in sequence order and wrap around
+    when the file is full. The file header stores a checkpoint: a sequence number known
+    to be on disk. On open, every slot header is checked and the log resumes after the
+    newest intact record (never before the checkpoint), so recovery does not depend on
+    how far the ring wrapped since the last checkpoint, and a crash loses at most the
+    unflushed batch.
+
+    append() ignores snapshots equal to the previous one. New records are buffered and
+    written once batch_size have accumulated or the oldest has waited flush_interval
+    seconds. The owner calls flush() when flush_due_in() says so (the app uses a Tk
+    timer), so an unchanged network does no disk I/O at all. Snapshots too large for a
+    slot are counted in `dropped` rather than recorded.
+    """
+
+    MAGIC = b"NHR1"
+    HEADER_SIZE = 64
+    _HEADER = struct.Struct("<4sIIQ")  # magic, record_size, capacity, checkpoint_seq
+    _RECORD = struct.Struct("<QdII")   # seq, timestamp, payload_len, crc32
+
+    def __init__(self, path, capacity=HISTORY_CAPACITY, record_size=HISTORY_RECORD_SIZE,
+                 batch_size=8, flush_interval=30.0, checkpoint_every=32):
+        self.path = path
+        self.capacity = capacity
+        self.record_size = record_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.checkpoint_every = checkpoint_every
+        self.head_seq = 0        # Newest sequence number, including unflushed records
+        self.checkpoint_seq = 0
+        self.dropped = 0         # Snapshots too large for a slot
+        self._pending = []       # [(seq, timestamp, payload)] not yet written
+        self._pending_since = None # time.monotonic() of the oldest pending record
+        self._last_adapters = None
+        self._file = None
+        self._open()
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        header = None
+        if os.path.exists(self.path):
+            self._file = open(self.path, "r+b")
+            raw = self._file.read(self._HEADER.size)
+            if len(raw) == self._HEADER.size:
+                header = self._HEADER.unpack(raw)
+        else:
+            self._file = open(self.path, "w+b")
+
+        if header and header[0] == self.MAGIC:
+            # An existing log keeps its own geometry
+            _magic, self.record_size, self.capacity, self.checkpoint_seq = header
+        else:
+            # New or unrecognised file: start from zeroed slots so no stale record survives
+            self._file.truncate(0)
+            self.checkpoint_seq = 0
+            self._write_checkpoint()
+            self._file.truncate(self.HEADER_SIZE + self.capacity * self.record_size)
+
+        self.head_seq = max(self.checkpoint_seq, self._scan_newest_seq())
+        newest = self._read_slot(self.head_seq) if self.head_seq else None
+        self._last_adapters = self._decode(newest[2]) if newest else None
+
+    def _offset(self, seq):
+        return self.HEADER_SIZE + (seq - 1) % self.capacity * self.record_size
+
+    def _write_checkpoint(self):
+        self._file.seek(0)
+        self._file.write(self._HEADER.pack(self.MAGIC, self.record_size, self.capacity, self.checkpoint_seq))
+
+    def _scan_newest_seq(self):
+        """Returns the highest sequence number held intact in any slot (0 if none)."""
+        newest = 0
+        for slot in range(self.capacity):
+            self._file.seek(self.HEADER_SIZE + slot * self.record_size)
+            raw = self._file.read(self._RECORD.size)
+            if len(raw) < self._RECORD.size:
+                break
+            seq = self._RECORD.unpack(raw)[0]
+            # Cheap filters first; only a candidate that would raise the maximum is CRC-checked
+            if seq > newest and (seq - 1) % self.capacity == slot and self._read_slot(seq):
+                newest = seq
+        return newest
+
+    def _read_slot(self, seq):
+        """Returns (seq, timestamp, payload) if the slot for seq holds that exact, intact record."""
+        self._file.seek(self._offset(seq))
+        raw = self._file.read(self.record_size)
+        if len(raw) < self._RECORD.size:
+            return None
+        stored_seq, timestamp, length, crc = self._RECORD.unpack_from(raw)
+        payload = raw[self._RECORD.size:self._RECORD.size + length]
+        if stored_seq != seq or len(payload) != length or zlib.crc32(raw[:16] + payload) != crc:
+            return None
+        return seq, timestamp, payload
+
+    @staticmethod
+    def _encode(adapters):
+        data = [record.to_dict() for record in adapters.values()]
+        return zlib.compress(json.dumps(data, separators=(",", ":")).encode("utf-8"))
+
+    @staticmethod
+    def _decode(payload):
+        return {data["name"]: AdapterRecord.from_dict(data)
+                for data in json.loads(zlib.decompress(payload).decode("utf-8"))}
+
+    def append(self, adapters, timestamp=None):
+        """Records a snapshot if it differs from the previous one. Returns True if recorded."""
+        if adapters == self._last_adapters:
+            return False
+        payload = self._encode(adapters)
+        if self._RECORD.size + len(payload) > self.record_size:
+            self.dropped += 1 # Not remembered as the last snapshot, so a repeat is retried and counted
+            return False
+        self._last_adapters = adapters
+        self.head_seq += 1
+        if not self._pending:
+            self._pending_since = time.monotonic()
+        self._pending.append((self.head_seq, time.time() if timestamp is None else timestamp, payload))
+        if len(self._pending) >= self.batch_size or self.flush_due_in() == 0:
+            self.flush()
+        return True
+
+    def flush_due_in(self):
+        """Seconds until the pending batch must be written (0 if overdue), or None if nothing is pending."""
+        if not self._pending:
+            return None
+        return max(0.0, self.flush_interval - (time.monotonic() - self._pending_since))
+
+    def flush(self):
+        """Writes the pending batch, and a new checkpoint once enough records have accumulated."""
+        for seq, timestamp, payload in self._pending:
+            prefix = struct.pack("<Qd", seq, timestamp)
+            self._file.seek(self._offset(seq))
+            self._file.write(self._RECORD.pack(seq, timestamp, len(payload), zlib.crc32(prefix + payload)) + payload)
+        self._pending = []
+        self._pending_since = None
+        if self.head_seq - self.checkpoint_seq >= self.checkpoint_every:
+            self.checkpoint_seq = self.head_seq
+            self._write_checkpoint()
+        self._file.flush()
+
+    def close(self):
+        if self._file is None:
+            return
+        self.flush()
+        if self.checkpoint_seq != self.head_seq:
+            self.checkpoint_seq = self.head_seq
+            self._write_checkpoint()
+        self._file.close()
+        self._file = None
+
+    def snapshots(self):
+        """Returns [(seq, timestamp, {name: AdapterRecord})], oldest first."""
+        pending = {seq: (seq, timestamp, payload) for seq, timestamp, payload in self._pending}
+        snapshots = []
+        for seq in range(max(1, self.head_seq - self.capacity + 1), self.head_seq + 1):
+            entry = pending.get(seq) or self._read_slot(seq)
+            if entry:
+                snapshots.append((seq, entry[1], self._decode(entry[2])))
+        return snapshots
+
+def _format_field_value(field, value):
+    if field in ("ipv4", "ipv6"):
+        return ", ".join(f"{addr}/{prefix}" if prefix is not None else addr for addr, prefix in value) or "none"
+    if isinstance(value, tuple):
+        return ", ".join(value) or "none"
+    return "none" if value is None else str(value)
+
+def describe_snapshot_diff(old_adapters, new_adapters):
+    """Human-readable lines describing how one snapshot differs from the previous one."""
+    diff = diff_adapters(old_adapters, new_adapters)
+    if diff is None:
+        return ["No changes."]
+    lines = [f"+ {name} appeared ({_format_field_value('ipv4', new_adapters[name].ipv4)})" for name in diff["added"]]
+    lines += [f"- {name} disappeared" for name in diff["removed"]]
+    for name, fields in diff["changed"].items():
+        for field in fields:
+            old_value = _format_field_value(field, getattr(old_adapters[name], field))
+            new_value = _format_field_value(field, getattr(new_adapters[name], field))
+            lines.append(f"~ {name} {field}: {old_value} -> {new_value}")
+    return lines
+
+# --- Reverse DNS Resolver ---
+
+DNS_TYPE_PTR, DNS_TYPE_SOA, DNS_CLASS_IN = 12, 6, 1
+DNS_RCODE_NXDOMAIN = 3
+_DNS_HEADER = struct.Struct("!HHHHHH") # id, flags, qdcount, ancount, nscount, arcount
+_DNS_RR = struct.Struct("!HHIH")       # type, class, ttl, rdlength
+
+def read_system_nameserver(path="/etc/resolv.conf"):
+    """First 'nameserver' from resolv.conf, or None (e.g. on Windows)."""
+    try:
+        with open(path) as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) >= 2 and fields[0] == "nameserver":
+                    return fields[1]
+    except OSError:
+        pass
+    return None
+
+def nameserver_sockaddr(nameserver, port=53):
+    """
+    Returns (family, sockaddr) for a nameserver address. Goes through getaddrinfo so a
+    scoped IPv6 address from resolv.conf (fe80::1%eth0) keeps its interface scope id,
+    which a plain (host, port) tuple would drop. Raises OSError (socket.gaierror).
+    """
+    family, _type, _proto, _canonname, sockaddr = socket.getaddrinfo(
+        nameserver, port, type=socket.SOCK_DGRAM, flags=socket.AI_NUMERICHOST)[0]
+    return family, sockaddr
+
+def build_ptr_query(query_id, ip):
+    """A recursive DNS query for the PTR record of an IPv4/IPv6 address."""
+    qname = b"".join(bytes([len(label)]) + label.encode("ascii")
+                     for label in ipaddress.ip_address(ip).reverse_pointer.split(".")) + b"\0"
+    return _DNS_HEADER.pack(query_id, 0x0100, 1, 0, 0, 0) + qname + struct.pack("!HH", DNS_TYPE_PTR, DNS_CLASS_IN)
+
+def _read_dns_name(message, offset):
+    """Decodes a (possibly compressed) name. Returns (name, offset just past it)."""
+    labels = []
+    end = None
+    for _ in range(128): # Bounds pointer loops in malformed replies
+        length = message[offset]
+        if length & 0xC0 == 0xC0:
+            if end is None:
+                end = offset + 2
+            offset = ((length & 0x3F) << 8) | message[offset + 1]
+            continue
+        if length == 0:
+            return ".".join(labels), end if end is not None else offset + 1
+        labels.append(message[offset + 1:offset + 1 + length].decode("ascii", errors="replace"))
+        offset += 1 + length
+    raise ValueError("DNS name compression loop")
+
+def parse_ptr_response(message, query_id):
+    """
+    Returns (hostname or None, ttl) from a reply to build_ptr_query. A missing name
+    (NXDOMAIN or no PTR) gives None with the negative-caching TTL from the SOA record
+    (RFC 2308) when the server sent one. Raises ValueError if the message is not a
+    reply to this query, and OSError for server errors such as SERVFAIL.
+    """
+    reply_id, flags, qdcount, ancount, nscount, _arcount = _DNS_HEADER.unpack_from(message)
+    if reply_id != query_id or not flags & 0x8000:
+        raise ValueError("Not a reply to this query")
+    rcode = flags & 0xF
+    if rcode not in (0, DNS_RCODE_NXDOMAIN):
+        raise OSError(f"DNS server returned rcode {rcode}")
+
+    offset = _DNS_HEADER.size
+    for _ in range(qdcount):
+        _name, offset = _read_dns_name(message, offset)
+        offset += 4
+    negative_ttl = None
+    for index in range(ancount + nscount):
+        _name, offset = _read_dns_name(message, offset)
+        rr_type, rr_class, ttl, rdlength = _DNS_RR.unpack_from(message, offset)
+        offset += _DNS_RR.size
+        if index < ancount and rr_type == DNS_TYPE_PTR and rr_class == DNS_CLASS_IN:
+            return _read_dns_name(message, offset)[0], ttl
+        if index >= ancount and rr_type == DNS_TYPE_SOA:
+            _mname, soa_offset = _read_dns_name(message, offset)
+            _rname, soa_offset = _read_dns_name(message, soa_offset)
+            minimum = struct.unpack_from("!5I", message, soa_offset)[4]
+            negative_ttl = min(ttl, minimum)
+        offset += rdlength
+    return None, negative_ttl
+
+class ReverseDnsResolver:
+    """
+    App-wide reverse lookups. Queries run on a bounded thread pool. Each one sends a PTR
+    query over UDP to the configured nameserver, with a per-attempt timeout. Without a
+    nameserver (e.g. on Windows) it falls back to socket.gethostbyaddr. Answers are
+    cached for their TTL (clamped to min_ttl..max_ttl). "No such name" answers are
+    cached for the SOA negative TTL, and failures for failure_ttl, so an unresolvable
+    address is not re-queried on every refresh. Concurrent requests for the same
+    address share one Future.
+    """
+
+    def __init__(self, nameserver=None, port=53, timeout=DNS_TIMEOUT, attempts=2, max_workers=DNS_MAX_WORKERS,
+                 min_ttl=30, max_ttl=3600, negative_ttl=300, failure_ttl=30):
+        self.nameserver = nameserver if nameserver is not None else read_system_nameserver()
+        self.port = port
+        self.timeout = timeout
+        self.attempts = attempts
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self.failure_ttl = failure_ttl
+        self.hits = 0
+        self.misses = 0
+        self._cache = {}    # ip -> (hostname or None, expires_at monotonic)
+        self._inflight = {} # ip -> Future
+        self._lock = threading.Lock()
+        self._pool = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ReverseDns")
+
+    def peek(self, ip):
+        """Returns (True, hostname or None) for a fresh cache entry, else (False, None). Never blocks."""
+        with self._lock:
+            entry = self._cache.get(ip)
+            if entry and entry[1] > time.monotonic():
+                self.hits += 1
+                return True, entry[0]
+            return False, None
+
+    def resolve(self, ip):
+        """Returns a Future for the hostname of ip (None if it has no name)."""
+        with self._lock:
+            entry = self._cache.get(ip)
+            if entry and entry[1] > time.monotonic():
+                self.hits += 1
+                future = concurrent.futures.Future()
+                future.set_result(entry[0])
+                return future
+            future = self._inflight.get(ip)
+            if future is None:
+                self.misses += 1
+                future = self._inflight[ip] = self._pool.submit(self._lookup, ip)
+            return future
+
+    def _lookup(self, ip):
+        try:
+            hostname, ttl = self._query(ip)
+            if hostname is None:
+                ttl = self.negative_ttl if ttl is None else min(ttl, self.negative_ttl)
+            else:
+                ttl = max(self.min_ttl, min(ttl, self.max_ttl))
+        except (OSError, ValueError, IndexError, struct.error):
+            hostname, ttl = None, self.failure_ttl
+        with self._lock:
+            self._cache[ip] = (hostname, time.monotonic() + ttl)
+            self._inflight.pop(ip, None)
+        return hostname
+
+    def _query(self, ip):
+        if not self.nameserver:
+            try:
+                return socket.gethostbyaddr(ip)[0], self.max_ttl
+            except (socket.herror, socket.gaierror):
+                return None, None
+
+        family, sockaddr = nameserver_sockaddr(self.nameserver, self.port)
+        with socket.socket(family, socket.SOCK_DGRAM) as sock:
+            sock.settimeout(self.timeout)
+            sock.connect(sockaddr) # Only accept datagrams from the nameserver
+            for _attempt in range(self.attempts):
+                query_id = random.getrandbits(16)
+                sock.send(build_ptr_query(query_id, ip))
+                deadline = time.monotonic() + self.timeout
+                while True:
+                    try:
+                        reply = sock.recv(4096)
+                    except socket.timeout:
+                        break
+                    try:
+                        return parse_ptr_response(reply, query_id)
+                    except ValueError:
+                        if time.monotonic() >= deadline:
+                            break # Stale or spoofed replies only: give up on this attempt
+        raise OSError(f"No reply from {self.nameserver} for {ip}")
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+class SnapshotRefresher(threading.Thread):
+    """
+    Keeps a NetworkSnapshotService fresh when no UI is polling it (headless services).
+    On Linux, netlink change notifications push updates as they happen. A periodic get()
+    covers other platforms and anything netlink does not report.
+    """
+
+    def __init__(self, snapshot, interval=NETWORK_SNAPSHOT_TTL):
+        super().__init__(name="SnapshotRefresher", daemon=True)
+        self.snapshot = snapshot
+        self.interval = interval
+        self._stop_event = threading.Event()
+        self._monitor = None
+
+    def run(self):
+        if platform.system() == "Linux":
+            try:
+                self._monitor = NetlinkChangeMonitor(lambda adapters, _diff: self.snapshot.update(adapters))
+                self._monitor.start()
+            except OSError:
+                self._monitor = None
+        while not self._stop_event.is_set():
+            self.snapshot.get()
+            self._stop_event.wait(self.interval)
+
+    def stop(self):
+        self._stop_event.set()
+        if self._monitor:
+            self._monitor.stop()
+
+# --- Background asyncio Services ---
+
+class AsyncioService:
+    """
+    Base for components that run one asyncio task on a private event loop. run() drives
+    a coroutine on a new loop in the calling thread; start() runs main() that way on a
+    daemon thread. cancel() (or stop()) is thread-safe and ends whichever is running,
+    including a run that has not reached its loop yet.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loop = None
+        self._task = None
+        self._thread = None
+        self._cancelled = False
+
+    async def main(self):
+        """The long-running task for start(); subclasses that are started override it."""
+        raise NotImplementedError
+
+    def run(self, coroutine_function, *args):
+        """
+        Blocking: runs coroutine_function(*args) on a new event loop in this thread.
+        Returns its result, or None if cancel() stopped it.
+        """
+        async def runner():
+            with self._lock:
+                if self._cancelled:
+                    return None
+                self._loop = asyncio.get_running_loop()
+                self._task = asyncio.current_task()
+            return await coroutine_function(*args)
+
+        try:
+            return asyncio.run(runner())
+        except asyncio.CancelledError:
+            return None
+        finally:
+            with self._lock:
+                self._loop = self._task = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.run, args=(self.main,), name=type(self).__name__, daemon=True)
+        self._thread.start()
+
+    def cancel(self):
+        """Thread-safe: cancels the running task."""
+        with self._lock:
+            self._cancelled = True
+            loop, task = self._loop, self._task
+        if loop and task:
+            loop.call_soon_threadsafe(task.cancel)
+
+    def stop(self):
+        """Thread-safe: stops a started service (same as cancel())."""
+        self.cancel()
+
+class AsyncioTcpServer(AsyncioService):
+    """
+    AsyncioService that serves TCP connections with _handle(reader, writer). The
+    listening socket is bound in the constructor so errors (port in use, bad address)
+    surface to the caller; stop() closes it.
+    """
+
+    def __init__(self, host, port):
+        super().__init__()
+        self._listener = socket.create_server((host, port))
+        self.address = self._listener.getsockname()[:2]
+
+    async def _handle(self, reader, writer):
+        raise NotImplementedError
+
+    async def main(self):
+        server = await asyncio.start_server(self._handle, sock=self._listener)
+        async with server:
+            await server.serve_forever()
+
+# --- Prometheus Metrics Endpoint ---
+
+def _prometheus_label(value):
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+def render_prometheus_adapters(adapters, counters):
+    """Renders adapter state and interface counters in the Prometheus text format (0.0.4)."""
+    lines = [
+        "# HELP geo_adapter_info Adapter identity; the value is always 1.",
+        "# TYPE geo_adapter_info gauge",
+    ]
+    for name, record in adapters.items():
+        lines.append(f'geo_adapter_info{{adapter="{_prometheus_label(name)}",mac="{_prometheus_label(record.mac or "")}",'
+                     f'ipv4="{_prometheus_label(record.primary_ipv4 or "")}",state="{_prometheus_label(record.state)}"}} 1')
+    lines += ["# HELP geo_adapter_up Whether the adapter's operational state is up.", "# TYPE geo_adapter_up gauge"]
+    lines += [f'geo_adapter_up{{adapter="{_prometheus_label(name)}"}} {1 if record.state == "up" else 0}'
+              for name, record in adapters.items()]
+    lines += ["# HELP geo_adapter_addresses Number of configured addresses per family.", "# TYPE geo_adapter_addresses gauge"]
+    for name, record in adapters.items():
+        label = _prometheus_label(name)
+        lines.append(f'geo_adapter_addresses{{adapter="{label}",family="ipv4"}} {len(record.ipv4)}')
+        lines.append(f'geo_adapter_addresses{{adapter="{label}",family="ipv6"}} {len(record.ipv6)}')
+    lines += ["# HELP geo_adapter_mtu_bytes Adapter MTU.", "# TYPE geo_adapter_mtu_bytes gauge"]
+    lines += [f'geo_adapter_mtu_bytes{{adapter="{_prometheus_label(name)}"}} {record.mtu}'
+              for name, record in adapters.items() if record.mtu]
+    lines += ["# HELP geo_adapter_speed_megabits Negotiated link speed.", "# TYPE geo_adapter_speed_megabits gauge"]
+    lines += [f'geo_adapter_speed_megabits{{adapter="{_prometheus_label(name)}"}} {record.speed}'
+              for name, record in adapters.items() if record.speed]
+
+    for metric, position, help_text in (("receive_bytes", 0, "Bytes received."), ("receive_packets", 1, "Packets received."),
+                                        ("transmit_bytes", 2, "Bytes transmitted."), ("transmit_packets", 3, "Packets transmitted.")):
+        lines += [f"# HELP geo_interface_{metric}_total {help_text}", f"# TYPE geo_interface_{metric}_total counter"]
+        lines += [f'geo_interface_{metric}_total{{interface="{_prometheus_label(name)}"}} {values[position]}'
+                  for name, values in counters.items()]
+    return "\n".join(lines) + "\n"
+
+def render_prometheus_health(error, snapshot_age, snapshot_version, scrapes, uptime):
+    """Renders the snapshot and endpoint health gauges, which change on every scrape."""
+    lines = [
+        "# HELP geo_snapshot_age_seconds Age of the cached adapter snapshot (-1 if none yet).",
+        "# TYPE geo_snapshot_age_seconds gauge",
+        f"geo_snapshot_age_seconds {snapshot_age:.3f}",
+        "# HELP geo_snapshot_version Number of times the adapter data has changed.",
+        "# TYPE geo_snapshot_version counter",
+        f"geo_snapshot_version {snapshot_version}",
+        "# HELP geo_snapshot_error Whether the last adapter query failed.",
+        "# TYPE geo_snapshot_error gauge",
+        f"geo_snapshot_error {1 if error else 0}",
+        "# HELP geo_metrics_scrapes_total Scrapes served by this endpoint.",
+        "# TYPE geo_metrics_scrapes_total counter",
+        f"geo_metrics_scrapes_total {scrapes}",
+        "# HELP geo_app_uptime_seconds Seconds since the endpoint started.",
+        "# TYPE geo_app_uptime_seconds gauge",
+        f"geo_app_uptime_seconds {uptime:.1f}",
+    ]
+    return "\n".join(lines) + "\n"
+
+class MetricsServer(AsyncioTcpServer):
+    """
+    Minimal asyncio HTTP/1.1 server for GET /metrics, on its own thread and loop. A
+    scrape only reads the snapshot cache (peek) and /proc/net/dev, so it never starts a
+    subprocess or a netlink query. The adapter and counter section is reused for up to
+    cache_seconds and until the snapshot version changes, so hundreds of scrapes per
+    second cost little more than the socket writes; the health gauges (scrape count,
+    uptime, snapshot age) are rendered on every scrape. Keep-alive connections are
+    supported.
+    """
+
+    CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+    def __init__(self, snapshot, host="127.0.0.1", port=METRICS_DEFAULT_PORT, cache_seconds=1.0):
+        super().__init__(host, port)
+        self.snapshot = snapshot
+        self.cache_seconds = cache_seconds
+        self.scrapes = 0
+        self.started_at = time.monotonic()
+        self._adapter_section = None
+        self._adapter_section_version = None
+        self._adapter_section_at = 0.0
+
+    def render(self):
+        """Returns the metrics body as bytes, re-rendering the adapter section only when stale."""
+        now = time.monotonic()
+        adapters, error, taken_at = self.snapshot.peek()
+        version = self.snapshot.version
+        if (self._adapter_section is None or self._adapter_section_version != version
+                or now - self._adapter_section_at >= self.cache_seconds):
+            try:
+                counters = read_proc_net_dev()
+            except OSError:
+                counters = {} # No /proc/net/dev on this OS
+            self._adapter_section = render_prometheus_adapters(adapters, counters).encode("utf-8")
+            self._adapter_section_version = version
+            self._adapter_section_at = now
+        health = render_prometheus_health(error, now - taken_at if taken_at else -1, version,
+                                          self.scrapes, now - self.started_at)
+        return self._adapter_section + health.encode("utf-8")
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+                    break
+                request_line, _, headers = head.decode("latin-1").partition("\r\n")
+                method, _, rest = request_line.partition(" ")
+                path = rest.partition(" ")[0].partition("?")[0]
+                close = "connection: close" in headers.lower() or request_line.endswith("HTTP/1.0")
+
+                if method != "GET":
+                    status, body, content_type = "405 Method Not Allowed", b"Only GET is supported.\n", "text/plain"
+                elif path == "/metrics":
+                    self.scrapes += 1
+                    status, body, content_type = "200 OK", self.render(), self.CONTENT_TYPE
+                elif path == "/":
+                    status, body, content_type = "200 OK", b'<a href="/metrics">Metrics</a>\n', "text/html"
+                else:
+                    status, body, content_type = "404 Not Found", b"Not found.\n", "text/plain"
+
+                writer.write(f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\nContent-Length: {len(body)}\r\n"
+                             f"Connection: {'close' if close else 'keep-alive'}\r\n\r\n".encode("latin-1") + body)
+                await writer.drain()
+                if close:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass # Client went away, or stop() is tearing the loop down mid keep-alive
+        finally:
+            writer.close()
+
+# --- Fleet Agent and Collector ---
+# Wire format: every message is a 4-byte big-endian length followed by that many bytes of
+# UTF-8 JSON. The collector sends {"op": "snapshot", "token": ...}; the agent answers with its
+# adapters. A connection may carry any number of request/reply pairs. The token is a shared
+# secret checked by agents that have one; it travels in clear text, so it keeps strangers on a
+# trusted LAN out but is no substitute for a VPN or SSH tunnel across untrusted networks.
+
+_FLEET_HEADER = struct.Struct("!I")
+FLEET_PROTOCOL_VERSION = 1
+
+def encode_fleet_message(message):
+    payload = json.dumps(message, separators=(",", ":")).encode("utf-8")
+    if len(payload) > FLEET_MAX_MESSAGE:
+        raise ValueError(f"Message of {len(payload)} bytes exceeds the {FLEET_MAX_MESSAGE}-byte limit")
+    return _FLEET_HEADER.pack(len(payload)) + payload
+
+async def read_fleet_message(reader):
+    """Reads one frame. Raises asyncio.IncompleteReadError on EOF, ValueError on a bad frame."""
+    (length,) = _FLEET_HEADER.unpack(await reader.readexactly(_FLEET_HEADER.size))
+    if length > FLEET_MAX_MESSAGE:
+        raise ValueError(f"Frame of {length} bytes exceeds the {FLEET_MAX_MESSAGE}-byte limit")
+    message = json.loads(await reader.readexactly(length))
+    if not isinstance(message, dict):
+        raise ValueError("Frame is not a JSON object")
+    return message
+
+class FleetAgent(AsyncioTcpServer):
+    """
+    Serves this machine's adapter snapshot to collectors over the length-prefixed
+    protocol, on its own thread and asyncio loop. Like MetricsServer, a request only
+    peeks at the snapshot cache. Binds to loopback by default; with a token, requests
+    that do not carry the same token get an error reply and no adapters.
+    """
+
+    def __init__(self, snapshot, host="127.0.0.1", port=FLEET_AGENT_PORT, token=None):
+        super().__init__(host, port)
+        self.snapshot = snapshot
+        self.token = token
+        self.requests = 0
+        self.hostname = socket.gethostname()
+
+    def authorized(self, request):
+        if not self.token:
+            return True
+        token = request.get("token")
+        return isinstance(token, str) and hmac.compare_digest(token.encode("utf-8"), self.token.encode("utf-8"))
+
+    def build_reply(self, request):
+        if not self.authorized(request):
+            return {"protocol": FLEET_PROTOCOL_VERSION, "error": "Missing or wrong agent token"}
+        if request.get("op") != "snapshot":
+            return {"protocol": FLEET_PROTOCOL_VERSION, "error": f"Unknown op: {request.get('op')!r}"}
+        adapters, error, taken_at = self.snapshot.peek()
+        return {"protocol": FLEET_PROTOCOL_VERSION, "hostname": self.hostname, "platform": platform.system(),
+                "version": self.snapshot.version, "error": error,
+                "age": round(time.monotonic() - taken_at, 3) if taken_at else None,
+                "adapters": [record.to_dict() for record in adapters.values()]}
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await read_fleet_message(reader)
+                except asyncio.IncompleteReadError:
+                    break # Collector closed the connection
+                self.requests += 1
+                writer.write(encode_fleet_message(self.build_reply(request)))
+                await writer.drain()
+        except (ConnectionError, ValueError, asyncio.CancelledError):
+            pass # Broken frame or client, or stop() is tearing the loop down
+        finally:
+            writer.close()
+
+
+def is_loopback_host(host):
+    """True for 'localhost' and loopback literals (127.0.0.0/8, ::1); bind addresses like 0.0.0.0 are not."""
+    if host.lower() == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host.partition("%")[0]).is_loopback
+    except ValueError:
+        return False
+
+def parse_fleet_targets(text):
+    """'host[:port], ...' (commas or whitespace) -> unique [(host, port)] in input order. Raises ValueError."""
+    targets = []
+    for token in re.split(r"[\s,;]+", text.strip()):
+        if token:
+            target = parse_host_port(token, FLEET_AGENT_PORT)
+            if not target[0]:
+                raise ValueError(f"Missing host in {token!r}")
+            if target not in targets:
+                targets.append(target)
+    return targets
+
+def fleet_table_rows(agent, reply):
+    """Flattens one agent reply into table rows: (agent, hostname, adapter, state, ipv4, mac, gateway, speed)."""
+    rows = []
+    for data in reply.get("adapters", ()):
+        record = AdapterRecord.from_dict(data)
+        rows.append((agent, reply.get("hostname") or "-", record.name, record.state,
+                     ", ".join(f"{addr}/{prefix}" for addr, prefix in record.ipv4) or "-", record.mac or "-",
+                     ", ".join(record.gateway) or "-", f"{record.speed} Mbps" if record.speed else "-"))
+    return rows
+
+def fleet_result_rows(target, reply, error, rtt):
+    """Table rows for one agent's result, RTT column included. An agent that could not be
+    queried, or that reported no adapters, gets one row carrying the reason."""
+    host, port = target
+    agent = f"[{host}]:{port}" if ":" in host else f"{host}:{port}"
+    rtt_text = f"{rtt * 1000:.1f}" if rtt is not None else "-"
+    rows = [row + (rtt_text,) for row in fleet_table_rows(agent, reply)] if reply else []
+    if not rows:
+        hostname = (reply or {}).get("hostname") or "-"
+        rows = [(agent, hostname, "-", "error" if error else "-", error or "No adapters reported", "-", "-", "-", rtt_text)]
+    return rows
+
+class FleetCollector(AsyncioService):
+    """
+    Queries many agents concurrently with asyncio. A semaphore bounds the connections in
+    flight and each agent gets one overall timeout, so a dead host costs one timeout no
+    matter how many agents are listed. Results are reported per agent as they arrive.
+    """
+
+    def __init__(self, concurrency=128, timeout=3.0, token=None):
+        super().__init__()
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.request = {"op": "snapshot", "token": token} if token else {"op": "snapshot"}
+
+    async def query(self, host, port):
+        """Returns (reply, rtt) for one agent. Raises OSError, ValueError or asyncio.TimeoutError."""
+        async def exchange():
+            start = time.perf_counter()
+            reader, writer = await asyncio.open_connection(host, port)
+            try:
+                writer.write(encode_fleet_message(self.request))
+                reply = await read_fleet_message(reader)
+            finally:
+                writer.close()
+            return reply, time.perf_counter() - start
+
+        try:
+            return await asyncio.wait_for(exchange(), self.timeout)
+        except asyncio.IncompleteReadError:
+            raise ConnectionError("Agent closed the connection") from None
+
+    async def _collect_one(self, semaphore, target, on_result):
+        async with semaphore:
+            try:
+                reply, rtt = await self.query(*target)
+            except asyncio.TimeoutError:
+                on_result(target, None, f"Timed out after {self.timeout:g}s", None)
+                return False
+            except (OSError, ValueError) as e:
+                on_result(target, None, str(e) or type(e).__name__, None)
+                return False
+        on_result(target, reply, reply.get("error"), rtt)
+        return True
+
+    async def collect_async(self, targets, on_result):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(*(self._collect_one(semaphore, target, on_result) for target in targets))
+        return sum(results)
+
+    def collect(self, targets, on_result):
+        """
+        Blocking collection (run it on a worker thread). on_result((host, port), reply, error,
+        rtt) is called from this thread once per agent; reply is None if the agent could not
+        be queried. Returns the number of agents that answered, or None if cancel() stopped it.
+        """
+        return self.run(self.collect_async, targets, on_result)
+
+# --- LAN Sweep (Host Discovery) ---
+
+def sweep_network_for_adapter(record):
+    """
+    Works out the subnet to sweep from an adapter's first IPv4 address. Subnets larger
+    than SWEEP_MAX_HOSTS are narrowed to the /24 around the address.
+    Returns (ipaddress.IPv4Network, note) or (None, reason).
+    """
+    if record is None:
+        return None, "No adapter selected."
+    for addr, prefix in record.ipv4:
+        if addr in ('0.0.0.0', '127.0.0.1'):
+            continue
+        network = ipaddress.ip_interface(f"{addr}/{prefix if prefix is not None else 24}").network
+        if network.num_addresses > SWEEP_MAX_HOSTS:
+            return ipaddress.ip_interface(f"{addr}/24").network, f"{network} is too large; sweeping the local /24."
+        if prefix is None:
+            return network, "Prefix length unknown; assuming /24."
+        return network, None
+    return None, "Selected adapter has no IPv4 address."
+
+def parse_port_list(text):
+    """Parses '22, 80, 8000-8010' into a sorted tuple of ports. Raises ValueError."""
+    ports = set()
+    for part in text.replace(" ", "").split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        start, end = int(first), int(last or first)
+        if not (0 < start <= end <= 65535):
+            raise ValueError(f"Invalid port or range: {part}")
+        ports.update(range(start, end + 1))
+    if not ports:
+        raise ValueError("No ports given.")
+    return tuple(sorted(ports))
+
+class LanSweeper(AsyncioService):
+    """
+    Discovers live hosts with asyncio TCP connects. A host counts as alive if any probed
+    port accepts the connection or actively refuses it (a refusal still proves the host
+    answered). A semaphore bounds the number of connects in flight and every connect has
+    its own timeout. A host's ports are probed concurrently, so a host whose ports are
+    all filtered costs about one timeout, plus any wait for a semaphore slot when the
+    sweep is saturated. Results are reported per host as soon as that host is done.
+    """
+
+    def __init__(self, ports=SWEEP_PORTS, concurrency=512, timeout=0.6):
+        super().__init__()
+        self.ports = tuple(ports)
+        self.concurrency = concurrency
+        self.timeout = timeout
+
+    async def _probe_port(self, semaphore, host, port):
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                _reader, writer = await asyncio.wait_for(asyncio.open_connection(str(host), port), self.timeout)
+            except ConnectionRefusedError:
+                return "refused", time.perf_counter() - start
+            except (OSError, asyncio.TimeoutError):
+                return None, None
+            rtt = time.perf_counter() - start
+            writer.close()
+            return "open", rtt
+
+    async def _probe_host(self, semaphore, host, on_result):
+        outcomes = await asyncio.gather(*(self._probe_port(semaphore, host, port) for port in self.ports))
+        rtts = [rtt for state, rtt in outcomes if state]
+        if not rtts:
+            return False
+        open_ports = [port for port, (state, _rtt) in zip(self.ports, outcomes) if state == "open"]
+        on_result(str(host), open_ports, min(rtts))
+        return True
+
+    async def sweep_async(self, hosts, on_result):
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(*(self._probe_host(semaphore, host, on_result) for host in hosts))
+        return sum(results)
+
+    def sweep(self, hosts, on_result):
+        """
+        Blocking sweep (run it on a worker thread). on_result(host, open_ports, rtt) is
+        called from this thread for every live host. Returns the number of live hosts,
+        or None if cancel() stopped the sweep.
+        """
+        return self.run(self.sweep_async, hosts, on_result)
+
+# --- Latency Histogram ---
+
+class LogHistogram:
+    """
+    HDR-style histogram of non-negative integers (e.g. nanoseconds). Values below
+    2**significant_bits get one bucket each. Above that, every power of two is split
+    into 2**(significant_bits - 1) equal sub-buckets, so any recorded value is reported
+    within about 3% (with the default 6 bits). Counts live in one flat array, so
+    recording is a few integer operations and the memory use is fixed.
+    """
+
+    def __init__(self, significant_bits=6, max_bits=36):
+        self.bits = significant_bits
+        self.sub_count = 1 << significant_bits
+        self.half = self.sub_count >> 1
+        self.bucket_count = self.sub_count + (max_bits - significant_bits) * self.half
+        self.reset()
+
+    def reset(self):
+        self.counts = array("Q", [0]) * self.bucket_count
+        self.total = 0
+        self.sum = 0
+        self.min = None
+        self.max = 0
+
+    def _index(self, value):
+        if value < self.sub_count:
+            return value
+        shift = value.bit_length() - self.bits
+        return self.sub_count + (shift - 1) * self.half + (value >> shift) - self.half
+
+    def _bounds(self, index):
+        """(lowest, highest) value that lands in a bucket."""
+        if index < self.sub_count:
+            return index, index
+        shift, mantissa = divmod(index - self.sub_count, self.half)
+        shift += 1
+        mantissa += self.half
+        return mantissa << shift, ((mantissa + 1) << shift) - 1
+
+    def record(self, value):
+        value = max(0, int(value))
+        self.counts[min(self._index(value), len(self.counts) - 1)] += 1
+        self.total += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        self.min = value if self.min is None else min(self.min, value)
+
+    def percentile(self, percent):
+        """Highest value equivalent to the given percentile, or None when empty."""
+        if not self.total:
+            return None
+        target = max(1, -(-self.total * percent // 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= target:
+                return min(self._bounds(index)[1], self.max)
+        return self.max
+
+    @property
+    def mean(self):
+        return self.sum / self.total if self.total else None
+
+    def buckets(self, groups=12):
+        """Merges the populated range into at most `groups` (low, high, count) rows for display."""
+        populated = [index for index, count in enumerate(self.counts) if count]
+        if not populated:
+            return []
+        first, last = populated[0], populated[-1]
+        step = max(1, -(-(last - first + 1) // groups))
+        rows = []
+        for start in range(first, last + 1, step):
+            end = min(start + step, last + 1)
+            rows.append((self._bounds(start)[0], self._bounds(end - 1)[1], sum(self.counts[start:end])))
+        return rows
+
+def format_histogram(histogram, scale=1000, unit="us", width=40):
+    """Text rendering: percentiles followed by an ASCII bar per bucket group."""
+    if not histogram.total:
+        return "No samples."
+    lines = [f"samples {histogram.total}   min {histogram.min / scale:.1f}   mean {histogram.mean / scale:.1f}   "
+             f"max {histogram.max / scale:.1f} {unit}"]
+    lines.append("   ".join(f"p{p} {histogram.percentile(p) / scale:.1f}" for p in (50, 90, 99, 99.9)) + f" {unit}")
+    rows = histogram.buckets()
+    peak = max(count for _low, _high, count in rows)
+    for low, high, count in rows:
+        bar = "#" * max(1 if count else 0, round(width * count / peak))
+        lines.append(f"{low / scale:>10.1f} - {high / scale:<10.1f} {count:>8} {bar}")
+    return "\n".join(lines)
+
+# --- Latency Monitor (TCP Connect RTT) ---
+
+async def probe_tcp_connect(host, port, timeout, open_connection=asyncio.open_connection):
+    """Returns the seconds a TCP connect to host:port takes. Raises OSError or asyncio.TimeoutError."""
+    start = time.perf_counter()
+    _reader, writer = await asyncio.wait_for(open_connection(host, port), timeout)
+    rtt = time.perf_counter() - start
+    writer.close()
+    return rtt
+
+class LatencySeries:
+    """Per-target statistics: a LogHistogram of RTTs (ns) plus a ring of recent RTTs (ms) for graphing."""
+
+    def __init__(self, capacity=LATENCY_HISTORY_SAMPLES):
+        self.histogram = LogHistogram()
+        self.recent = array("d", [0.0]) * capacity
+        self.capacity = capacity
+        self.head = 0
+        self.count = 0
+        self.sent = 0
+        self.lost = 0
+        self.last = None
+
+    def add(self, rtt):
+        """Records one probe result; rtt is seconds, or None for a failed probe (kept as NaN)."""
+        self.sent += 1
+        if rtt is None:
+            self.lost += 1
+            value = float("nan")
+        else:
+            self.histogram.record(rtt * 1e9)
+            value = rtt * 1000
+        self.last = rtt
+        self.recent[self.head] = value
+        self.head = (self.head + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def ordered(self):
+        """Recent RTTs in ms, oldest first."""
+        start = (self.head - self.count) % self.capacity
+        return [self.recent[(start + n) % self.capacity] for n in range(self.count)]
+
+class LatencyMonitor(AsyncioService):
+    """
+    Probes every target once per interval on one asyncio loop (fixed-rate: a slow round
+    does not push later rounds back, and rounds missed during a stall or suspend are
+    skipped, not fired back to back). on_sample(target, rtt_or_None) is called from the
+    monitor thread for each result, so it must hand off to Tk. open_connection can be
+    replaced, e.g. by a wrapper that injects delays in tests.
+    """
+
+    def __init__(self, targets, on_sample, interval=1.0, timeout=2.0, open_connection=asyncio.open_connection):
+        super().__init__()
+        self.targets = list(targets)
+        self.on_sample = on_sample
+        self.interval = interval
+        self.timeout = timeout
+        self.open_connection = open_connection
+
+    async def _probe(self, target):
+        host, port = target
+        try:
+            rtt = await probe_tcp_connect(host, port, self.timeout, self.open_connection)
+        except (OSError, asyncio.TimeoutError):
+            rtt = None
+        self.on_sample(target, rtt)
+
+    async def run_rounds(self, rounds=None):
+        """Runs forever, or for a fixed number of rounds."""
+        loop = asyncio.get_running_loop()
+        next_round = loop.time()
+        done = 0
+        while True:
+            await asyncio.gather(*(self._probe(target) for target in self.targets))
+            done += 1
+            if rounds is not None and done >= rounds:
+                return
+            # Behind schedule (slow round, suspend): run the next round now and drop the missed ones
+            next_round = max(next_round + self.interval, loop.time())
+            await asyncio.sleep(next_round - loop.time())
+
+    async def main(self):
+        await self.run_rounds()
+
+# --- Throughput Tester (sendfile / recv_into) ---
+# Protocol: the client sends a hello (magic, bulk byte count, ping count), then the bulk
+# data. The server answers with the nanoseconds it spent receiving, then echoes
+# `pings` fixed-size messages so the client can time round trips.
+
+_THROUGHPUT_HELLO = struct.Struct("!4sQI")
+THROUGHPUT_MAGIC = b"TPT1"
+THROUGHPUT_PING_SIZE = 64
+
+def _recv_exact_into(sock, view):
+    received = 0
+    while received < len(view):
+        count = sock.recv_into(view[received:])
+        if not count:
+            raise ConnectionError("Peer closed the connection")
+        received += count
+
+def parse_host_port(text, default_port):
+    """'host:port', '[v6]:port', 'host' or ':port' -> (host, port). Raises ValueError."""
+    text = text.strip()
+    if text.startswith("["):
+        host, _, port = text[1:].partition("]")
+        port = port.lstrip(":")
+    elif text.count(":") == 1:
+        host, port = text.split(":")
+    else:
+        host, port = text, ""
+    port = int(port) if port else default_port
+    if not 0 <= port <= 65535:
+        raise ValueError(f"Invalid port: {port}")
+    return host, port
+
+class ThroughputTestServer(threading.Thread):
+    """
+    Serves throughput tests one client at a time. Bulk data is received into a single
+    preallocated bytearray with recv_into, so the receive path allocates nothing per read.
+    The listening socket is bound in the constructor, so errors surface to the caller and
+    port 0 can be used to pick a free port (see `address`).
+    """
+
+    def __init__(self, host="0.0.0.0", port=THROUGHPUT_TEST_PORT, buffer_size=1 << 20):
+        super().__init__(name="ThroughputTestServer", daemon=True)
+        self._stop_event = threading.Event()
+        self._buffer = bytearray(buffer_size)
+        self.tests_served = 0
+        self._listener = socket.create_server((host, port))
+        self._listener.settimeout(0.5)
+        self.address = self._listener.getsockname()[:2]
+
+    def stop(self):
+        self._stop_event.set()
+
+    def run(self):
+        with self._listener:
+            while not self._stop_event.is_set():
+                try:
+                    conn, _peer = self._listener.accept()
+                except socket.timeout:
+                    continue
+                except OSError:
+                    break
+                with conn:
+                    try:
+                        self._serve(conn)
+                        self.tests_served += 1
+                    except (OSError, ValueError):
+                        pass # A client that disconnects mid-test must not stop the server
+
+    def _serve(self, conn):
+        conn.settimeout(30)
+        conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        view = memoryview(self._buffer)
+        hello = bytearray(_THROUGHPUT_HELLO.size)
+        _recv_exact_into(conn, memoryview(hello))
+        magic, remaining, pings = _THROUGHPUT_HELLO.unpack(hello)
+        if magic != THROUGHPUT_MAGIC:
+            raise ValueError("Not a throughput test client")
+
+        start = time.perf_counter_ns()
+        while remaining:
+            count = conn.recv_into(view[:min(remaining, len(view))])
+            if not count:
+                raise ConnectionError("Client closed the connection during the bulk phase")
+            remaining -= count
+        conn.sendall(struct.pack("!Q", time.perf_counter_ns() - start))
+
+        ping = view[:THROUGHPUT_PING_SIZE]
+        for _ in range(pings):
+            _recv_exact_into(conn, ping)
+            conn.sendall(ping)
+
+def run_throughput_test(host, port=THROUGHPUT_TEST_PORT, total_bytes=256 << 20, pings=1000,
+                        file_size=THROUGHPUT_TEST_FILE_SIZE):
+    """
+    Client side. The payload is a temporary file filled through a memory map. The bulk
+    phase sends it repeatedly with socket.sendfile (os.sendfile on Linux, so the data goes
+    from the page cache to the socket without being copied through Python). Returns a
+    dict with the byte count, the client/server elapsed seconds, Gbit/s and a LogHistogram
+    of round-trip times in nanoseconds.
+    """
+    file_size = max(1, min(file_size, total_bytes))
+    with tempfile.TemporaryFile() as payload:
+        payload.truncate(file_size)
+        with mmap.mmap(payload.fileno(), file_size) as mapped:
+            pattern = bytes(range(256)) * 4096
+            for offset in range(0, file_size, len(pattern)):
+                chunk = pattern[:file_size - offset]
+                mapped[offset:offset + len(chunk)] = chunk
+
+        with socket.create_connection((host, port), timeout=30) as sock:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            sock.sendall(_THROUGHPUT_HELLO.pack(THROUGHPUT_MAGIC, total_bytes, pings))
+
+            start = time.perf_counter()
+            sent = 0
+            while sent < total_bytes:
+                sent += sock.sendfile(payload, offset=0, count=min(file_size, total_bytes - sent))
+            reply = bytearray(8)
+            _recv_exact_into(sock, memoryview(reply))
+            elapsed = time.perf_counter() - start
+            (server_ns,) = struct.unpack("!Q", reply)
+
+            histogram = LogHistogram()
+            ping = bytearray(THROUGHPUT_PING_SIZE)
+            echo = memoryview(bytearray(THROUGHPUT_PING_SIZE))
+            for _ in range(pings):
+                sent_at = time.perf_counter_ns()
+                sock.sendall(ping)
+                _recv_exact_into(sock, echo)
+                histogram.record(time.perf_counter_ns() - sent_at)
+
+    server_seconds = server_ns / 1e9
+    return {
+        "bytes": total_bytes,
+        "seconds": elapsed,
+        "server_seconds": server_seconds,
+        "gbps": total_bytes * 8 / elapsed / 1e9,
+        "server_gbps": total_bytes * 8 / server_seconds / 1e9 if server_seconds else 0.0,
+        "rtt": histogram,
+    }
+
+def format_throughput_result(result):
+    return (f"Sent {result['bytes'] / (1 << 20):.0f} MiB in {result['seconds']:.3f}s: "
+            f"{result['gbps']:.2f} Gbit/s (server measured {result['server_gbps']:.2f} Gbit/s)\n\n"
+            f"Round-trip latency ({THROUGHPUT_PING_SIZE}-byte ping-pong):\n"
+            f"{format_histogram(result['rtt'])}")
+
+# --- Live Throughput Sampling ---
+
+def read_proc_net_dev(path=PROC_NET_DEV_PATH):
+    """
+    Reads /proc/net/dev in a single read and returns
+    {ifname: (rx_bytes, rx_packets, tx_bytes, tx_packets)}.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+
+    counters = {}
+    for line in data.split(b"\n")[2:]: # First two lines are the column headers
+        name, sep, rest = line.partition(b":")
+        if not sep:
+            continue
+        fields = rest.split()
+        counters[name.strip().decode()] = (int(fields[0]), int(fields[1]), int(fields[8]), int(fields[9]))
+    return counters
+
+def format_rate(bytes_per_second):
+    """Formats a byte rate for display (e.g. '1.2 MB/s')."""
+    for unit in ("B/s", "KB/s", "MB/s", "GB/s"):
+        if bytes_per_second < 1024 or unit == "GB/s":
+            return f"{bytes_per_second:.1f} {unit}" if unit != "B/s" else f"{bytes_per_second:.0f} {unit}"
+        bytes_per_second /= 1024
+
+class ThroughputRing:
+    """
+    Fixed-capacity history of RX/TX byte and packet rates. All four series live in
+    preallocated array('d') buffers, so appending a sample never allocates.
+    """
+
+    __slots__ = ("capacity", "rx_bps", "tx_bps", "rx_pps", "tx_pps", "head", "count")
+
+    def __init__(self, capacity=THROUGHPUT_HISTORY_SECONDS):
+        self.capacity = capacity
+        self.rx_bps = array('d', [0.0]) * capacity
+        self.tx_bps = array('d', [0.0]) * capacity
+        self.rx_pps = array('d', [0.0]) * capacity
+        self.tx_pps = array('d', [0.0]) * capacity
+        self.head = 0  # Next slot to write
+        self.count = 0
+
+    def clear(self):
+        self.head = 0
+        self.count = 0
+
+    def append(self, rx_bps, tx_bps, rx_pps, tx_pps):
+        i = self.head
+        self.rx_bps[i] = rx_bps
+        self.tx_bps[i] = tx_bps
+        self.rx_pps[i] = rx_pps
+        self.tx_pps[i] = tx_pps
+        self.head = (i + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def ordered_index(self, n):
+        """Maps 0..count-1 (oldest to newest) to a slot in the buffers."""
+        return (self.head - self.count + n) % self.capacity
+
+class ThroughputSampler:
+    """Turns successive /proc/net/dev counter readings into per-second rates."""
+
+    def __init__(self, path=PROC_NET_DEV_PATH):
+        self.path = path
+        self.previous = None # (ifname, monotonic time, counters)
+
+    def reset(self):
+        self.previous = None
+
+    def sample(self, ifname):
+        """Returns (rx_bps, tx_bps, rx_pps, tx_pps) since the last call, or None on the first call."""
+        now = time.monotonic()
+        counters = read_proc_net_dev(self.path).get(ifname)
+        if counters is None:
+            self.previous = None
+            return None
+
+        previous = self.previous
+        self.previous = (ifname, now, counters)
+        if previous is None or previous[0] != ifname:
+            return None
+
+        elapsed = now - previous[1]
+        if elapsed <= 0:
+            return None
+        # A negative delta means the counters were reset (driver reload); report zero
+        rx_bytes, rx_packets, tx_bytes, tx_packets = (max(0, c - p) / elapsed
+                                                      for c, p in zip(counters, previous[2]))
+        return rx_bytes, tx_bytes, rx_packets, tx_packets
+
+# --- Link Quality and Error Counters ---
+
+# Counter name -> sysfs path relative to /sys/class/net/<interface>
+LINK_ERROR_COUNTERS = {
+    "rx_errors": "statistics/rx_errors",
+    "tx_errors": "statistics/tx_errors",
+    "rx_dropped": "statistics/rx_dropped",
+    "tx_dropped": "statistics/tx_dropped",
+    "carrier_errors": "statistics/tx_carrier_errors",
+    "carrier_changes": "carrier_changes",
+}
+
+def parse_proc_net_wireless(text):
+    """
+    Parses /proc/net/wireless into {interface: (link, level, noise)}. Link quality is in
+    the driver's units (usually out of 70); level and noise are dBm, None if unreported.
+    """
+    stats = {}
+    for line in text.splitlines()[2:]:
+        name, sep, rest = line.partition(":")
+        fields = rest.split()
+        if not sep or len(fields) < 4:
+            continue
+        # Values carry a trailing '.' when the driver updated them since the last read
+        link, level, noise = (float(value.rstrip(".")) for value in fields[1:4])
+        stats[name.strip()] = (link, _wireless_dbm(level), _wireless_dbm(noise))
+    return stats
+
+def _wireless_dbm(value):
+    if value in (0, -256):
+        return None # Not reported by the driver
+    return value - 256 if value > 63 else value # Older drivers print dBm as an unsigned byte
+
+def _pread_int(fd):
+    return int(os.pread(fd, 32, 0))
+
+class LinkStatsSampler:
+    """
+    Samples wireless quality and the error/drop/carrier counters of one interface. The
+    sysfs and proc files are opened once and re-read with pread at offset 0 (both
+    regenerate their contents on every read from the start), so a sample costs a few
+    small reads and no path lookups.
+    """
+
+    def __init__(self, sysfs_path=SYSFS_NET_PATH, wireless_path=PROC_NET_WIRELESS_PATH):
+        self.sysfs_path = sysfs_path
+        self.wireless_path = wireless_path
+        self.interface = None
+        self._fds = {}
+        self._wireless_fd = None
+        self.previous = None
+
+    def _open(self, interface):
+        self.close()
+        base = os.path.join(self.sysfs_path, interface)
+        if not os.path.isdir(base):
+            raise OSError(f"No sysfs entry for {interface}")
+        for name, relative in LINK_ERROR_COUNTERS.items():
+            try:
+                self._fds[name] = os.open(os.path.join(base, relative), os.O_RDONLY)
+            except OSError:
+                pass # Virtual interfaces lack some counters
+        if os.path.isdir(os.path.join(base, "wireless")) or os.path.isdir(os.path.join(base, "phy80211")):
+            try:
+                self._wireless_fd = os.open(self.wireless_path, os.O_RDONLY)
+            except OSError:
+                self._wireless_fd = None
+        self.interface = interface
+
+    def sample(self, interface):
+        """
+        Returns (wireless, counters, deltas): wireless is (link, level, noise) or None for a
+        wired interface; deltas hold the change since the previous sample of the same
+        interface (empty on the first). Raises OSError if the interface has no sysfs entry.
+        """
+        if interface != self.interface:
+            self._open(interface)
+            self.previous = None
+
+        counters = {}
+        for name, fd in self._fds.items():
+            try:
+                counters[name] = _pread_int(fd)
+            except (OSError, ValueError):
+                pass # Interface went away or the driver does not report this counter
+        wireless = None
+        if self._wireless_fd is not None:
+            try:
+                wireless = parse_proc_net_wireless(os.pread(self._wireless_fd, 65536, 0).decode("ascii", "replace")).get(interface)
+            except OSError:
+                wireless = None
+
+        previous, self.previous = self.previous, counters
+        deltas = {name: max(0, value - previous[name]) for name, value in counters.items() 
+                  if previous and name in previous}
+        return wireless, counters, deltas
+
+    def close(self):
+        for fd in self._fds.values():
+            os.close(fd)
+        if self._wireless_fd is not None:
+            os.close(self._wireless_fd)
+        self._fds = {}
+        self._wireless_fd = None
+        self.interface = None
+        self.previous = None
+
+def format_wireless_stats(wireless):
+    if wireless is None:
+        return "Not a wireless adapter"
+    link, level, noise = wireless
+    parts = [f"Quality {link:.0f}"]
+    parts.append(f"Signal {level:.0f} dBm" if level is not None else "Signal n/a")
+    parts.append(f"Noise {noise:.0f} dBm" if noise is not None else "Noise n/a")
+    if level is not None and noise is not None:
+        parts.append(f"SNR {level - noise:.0f} dB")
+    return ", ".join(parts)
+
+def format_link_counters(counters, deltas):
+    """'RX err 0, TX err 0 | RX drop 12 (+2), ...'; the delta is shown only when a counter moved."""
+    def value(name, label):
+        if name not in counters:
+            return f"{label} n/a"
+        delta = deltas.get(name)
+        return f"{label} {counters[name]}" + (f" (+{delta})" if delta else "")
+    return (f"{value('rx_errors', 'RX err')}, {value('tx_errors', 'TX err')} | "
+            f"{value('rx_dropped', 'RX drop')}, {value('tx_dropped', 'TX drop')} | "
+            f"{value('carrier_errors', 'Carrier err')}, {value('carrier_changes', 'Carrier changes')}")
+
+# --- Neighbor (ARP/NDP) Table and OUI Vendor Lookup ---
+
+ATF_COMPLETE, ATF_PERM = 0x2, 0x4
+
+def dump_netlink_neighbors():
+    """Returns [(ip, mac, ifname, state)] for the IPv4 ARP and IPv6 NDP caches. Raises OSError."""
+    return NetlinkRouteClient().dump_neighbors()
+
+def read_proc_net_arp(path=os.path.join(PROC_PATH, "net", "arp")):
+    """Fallback IPv4-only neighbor reader for /proc/net/arp. Returns [(ip, mac, ifname, state)]."""
+    neighbors = []
+    with open(path) as f:
+        for line in f.read().splitlines()[1:]:
+            fields = line.split()
+            if len(fields) < 6:
+                continue
+            flags = int(fields[2], 16)
+            if flags & ATF_PERM:
+                state = "PERMANENT"
+            elif flags & ATF_COMPLETE:
+                state = "REACHABLE"
+            else:
+                state = "INCOMPLETE"
+            neighbors.append((fields[0], normalize_mac(fields[3]), fields[5], state))
+    return neighbors
+
+def get_neighbors():
+    """Returns (neighbors, error): the netlink dump, or /proc/net/arp if netlink is unavailable."""
+    if platform.system() != "Linux":
+        return [], "OS Not Supported"
+    try:
+        return dump_netlink_neighbors(), None
+    except OSError:
+        try:
+            return read_proc_net_arp(), None
+        except OSError as e:
+            return [], f"Could not read the neighbor table: {e}"
+
+_VENDOR_SUFFIX_PATTERN = re.compile(
+    r"[\s,]+(?:inc|incorporated|corp|corporation|corporate|co|company|ltd|limited|llc|gmbh|ag|bv|nv|sa|ab|oy|"
+    r"plc|pte|pty|srl|spa|kk|group)\.?$", re.IGNORECASE)
+# Companies the registry lists under more than one name, keyed by the suffix-free name in lower case
+VENDOR_ALIASES = {"cisco-linksys": "Linksys", "raspberry pi foundation": "Raspberry Pi", "raspberry pi trading": "Raspberry Pi"}
+
+def normalize_vendor_name(name):
+    """'The Linksys Group, Inc.' -> 'Linksys': drops legal suffixes so one company always reads the same."""
+    name = " ".join(name.split())
+    if name.lower().startswith("the "):
+        name = name[4:]
+    while True:
+        stripped = _VENDOR_SUFFIX_PATTERN.sub("", name)
+        if stripped == name:
+            break
+        name = stripped
+    name = name.rstrip(" ,.")
+    return VENDOR_ALIASES.get(name.lower(), name)
+
+class OuiDatabase:
+    """
+    IEEE MA-L (24-bit OUI) vendor lookup. The prefixes are a sorted array of 32-bit
+    integers searched with bisect. A parallel array indexes into a de-duplicated list
+    of vendor names, so tens of thousands of entries take well under a megabyte.
+
+    On-disk format (gzip-compressed): b"OUI1", then the entry and name counts as two
+    little-endian uint32, then the prefixes (uint32 LE), then the name indexes
+    (uint32 LE), then the UTF-8 names separated by newlines.
+    """
+
+    MAGIC = b"OUI1"
+    _COUNTS = struct.Struct("<II")
+
+    def __init__(self, prefixes=None, name_index=None, names=()):
+        self.prefixes = prefixes if prefixes is not None else array("I")
+        self.name_index = name_index if name_index is not None else array("I")
+        self.names = list(names)
+
+    def __len__(self):
+        return len(self.prefixes)
+
+    @property
+    def partial(self):
+        """True for the bundled seed (or any list too small to be the full IEEE registry)."""
+        return len(self.prefixes) < OUI_FULL_REGISTRY_MIN
+
+    @classmethod
+    def from_entries(cls, entries):
+        """Builds a database from (prefix_int, vendor) pairs in any order."""
+        by_prefix = dict(entries)
+        names, name_ids = [], {}
+        prefixes, name_index = array("I"), array("I")
+        for prefix in sorted(by_prefix):
+            vendor = by_prefix[prefix]
+            if vendor not in name_ids:
+                name_ids[vendor] = len(names)
+                names.append(vendor)
+            prefixes.append(prefix)
+            name_index.append(name_ids[vendor])
+        return cls(prefixes, name_index, names)
+
+    @classmethod
+    def from_ieee_csv(cls, path):
+        """
+        Reads the IEEE registry export (oui.csv: Registry,Assignment,Organization Name,...)
+        with normalized vendor names. Raises OSError or ValueError.
+        """
+        with open(path, newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            next(reader, None)
+            return cls.from_entries((int(row[1], 16), normalize_vendor_name(row[2])) for row in reader
+                                    if len(row) > 2 and row[0] == "MA-L" and len(row[1]) == 6)
+
+    @classmethod
+    def load(cls, path):
+        """Loads a file written by save(). Raises OSError or ValueError."""
+        with gzip.open(path, "rb") as f:
+            data = f.read()
+        if data[:4] != cls.MAGIC:
+            raise ValueError(f"{path} is not an OUI database")
+        count, name_count = cls._COUNTS.unpack_from(data, 4)
+        offset = 4 + cls._COUNTS.size
+        prefixes, name_index = array("I"), array("I")
+        prefixes.frombytes(data[offset:offset + count * 4])
+        offset += count * 4
+        name_index.frombytes(data[offset:offset + count * 4])
+        offset += count * 4
+        if sys.byteorder == "big":
+            prefixes.byteswap()
+            name_index.byteswap()
+        # An empty name table is written as no bytes at all, which split() would read as ['']
+        names = data[offset:].decode("utf-8").split("\n") if name_count else []
+        if len(prefixes) != count or len(names) != name_count:
+            raise ValueError(f"{path} is truncated")
+        return cls(prefixes, name_index, names)
+
+    def save(self, path):
+        prefixes, name_index = array("I", self.prefixes), array("I", self.name_index)
+        if sys.byteorder == "big":
+            prefixes.byteswap()
+            name_index.byteswap()
+        with gzip.open(path, "wb") as f:
+            f.write(self.MAGIC + self._COUNTS.pack(len(prefixes), len(self.names)))
+            f.write(prefixes.tobytes())
+            f.write(name_index.tobytes())
+            f.write("\n".join(self.names).encode("utf-8"))
+
+    def lookup(self, mac):
+        """Returns the vendor for a MAC in any common notation, or None."""
+        if not mac:
+            return None
+        digits = re.sub(r"[^0-9A-Fa-f]", "", mac)
+        if len(digits) < 6:
+            return None
+        prefix = int(digits[:6], 16)
+        if prefix & 0x010000:
+            return "Multicast"
+        if prefix & 0x020000:
+            return "Locally administered"
+        position = bisect.bisect_left(self.prefixes, prefix)
+        if position < len(self.prefixes) and self.prefixes[position] == prefix:
+            return self.names[self.name_index[position]]
+        return None
+
+_oui_database = None
+
+def get_oui_database(script_dir):
+    """
+    Lazily loads the vendor database once: the IEEE oui.csv if the user has placed it
+    in the data folder, else the bundled database, else an empty one.
+    """
+    global _oui_database
+    if _oui_database is None:
+        data_dir = os.path.join(script_dir, NETWORK_DATA_FOLDER_NAME)
+        try:
+            _oui_database = OuiDatabase.from_ieee_csv(os.path.join(data_dir, OUI_REGISTRY_FILE))
+        except (OSError, ValueError):
+            try:
+                _oui_database = OuiDatabase.load(os.path.join(data_dir, OUI_DATABASE_FILE))
+            except (OSError, ValueError):
+                _oui_database = OuiDatabase()
+    return _oui_database
+
+# --- Routing Table and Longest-Prefix Match ---
+
+RTF_UP, RTF_GATEWAY, RTF_REJECT = 0x1, 0x2, 0x200
+ADDRESS_BITS = {socket.AF_INET: 32, socket.AF_INET6: 128}
+
+def read_linux_routes(proc_path=PROC_PATH):
+    """
+    Reads /proc/net/route and /proc/net/ipv6_route. Returns a list of
+    (family, destination_int, prefixlen, gateway or None, ifname, metric) tuples for
+    every usable route (up and not a reject route).
+    """
+    routes = []
+    try:
+        with open(os.path.join(proc_path, "net", "route")) as f:
+            for line in f.read().splitlines()[1:]:
+                # Iface Destination Gateway Flags RefCnt Use Metric Mask ... (addresses little-endian hex)
+                fields = line.split()
+                if len(fields) < 8:
+                    continue
+                flags = int(fields[3], 16)
+                if not flags & RTF_UP or flags & RTF_REJECT:
+                    continue
+                destination = int.from_bytes(bytes.fromhex(fields[1]), "little")
+                prefixlen = bin(int(fields[7], 16)).count("1")
+                gateway = socket.inet_ntoa(struct.pack("<I", int(fields[2], 16))) if flags & RTF_GATEWAY else None
+                routes.append((socket.AF_INET, destination, prefixlen, gateway, fields[0], int(fields[6])))
+    except OSError:
+        pass
+    try:
+        with open(os.path.join(proc_path, "net", "ipv6_route")) as f:
+            for line in f:
+                # dest dest_len src src_len next_hop metric refcnt use flags ifname
+                fields = line.split()
+                if len(fields) < 10:
+                    continue
+                flags = int(fields[8], 16)
+                if not flags & RTF_UP or flags & RTF_REJECT:
+                    continue
+                gateway = socket.inet_ntop(socket.AF_INET6, bytes.fromhex(fields[4])) if int(fields[4], 16) else None
+                routes.append((socket.AF_INET6, int(fields[0], 16), int(fields[1], 16), gateway, fields[9], int(fields[5], 16)))
+    except OSError:
+        pass
+    return routes
+
+def format_route_destination(route):
+    family, destination, prefixlen = route[:3]
+    packed = destination.to_bytes(ADDRESS_BITS[family] // 8, "big")
+    return f"{socket.inet_ntop(family, packed)}/{prefixlen}"
+
+class RoutePrefixTrie:
+    """
+    Binary trie over destination address bits, one per address family. A lookup walks
+    at most 32 (IPv4) or 128 (IPv6) nodes no matter how many routes are installed, and
+    remembers the deepest node that holds a route: the longest-prefix match. When
+    several routes share a prefix, the one with the lowest metric wins, like the kernel.
+    Nodes are [child0, child1, route] lists to keep the walk cheap.
+    """
+
+    def __init__(self, routes=()):
+        self._roots = {family: [None, None, None] for family in ADDRESS_BITS}
+        self.count = 0
+        for route in routes:
+            self.insert(route)
+
+    def insert(self, route):
+        family, destination, prefixlen = route[:3]
+        bits = ADDRESS_BITS[family]
+        node = self._roots[family]
+        for shift in range(bits - 1, bits - 1 - prefixlen, -1):
+            bit = (destination >> shift) & 1
+            child = node[bit]
+            if child is None:
+                child = node[bit] = [None, None, None]
+            node = child
+        if node[2] is None:
+            self.count += 1
+        if node[2] is None or route[5] < node[2][5]:
+            node[2] = route
+
+    def lookup(self, address):
+        """Returns the best route tuple for an IPv4/IPv6 address string, or None. Raises ValueError."""
+        ip = ipaddress.ip_address(address.strip())
+        family = socket.AF_INET if ip.version == 4 else socket.AF_INET6
+        value = int(ip)
+        node = self._roots[family]
+        best = node[2]
+        for shift in range(ADDRESS_BITS[family] - 1, -1, -1):
+            node = node[(value >> shift) & 1]
+            if node is None:
+                break
+            if node[2] is not None:
+                best = node[2]
+        return best
+
+def benchmark_route_lookup(route_count=50000, lookups=20000):
+    """Times trie lookups against a linear scan over a synthetic VPN-sized IPv4 table. Returns seconds per lookup."""
+    rng = random.Random(7)
+    routes = [(socket.AF_INET, 0, 0, "192.0.2.1", "eth0", 100)]
+    for _ in range(route_count):
+        prefixlen = rng.randint(8, 32)
+        destination = rng.getrandbits(32) >> (32 - prefixlen) << (32 - prefixlen)
+        routes.append((socket.AF_INET, destination, prefixlen, None, "tun0", 0))
+    addresses = [str(ipaddress.IPv4Address(rng.getrandbits(32))) for _ in range(lookups)]
+
+    start = time.perf_counter()
+    trie = RoutePrefixTrie(routes)
+    results = {"routes": trie.count, "trie build": time.perf_counter() - start}
+
+    start = time.perf_counter()
+    for address in addresses:
+        trie.lookup(address)
+    results["trie lookup"] = (time.perf_counter() - start) / lookups
+
+    scanned = addresses[:max(1, lookups // 100)]
+    start = time.perf_counter()
+    for address in scanned:
+        value = int(ipaddress.IPv4Address(address))
+        max((route for route in routes
+             if (value ^ route[1]) >> (32 - route[2]) == 0), key=lambda route: (route[2], -route[5]))
+    results["linear scan"] = (time.perf_counter() - start) / len(scanned)
+    return results
+
+# --- Bulk Subnet Calculator ---
+
+CIDR_TOKEN_PATTERN = re.compile(r"^(?=[0-9A-Fa-f]*[.:])[0-9A-Fa-f:.]*[0-9][0-9A-Fa-f:.]*(?:/[0-9.]+)?$")
+
+def _ipv4_mask_prefix(address, mask):
+    """
+    Returns the prefix length for an 'address mask' pair written with a dotted netmask
+    (255.255.255.0) or a Cisco wildcard/hostmask (0.0.0.255), or None if mask is neither.
+    0.0.0.0 and 255.255.255.255 are both at once: they mean /0 after 0.0.0.0 (a default
+    route or 'any') and /32 after any other address (a single host).
+    """
+    if ":" in address or "/" in address:
+        return None
+    try:
+        value = int(ipaddress.IPv4Address(mask))
+    except ValueError:
+        return None
+    if value in (0, 0xFFFFFFFF):
+        return 0 if address == "0.0.0.0" else 32
+    inverted = value ^ 0xFFFFFFFF
+    if inverted & (inverted + 1) == 0: # Netmask: ones then zeros
+        return 32 - inverted.bit_length()
+    if value & (value + 1) == 0:       # Wildcard: zeros then ones
+        return 32 - value.bit_length()
+    return None
+
+def parse_cidr_list(text):
+    """
+    Pulls every CIDR out of free-form text such as firewall configs. Bare addresses
+    become /32 (/128), 'address netmask' and 'address wildcard' pairs are combined, and
+    words and '#' comments are skipped. Returns ([(token, ip_network)], [(line_no, token, error)]).
+    """
+    networks, errors = [], []
+    for line_no, line in enumerate(text.splitlines(), 1):
+        tokens = [token for token in re.split(r"[\s,;]+", line.split("#", 1)[0]) if CIDR_TOKEN_PATTERN.match(token)]
+        position = 0
+        while position < len(tokens):
+            token = tokens[position]
+            position += 1
+            prefix = _ipv4_mask_prefix(token, tokens[position]) if position < len(tokens) else None
+            if prefix is not None:
+                token = f"{token}/{prefix}"
+                position += 1
+            try:
+                networks.append((token, ipaddress.ip_network(token, strict=False)))
+            except ValueError as e:
+                errors.append((line_no, token, str(e)))
+    return networks, errors
+
+def describe_subnet(network):
+    """Returns (network, broadcast, first_host, last_host, usable_hosts) as display strings."""
+    base = int(network.network_address)
+    size = network.num_addresses
+    address = ipaddress.IPv4Address if network.version == 4 else ipaddress.IPv6Address
+    if network.version == 4:
+        broadcast = str(address(base + size - 1))
+        # /31 point-to-point links (RFC 3021) and /32 host routes have no network/broadcast
+        first, last = (base, base + size - 1) if size <= 2 else (base + 1, base + size - 2)
+    else:
+        broadcast = "-"
+        # The all-zeros address of an IPv6 subnet is the subnet-router anycast address
+        first, last = (base, base + size - 1) if size <= 2 else (base + 1, base + size - 1)
+    return str(network), broadcast, str(address(first)), str(address(last)), last - first + 1
+
+def find_cidr_overlaps(networks):
+    """
+    Finds duplicate and nested blocks with one sorted sweep, O(n log n). CIDR blocks are
+    either disjoint or nested, so after sorting by (family, start, largest first) every
+    block that overlaps an earlier one lies inside the innermost block still open on the
+    stack. Returns {index: ("duplicate" | "inside", index_of_enclosing_block)}.
+    """
+    order = sorted(range(len(networks)), key=lambda i: (networks[i].version, int(networks[i].network_address),
+                                                       -networks[i].num_addresses))
+    relations = {}
+    stack = [] # (index, version, start, end) of the enclosing blocks, innermost last
+    for i in order:
+        network = networks[i]
+        start = int(network.network_address)
+        end = start + network.num_addresses - 1
+        while stack and (stack[-1][1] != network.version or stack[-1][3] < start):
+            stack.pop()
+        if stack:
+            parent, _version, parent_start, parent_end = stack[-1]
+            if (parent_start, parent_end) == (start, end):
+                relations[i] = ("duplicate", parent)
+                continue # Later blocks are attributed to the first copy
+            relations[i] = ("inside", parent)
+        stack.append((i, network.version, start, end))
+    return relations
+
+def collapse_cidrs(networks):
+    """Aggregates the blocks into the smallest equivalent list (per address family)."""
+    collapsed = []
+    for version in (4, 6):
+        collapsed += ipaddress.collapse_addresses(sorted(n for n in networks if n.version == version))
+    return collapsed
+
+def iter_subnet_rows(entries, chunk_size=500):
+    """
+    Yields lists of table rows (token, network, broadcast, first, last, hosts, note) in
+    input order, chunk_size rows at a time, so a UI can show results while the rest are
+    computed.
+    """
+    networks = [network for _token, network in entries]
+    relations = find_cidr_overlaps(networks)
+    chunk = []
+    for i, (token, network) in enumerate(entries):
+        relation = relations.get(i)
+        if relation is None:
+            note = ""
+        else:
+            kind, other = relation
+            note = f"{'Duplicate of' if kind == 'duplicate' else 'Inside'} {entries[other][0]}"
+        chunk.append((token, *describe_subnet(network), note))
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+# --- Socket Inventory (/proc/net/tcp, udp) ---
+
+TCP_STATES = {
+    1: "ESTABLISHED", 2: "SYN_SENT", 3: "SYN_RECV", 4: "FIN_WAIT1", 5: "FIN_WAIT2", 6: "TIME_WAIT",
+    7: "CLOSE", 8: "CLOSE_WAIT", 9: "LAST_ACK", 10: "LISTEN", 11: "CLOSING", 12: "NEW_SYN_RECV",
+}
+CONNECTION_FILTERS = {
+    "Listening + Established": ("LISTEN", "ESTABLISHED"), "Listening": ("LISTEN",),
+    "Established": ("ESTABLISHED",), "All": (),
+}
+SOCKET_TABLES = (("tcp", socket.AF_INET), ("tcp6", socket.AF_INET6), ("udp", socket.AF_INET), ("udp6", socket.AF_INET6))
+
+def _decode_proc_ip(addr_hex, family):
+    """Decodes a /proc/net address such as '0100007F' (32-bit words in host byte order)."""
+    words = struct.unpack("=4I" if family == socket.AF_INET6 else "=I", bytes.fromhex(addr_hex))
+    return socket.inet_ntop(family, struct.pack(f">{len(words)}I", *words))
+
+def read_proc_net_sockets(proc_path=PROC_PATH):
+    """
+    Reads /proc/net/{tcp,tcp6,udp,udp6}. Returns a list of
+    (proto, local_ip, local_port, remote_ip, remote_port, state, inode) tuples. UDP
+    sockets are reported as LISTEN when unconnected and ESTABLISHED when connected.
+    """
+    sockets = []
+    for proto, family in SOCKET_TABLES:
+        try:
+            with open(os.path.join(proc_path, "net", proto)) as f:
+                lines = f.read().splitlines()[1:]
+        except OSError:
+            continue
+        is_udp = proto.startswith("udp")
+        # Thousands of sockets share a handful of addresses, so each is decoded once
+        ips = {}
+        for line in lines:
+            fields = line.split(None, 10)
+            if len(fields) < 10:
+                continue
+            local_hex, local_port = fields[1].split(":")
+            remote_hex, remote_port = fields[2].split(":")
+            local_ip = ips.get(local_hex) or ips.setdefault(local_hex, _decode_proc_ip(local_hex, family))
+            remote_ip = ips.get(remote_hex) or ips.setdefault(remote_hex, _decode_proc_ip(remote_hex, family))
+            state = int(fields[3], 16)
+            if is_udp:
+                state = "ESTABLISHED" if state == 1 else "LISTEN"
+            else:
+                state = TCP_STATES.get(state, str(state))
+            sockets.append((proto, local_ip, int(local_port, 16), remote_ip, int(remote_port, 16), state, int(fields[9])))
+    return sockets
+
+class SocketOwnerIndex:
+    """
+    Maps socket inodes to owning processes by scanning /proc/<pid>/fd. The result of
+    each PID's scan is cached. A refresh scans only PIDs it has not seen before and
+    forgets PIDs that have exited. When a socket appears that no cached PID owns, only
+    the known PIDs whose open-file count changed are rescanned (Linux 6.2+ reports it
+    as the size of /proc/<pid>/fd; PIDs without it are always candidates). If that
+    does not find the owner, a socket was swapped for another fd, so the PIDs that
+    already own sockets are rescanned. Inodes still unresolved (usually other users'
+    processes) do not trigger further rescans.
+    """
+
+    def __init__(self, proc_path=PROC_PATH):
+        self.proc_path = proc_path
+        self._pid_sockets = {} # pid -> (comm, frozenset of socket inodes)
+        self._pid_fd_counts = {} # pid -> open-file count at the last scan, or None if unknown
+        self._inode_owner = {} # inode -> pid
+        self._unresolvable = frozenset()
+        self.last_scanned = 0
+
+    def _fd_count(self, pid):
+        try:
+            return os.stat(os.path.join(self.proc_path, pid, "fd")).st_size or None
+        except OSError:
+            return None
+
+    def _scan_pid(self, pid):
+        fd_dir = os.path.join(self.proc_path, pid, "fd")
+        self._pid_fd_counts[pid] = self._fd_count(pid)
+        inodes = set()
+        try:
+            with os.scandir(fd_dir) as entries:
+                for entry in entries:
+                    try:
+                        target = os.readlink(entry.path)
+                    except OSError:
+                        continue
+                    if target.startswith("socket:["):
+                        inodes.add(int(target[8:-1]))
+        except OSError:
+            pass # Exited, or not ours to inspect
+        try:
+            with open(os.path.join(self.proc_path, pid, "comm")) as f:
+                comm = f.read().strip()
+        except OSError:
+            comm = "?"
+        self._pid_sockets[pid] = (comm, frozenset(inodes))
+        for inode in inodes:
+            self._inode_owner[inode] = pid
+
+    def _rebuild_owner_map(self):
+        self._inode_owner = {inode: pid for pid, (_comm, inodes) in self._pid_sockets.items() for inode in inodes}
+
+    def _rescan(self, pids):
+        for pid in pids:
+            self._scan_pid(pid)
+        self._rebuild_owner_map()
+        self.last_scanned += len(pids)
+
+    def refresh(self, wanted_inodes):
+        """Brings the cache up to date for the given socket inodes. Returns {inode: (pid, comm)}."""
+        live_pids = {name for name in os.listdir(self.proc_path) if name.isdigit()}
+        gone = self._pid_sockets.keys() - live_pids
+        for pid in gone:
+            del self._pid_sockets[pid]
+            del self._pid_fd_counts[pid]
+        if gone:
+            self._rebuild_owner_map()
+
+        new_pids = live_pids - self._pid_sockets.keys()
+        for pid in new_pids:
+            self._scan_pid(pid)
+        self.last_scanned = len(new_pids)
+
+        missing = {inode for inode in wanted_inodes if inode and inode not in self._inode_owner}
+        if missing - self._unresolvable:
+            # A known process opened a new socket: rescan the ones whose fd count moved
+            known = live_pids - new_pids
+            changed = [pid for pid in known
+                       if self._pid_fd_counts[pid] is None or self._fd_count(pid) != self._pid_fd_counts[pid]]
+            self._rescan(changed)
+            missing = {inode for inode in missing if inode not in self._inode_owner}
+            if missing - self._unresolvable:
+                # Same count, so an fd was closed as the socket was opened (e.g. a reconnect)
+                self._rescan([pid for pid in known.difference(changed) if self._pid_sockets[pid][1]])
+                missing = {inode for inode in missing if inode not in self._inode_owner}
+        self._unresolvable = frozenset(missing)
+
+        owners = {}
+        for inode in wanted_inodes:
+            pid = self._inode_owner.get(inode)
+            if pid is not None:
+                owners[inode] = (int(pid), self._pid_sockets[pid][0])
+        return owners
+
+def get_socket_inventory(owner_index):
+    """Returns (rows, error) where each row is the read_proc_net_sockets tuple plus (pid, process)."""
+    if platform.system() != "Linux":
+        return [], "OS Not Supported"
+    sockets = read_proc_net_sockets(owner_index.proc_path)
+    owners = owner_index.refresh([entry[6] for entry in sockets])
+    return [entry + owners.get(entry[6], (None, "")) for entry in sockets], None
+
+def benchmark_socket_inventory(iterations=50):
+    """Times a cold inventory (empty PID cache) against warm refreshes. Returns seconds per call."""
+    start = time.perf_counter()
+    for _ in range(iterations):
+        rows, _error = get_socket_inventory(SocketOwnerIndex())
+    cold = (time.perf_counter() - start) / iterations
+
+    index = SocketOwnerIndex()
+    get_socket_inventory(index)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        rows, _error = get_socket_inventory(index)
+    warm = (time.perf_counter() - start) / iterations
+    return {"sockets": len(rows), "cold scan": cold, "incremental": warm}
+
+def benchmark_network_backends(iterations=50):
+    """Times the native Linux readers against spawning 'ip a'. Returns seconds per call."""
+    results = {}
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        get_netlink_adapters()
+    results["native (netlink)"] = (time.perf_counter() - start) / iterations
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        get_sysfs_adapters()
+    results["native (sysfs)"] = (time.perf_counter() - start) / iterations
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        output, _error = run_command(["ip", "a"])
+        build_adapter_records(parse_ip_addr_output(output or ""))
+    results["subprocess (ip a)"] = (time.perf_counter() - start) / iterations
+
+    return results
+
+# --- System Command Execution ---
+
+def decode_command_output(data):
+    """Decodes captured output the way text=True did: locale encoding, universal newlines."""
+    return data.decode(locale.getpreferredencoding(False), "replace").replace("\r\n", "\n")
+
+class CommandResult:
+    """Outcome of one finished command. stdout and stderr are the raw captured bytes."""
+
+    __slots__ = ("argv", "returncode", "stdout", "stderr", "elapsed")
+
+    def __init__(self, argv, returncode, stdout, stderr, elapsed):
+        self.argv = argv
+        self.returncode = returncode
+        self.stdout = stdout
+        self.stderr = stderr
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.returncode == 0
+
+    def __repr__(self):
+        return f"CommandResult(argv={self.argv!r}, returncode={self.returncode}, elapsed={self.elapsed:.3f})"
+
+def _subprocess_group_options():
+    """Starts each command in its own process group so a timeout can kill its children too."""
+    if platform.system() == "Windows":
+        return {"creationflags": subprocess.CREATE_NEW_PROCESS_GROUP | subprocess.CREATE_NO_WINDOW}
+    return {"start_new_session": True}
+
+async def _kill_process_group(process):
+    if platform.system() == "Windows":
+        try:
+            killer = await asyncio.create_subprocess_exec(
+                "taskkill", "/F", "/T", "/PID", str(process.pid), stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL, creationflags=subprocess.CREATE_NO_WINDOW)
+            await killer.wait()
+        except OSError:
+            pass
+    else:
+        try:
+            os.killpg(process.pid, signal.SIGKILL) # The group id is the pid (start_new_session)
+        except (ProcessLookupError, PermissionError):
+            pass
+    if process.returncode is None:
+        try:
+            process.kill()
+        except ProcessLookupError:
+            pass
+    await process.wait()
+
+class CommandExecutor:
+    """
+    Runs system commands as asyncio subprocesses on one background loop thread, so no
+    caller (least of all the Tk thread) ever blocks on a hung command. Commands are
+    argv lists, never shell strings. A semaphore caps how many run at once. Each
+    command has a timeout, after which its whole process group is killed. submit()
+    returns a concurrent.futures.Future: Tk code attaches a done-callback and hands the
+    result to the UI thread, and cancelling the Future kills the command.
+    """
+
+    def __init__(self, max_concurrency=COMMAND_MAX_CONCURRENCY, timeout=COMMAND_TIMEOUT):
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.started = 0
+        self.timed_out = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
+        self._closed = False
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("CommandExecutor is shut down")
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop() # A proactor loop on Windows, which subprocesses need
+                self._thread = threading.Thread(target=self._run_loop, name="CommandExecutor", daemon=True)
+                self._thread.start()
+            return self._loop
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_forever()
+        finally:
+            self._loop.close()
+
+    async def _start(self, argv, env, cwd, stdin, stderr=subprocess.PIPE):
+        return await asyncio.create_subprocess_exec(
+            *argv, stdin=stdin, stdout=subprocess.PIPE, stderr=stderr, env=env, cwd=cwd,
+            **_subprocess_group_options())
+
+    async def run_async(self, argv, timeout=None, env=None, cwd=None, input=None):
+        """
+        Runs argv and returns a CommandResult. Raises OSError if it cannot be started, and
+        subprocess.TimeoutExpired (after killing the process group) if it overruns.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        async with self._semaphore:
+            start = time.perf_counter()
+            process = await self._start(argv, env, cwd, subprocess.PIPE if input is not None else subprocess.DEVNULL)
+            self.started += 1
+            try:
+                stdout, stderr = await asyncio.wait_for(process.communicate(input), timeout)
+            except asyncio.TimeoutError:
+                self.timed_out += 1
+                await _kill_process_group(process)
+                raise subprocess.TimeoutExpired(argv, timeout) from None
+            except asyncio.CancelledError:
+                await _kill_process_group(process)
+                raise
+            return CommandResult(argv, process.returncode, stdout, stderr, time.perf_counter() - start)
+
+    async def stream_async(self, argv, timeout=None, env=None, cwd=None):
+        """
+        Async iterator over argv's output (stderr merged into stdout) as decoded lines,
+        each yielded as soon as the command prints it. The timeout covers the whole run;
+        on expiry the process group is killed and subprocess.TimeoutExpired is raised.
+        Closing the iterator early also kills the command. Raises OSError if it cannot
+        be started. The exit status is yielded last as an int.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        async with self._semaphore:
+            process = await self._start(argv, env, cwd, subprocess.DEVNULL, subprocess.STDOUT)
+            self.started += 1
+            deadline = time.monotonic() + timeout
+            finished = False
+            # Same decoding as decode_command_output, but incremental: a multi-byte character
+            # split across two reads is held back until the rest of it arrives
+            decoder = codecs.getincrementaldecoder(locale.getpreferredencoding(False))("replace")
+            partial = ""
+            try:
+                while True:
+                    # Read whatever is available (not line by line): a chatty command costs one
+                    # wait per chunk, and every complete line in the chunk is decoded at once
+                    chunk = await asyncio.wait_for(process.stdout.read(65536), max(0.0, deadline - time.monotonic()))
+                    partial = (partial + decoder.decode(chunk, final=not chunk)).replace("\r\n", "\n")
+                    if not chunk:
+                        break
+                    end = partial.rfind("\n")
+                    if end < 0:
+                        if len(partial) >= 65536: # No newline in sight (e.g. a progress bar): flush anyway
+                            held = "\r" if partial.endswith("\r") else "" # Could be half of a CRLF
+                            yield partial[:len(partial) - len(held)]
+                            partial = held
+                        continue
+                    lines = partial[:end].split("\n")
+                    partial = partial[end + 1:]
+                    for line in lines:
+                        yield line + "\n"
+                if partial:
+                    yield partial
+                yield await asyncio.wait_for(process.wait(), max(0.0, deadline - time.monotonic()))
+                finished = True
+            except asyncio.TimeoutError:
+                self.timed_out += 1
+                raise subprocess.TimeoutExpired(argv, timeout) from None
+            finally:
+                if not finished and process.returncode is None:
+                    await _kill_process_group(process)
+
+    def stream(self, argv, timeout=None, env=None, cwd=None):
+        """Thread-safe: starts argv and returns a CommandStream of its output lines."""
+        if isinstance(argv, str):
+            raise TypeError("Commands are argv lists, not shell strings")
+        return CommandStream(self, list(argv), timeout, env, cwd)
+
+    def submit(self, argv, timeout=None, env=None, cwd=None, input=None):
+        """Thread-safe: starts argv (a list) and returns a Future for its CommandResult."""
+        if isinstance(argv, str):
+            raise TypeError("Commands are argv lists, not shell strings")
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(self.run_async(list(argv), timeout, env, cwd, input), loop)
+
+    def run(self, argv, timeout=None, env=None, cwd=None, input=None):
+        """Blocking convenience for worker threads: submit() and wait for the result."""
+        return self.submit(argv, timeout, env, cwd, input).result()
+
+    def shutdown(self):
+        """Kills every running command and stops the loop thread."""
+        with self._lock:
+            loop, self._closed = self._loop, True
+        if loop is None:
+            return
+
+        async def cancel_all():
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        try:
+            asyncio.run_coroutine_threadsafe(cancel_all(), loop).result(5)
+        except Exception:
+            pass # Loop already gone, or a child refused to die in time
+        loop.call_soon_threadsafe(loop.stop)
+
+class CommandStream:
+    """
+    Blocking iterator over a streamed command's output lines, for worker threads. The
+    lines are produced by CommandExecutor.stream_async on the executor's loop. After
+    iteration ends, returncode holds the exit status. Iteration re-raises
+    subprocess.TimeoutExpired or OSError from the command, and raises
+    concurrent.futures.CancelledError if cancel() stopped it. cancel() is thread-safe.
+    """
+
+    _END = object()
+
+    def __init__(self, executor, argv, timeout, env, cwd):
+        self.argv = argv
+        self.returncode = None
+        self._lines = queue.SimpleQueue()
+        loop = executor._ensure_loop()
+        self.future = asyncio.run_coroutine_threadsafe(self._pump(executor, timeout, env, cwd), loop)
+
+    async def _pump(self, executor, timeout, env, cwd):
+        try:
+            async for item in executor.stream_async(self.argv, timeout, env, cwd):
+                if isinstance(item, int):
+                    self.returncode = item
+                else:
+                    self._lines.put(item)
+        finally:
+            self._lines.put(self._END)
+        return self.returncode
+
+    def __iter__(self):
+        while True:
+            line = self._lines.get()
+            if line is self._END:
+                break
+            yield line
+        self.future.result() # Re-raises a timeout, start failure or cancellation
+
+    def cancel(self):
+        self.future.cancel()
+
+_command_executor = None
+_command_executor_lock = threading.Lock()
+
+def get_command_executor():
+    """The app-wide executor, so the concurrency cap applies across every feature."""
+    global _command_executor
+    with _command_executor_lock:
+        if _command_executor is None:
+            _command_executor = CommandExecutor()
+        return _command_executor
+
+class CommandResultCache:
+    """
+    Shares command output between features. Results are keyed by argv, environment and
+    working directory, and each entry expires after its own TTL. The total captured
+    bytes are capped; the least recently used entries are evicted first. Identical
+    calls made while the command is still running get the same Future (single-flight),
+    so cancelling a shared Future cancels it for every caller. Timeouts and start
+    failures are never cached; a non-zero exit status is, since it is the command's
+    real answer.
+    """
+
+    def __init__(self, executor=None, max_bytes=COMMAND_CACHE_MAX_BYTES):
+        self.executor = executor # None: the app-wide executor
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0 # Calls that joined a command already running
+        self.evictions = 0
+        self.bytes = 0
+        self._entries = OrderedDict() # key -> (CommandResult, expires_at monotonic, size); oldest use first
+        self._inflight = {}           # key -> Future
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(argv, env, cwd):
+        return tuple(argv), tuple(sorted(env.items())) if env is not None else None, cwd
+
+    def submit(self, argv, ttl, timeout=None, env=None, cwd=None):
+        """Thread-safe: returns a Future for argv's CommandResult, from the cache when fresh."""
+        if isinstance(argv, str):
+            raise TypeError("Commands are argv lists, not shell strings")
+        key = self._key(argv, env, cwd)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    future = concurrent.futures.Future()
+                    future.set_result(entry[0])
+                    return future
+                self._remove(key) # Expired
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+                return future
+            self.misses += 1
+            future = self._inflight[key] = (self.executor or get_command_executor()).submit(argv, timeout, env, cwd)
+        future.add_done_callback(lambda done: self._store(key, ttl, done))
+        return future
+
+    def run(self, argv, ttl, timeout=None, env=None, cwd=None):
+        """Blocking convenience for worker threads."""
+        return self.submit(argv, ttl, timeout, env, cwd).result()
+
+    def _remove(self, key):
+        _result, _expires_at, size = self._entries.pop(key)
+        self.bytes -= size
+
+    def _store(self, key, ttl, future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+            if future.cancelled() or future.exception() is not None:
+                return
+            result = future.result()
+            size = len(result.stdout) + len(result.stderr)
+            if ttl <= 0 or size > self.max_bytes:
+                return
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (result, time.monotonic() + ttl, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {"hits": self.hits, "misses": self.misses, "coalesced": self.coalesced,
+                    "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+                    "entries": len(self._entries), "bytes": self.bytes, "max_bytes": self.max_bytes,
+                    "evictions": self.evictions, "running": len(self._inflight)}
+
+_command_cache = None
+
+def get_command_cache():
+    """The app-wide command-result cache, layered over the app-wide executor."""
+    global _command_cache
+    with _command_executor_lock:
+        if _command_cache is None:
+            _command_cache = CommandResultCache()
+        return _command_cache
+
+def format_command_cache_stats(stats, executor):
+    return (f"Command cache: {stats['hits']} hits, {stats['misses']} misses, {stats['coalesced']} shared in flight "
+            f"({stats['hit_rate']:.0%} served without a new run) | {stats['entries']} entries, "
+            f"{stats['bytes'] / 1024:.1f} of {stats['max_bytes'] / 1024:.0f} KiB, {stats['evictions']} evicted | "
+            f"Executor: {executor.started} started, {executor.timed_out} timed out")
+
+def run_command(command, timeout=None, cache_ttl=None):
+    """
+    Executes a command and returns (output, None) or (None, error). command is an argv
+    list; a string is split with shlex for older callers and is never given to a shell.
+    Runs on the shared CommandExecutor, so it is subject to its timeout and concurrency cap.
+    With cache_ttl, output up to that many seconds old may be shared from the command cache.
+    """
+    try:
+        argv = shlex.split(command) if isinstance(command, str) else list(command)
+        if cache_ttl:
+            result = get_command_cache().run(argv, cache_ttl, timeout)
+        else:
+            result = get_command_executor().run(argv, timeout)
     except Exception as e:
         return None, f"Error executing command: {e}"
 
+    if not result.ok:
+        return None, decode_command_output(result.stderr).strip()
+
+    return decode_command_output(result.stdout), None
+
+# Ready-made diagnostics for the console (argv lists; the entry can be edited before running)
+if platform.system() == "Windows":
+    DIAGNOSTIC_COMMANDS = {
+        "Ping 1.1.1.1": ["ping", "-n", "4", "1.1.1.1"],
+        "Trace route to 1.1.1.1": ["tracert", "-d", "1.1.1.1"],
+        "Routing table": ["route", "print"],
+        "Listening sockets": ["netstat", "-ano"],
+        "DNS lookup": ["nslookup", "example.com"],
+        "Adapter details": ["ipconfig", "/all"],
+    }
+else:
+    DIAGNOSTIC_COMMANDS = {
+        "Ping 1.1.1.1": ["ping", "-c", "4", "1.1.1.1"],
+        "Trace route to 1.1.1.1": ["traceroute", "-n", "1.1.1.1"],
+        "Routing table": ["ip", "route"] if platform.system() == "Linux" else ["netstat", "-rn"],
+        "Listening sockets": ["ss", "-tulpn"] if platform.system() == "Linux" else ["netstat", "-an"],
+        "DNS lookup": ["nslookup", "example.com"],
+        "Adapter details": ["ip", "addr"] if platform.system() == "Linux" else ["ifconfig"],
+    }
+
+def split_command_line(text):
+    """Splits a typed command into argv (never run through a shell). Raises ValueError."""
+    return shlex.split(text, posix=platform.system() != "Windows")
+
+# --- Number Base Conversion (Radix Engine) ---
+# Tk-free, so the Base Converter tab and --bench-radix share it.
+
+RADIX_DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz" # Bitcoin alphabet
+
+# Input prefixes recognised when the base is auto-detected (or matches the chosen base)
+RADIX_PREFIXES = {"0x": 16, "0b": 2, "0o": 8}
+
+# Byte encodings: the integer is written as big-endian bytes, then encoded
+BYTE_ENCODINGS = ("base58", "base64", "base85")
+
+# Converter menu entries: display name -> base (int 2..36 or a byte encoding name)
+RADIX_CHOICES = {"Binary": 2, "Octal": 8, "Decimal": 10, "Hex": 16}
+RADIX_CHOICES.update((f"Base {base}", base) for base in range(3, 37) if base not in (8, 10, 16))
+RADIX_CHOICES.update({"Base58": "base58", "Base64": "base64", "Base85": "base85"})
+
+_DIGIT_VALUES = {char: value for value, char in enumerate(RADIX_DIGITS)}
+_DIGIT_VALUES.update((char.lower(), value) for value, char in enumerate(RADIX_DIGITS))
+_SEPARATORS = re.compile(r"[\s_]+") # Digit grouping typed or pasted by the user, e.g. 1_000 or 'DEAD BEEF'
+
+def _check_base(base):
+    if base in BYTE_ENCODINGS:
+        return base
+    if not isinstance(base, int) or not 2 <= base <= 36:
+        raise ValueError(f"Unsupported base: {base!r} (use 2-36 or {', '.join(BYTE_ENCODINGS)})")
+    return base
+
+def detect_base(text, base=None):
+    """
+    Splits an optional 0x/0b/0o prefix off text. With base None the prefix decides
+    (decimal without one); otherwise a prefix is only stripped if it matches base.
+    Returns (base, digits) where digits still carries any leading sign.
+    """
+    text = text.strip()
+    sign = ""
+    if text and text[0] in "+-":
+        sign, text = text[0], text[1:].lstrip()
+    prefix_base = RADIX_PREFIXES.get(text[:2].lower())
+    if prefix_base is not None and (base is None or base == prefix_base):
+        return prefix_base, sign + text[2:]
+    return (10 if base is None else base), sign + text
+
+def _check_non_negative(value):
+    if value < 0:
+        raise ValueError("Byte encodings need a non-negative value")
+    return value
+
+def _int_to_bytes(value):
+    _check_non_negative(value)
+    return value.to_bytes(max(1, (value.bit_length() + 7) // 8), "big")
+
+def _digits_to_int(digits, base, alphabet_values=_DIGIT_VALUES):
+    """Generic parser for alphabets int() does not know (base58). Chunked to keep big-int work low."""
+    value = 0
+    chunk = 8
+    for start in range(0, len(digits), chunk):
+        part = digits[start:start + chunk]
+        part_value = 0
+        for char in part:
+            digit = alphabet_values.get(char)
+            if digit is None or digit >= base:
+                raise ValueError(f"Invalid digit {char!r} for base {base}")
+            part_value = part_value * base + digit
+        value = value * base ** len(part) + part_value
+    return value
+
+_BASE58_VALUES = {char: value for value, char in enumerate(BASE58_ALPHABET)}
+
+def parse_number(text, base=None):
+    """
+    Parses text in base (2-36 or a byte encoding) into an int. With base None the base is
+    taken from a 0x/0b/0o prefix, or decimal. Spaces and underscores between digits are
+    ignored for the numeric bases. Raises ValueError for empty or invalid input.
+    """
+    if base in BYTE_ENCODINGS:
+        text = text.strip()
+        if not text:
+            raise ValueError("Empty input")
+        if base == "base58":
+            return _parse_divide_conquer(text, 58, lambda piece: _digits_to_int(piece, 58, _BASE58_VALUES))
+        try:
+            data = base64.b64decode(text, validate=True) if base == "base64" else base64.b85decode(text)
+        except ValueError as e: # binascii.Error is a ValueError
+            raise ValueError(f"Invalid {base} input: {e}") from None
+        return int.from_bytes(data, "big")
+
+    base, digits = detect_base(text, None if base is None else _check_base(base))
+    digits = _SEPARATORS.sub("", digits)
+    sign = -1 if digits[:1] == "-" else 1
+    digits = digits.lstrip("+-")
+    if not digits:
+        raise ValueError("Empty input")
+    # Checked here rather than left to int(), which would also accept non-ASCII digits
+    bad = next((char for char in digits if _DIGIT_VALUES.get(char, base) >= base), None)
+    if bad is not None:
+        raise ValueError(f"Invalid digit {bad!r} for base {base}")
+    return sign * _parse_digits(digits, base)
+
+# --- Subquadratic Big-Int Conversion ---
+# CPython's int(text, base) and str(int) are quadratic for non-power-of-two bases and
+# refuse more than 4300 digits by default. Long numbers are converted by divide and
+# conquer over a cached tree of powers base**(RADIX_LEAF_DIGITS * 2**level). Parsing
+# needs only multiplications (Karatsuba); formatting divides by each tree power through
+# a cached Newton reciprocal, so every division also becomes multiplications. int() and
+# str() are only ever called on leaves of at most RADIX_LEAF_DIGITS digits, which keeps
+# the conversion clear of the digit limit without changing sys.set_int_max_str_digits.
+
+RADIX_LEAF_DIGITS = 1000 # Leaves are converted by the builtins (well below the 4300-digit limit)
+_NEWTON_MIN_BITS = 8192 # Below this a plain (schoolbook) division is faster than Newton
+
+def _reciprocal(power):
+    """
+    About 2**(2m) / power for an m-bit power, within a few units: one Newton step from
+    the reciprocal of the top half of power (found the same way). It is not corrected
+    to the exact floor; _PowerTree.divmod absorbs the small error when it fixes up its
+    quotient estimate, which saves a full-size multiplication per level.
+    """
+    bits = power.bit_length()
+    if bits <= _NEWTON_MIN_BITS:
+        return (1 << (2 * bits)) // power
+    high_bits = bits // 2 + 32 # Guard bits keep the Newton step's error to a few units
+    estimate = _reciprocal(power >> (bits - high_bits)) << (bits - high_bits)
+    return estimate + ((estimate * ((1 << (2 * bits)) - power * estimate)) >> (2 * bits))
+
+class _PowerTree:
+    """base**(RADIX_LEAF_DIGITS * 2**level) for each level, and their reciprocals, built on demand."""
+
+    def __init__(self, base):
+        self.base = base
+        self.powers = [base ** RADIX_LEAF_DIGITS]
+        self.reciprocals = {}
+
+    def power(self, level):
+        while len(self.powers) <= level:
+            self.powers.append(self.powers[-1] * self.powers[-1])
+        return self.powers[level]
+
+    def level_above(self, value):
+        """A level whose power squared exceeds value (so one split there suffices), judged by bit length alone."""
+        level = 0
+        while value.bit_length() >= 2 * self.power(level).bit_length() - 1:
+            level += 1
+        return level
+
+    def divmod(self, value, level):
+        """divmod(value, power(level)) for 0 <= value < power(level)**2, via the cached reciprocal (Barrett)."""
+        power = self.powers[level]
+        bits = power.bit_length()
+        if bits <= _NEWTON_MIN_BITS:
+            return divmod(value, power)
+        reciprocal = self.reciprocals.get(level)
+        if reciprocal is None:
+            reciprocal = self.reciprocals[level] = _reciprocal(power)
+        # Only the top half of value matters to the quotient estimate: an m x m multiply
+        # instead of 2m x m. It is within a few units of the true quotient either way
+        quotient = ((value >> (bits - 1)) * reciprocal) >> (bits + 1)
+        remainder = value - quotient * power
+        while remainder < 0:
+            remainder += power
+            quotient -= 1
+        while remainder >= power:
+            remainder -= power
+            quotient += 1
+        return quotient, remainder
+
+_power_trees = {}
+
+def _power_tree(base):
+    tree = _power_trees.get(base)
+    if tree is None:
+        tree = _power_trees[base] = _PowerTree(base)
+    return tree
+
+def _parse_divide_conquer(digits, base, parse_leaf=None):
+    """int(digits, base) for validated digits of any length: value = high * base**len(low) + low, recursively."""
+    if parse_leaf is None:
+        if base & (base - 1) == 0:
+            return int(digits, base) # Power-of-two bases are linear in CPython and have no digit limit
+        parse_leaf = lambda piece: int(piece, base)
+    if len(digits) <= RADIX_LEAF_DIGITS:
+        return parse_leaf(digits)
+    tree = _power_tree(base)
+
+    def parse(start, end, level):
+        # Split off the low RADIX_LEAF_DIGITS * 2**level digits; the high part is shorter than that
+        while level >= 0 and end - start <= RADIX_LEAF_DIGITS << level:
+            level -= 1
+        if level < 0:
+            return parse_leaf(digits[start:end])
+        middle = end - (RADIX_LEAF_DIGITS << level)
+        return parse(start, middle, level - 1) * tree.power(level) + parse(middle, end, level - 1)
+
+    level = 0
+    while RADIX_LEAF_DIGITS << (level + 1) < len(digits):
+        level += 1
+    return parse(0, len(digits), level)
+
+def _format_divide_conquer(value, base, alphabet, format_leaf):
+    """
+    Writes a non-negative value in base by splitting on the power tree. format_leaf
+    handles the leaves, each below base**RADIX_LEAF_DIGITS.
+    """
+    tree = _power_tree(base)
+    pieces = []
+    zero = alphabet[0]
+
+    def emit(number, level, pad):
+        if level < 0:
+            text = format_leaf(number)
+            pieces.append(text.rjust(RADIX_LEAF_DIGITS, zero) if pad else text)
+            return
+        if not pad and number < tree.powers[level]:
+            emit(number, level - 1, False) # Most significant part: no split needed at this level
+            return
+        high, low = tree.divmod(number, level)
+        emit(high, level - 1, pad)
+        emit(low, level - 1, True) # Low halves always have exactly RADIX_LEAF_DIGITS * 2**level digits
+
+    emit(value, tree.level_above(value), False)
+    return "".join(pieces)
+
+def _parse_digits(digits, base):
+    """int(digits, base) for validated ASCII digits, whatever their length."""
+    return _parse_divide_conquer(digits, base)
+
+def _format_chunked(value, base, alphabet):
+    """
+    Writes a non-negative value in base using alphabet. Peels off k digits per big-int
+    division (base**k fits a machine word), so the big-int work is len/k divisions
+    rather than one per digit; the small per-chunk loop runs on plain ints.
+    """
+    if value == 0:
+        return alphabet[0]
+    digits_per_chunk = 1
+    while base ** (digits_per_chunk + 1) < (1 << 62):
+        digits_per_chunk += 1
+    chunk_base = base ** digits_per_chunk
+    chunks = []
+    while value:
+        value, chunk = divmod(value, chunk_base)
+        chunks.append(chunk)
+    out = []
+    for position, chunk in enumerate(reversed(chunks)):
+        part = []
+        for _ in range(digits_per_chunk):
+            chunk, digit = divmod(chunk, base)
+            part.append(alphabet[digit])
+        if position == 0:
+            while len(part) > 1 and part[-1] == alphabet[0]:
+                part.pop() # No leading zeros on the most significant chunk
+        out.append("".join(reversed(part)))
+    return "".join(out)
+
+def _format_base10_leaf(value):
+    return str(value)
+
+def format_number(value, base, uppercase=True):
+    """Writes an int in base (2-36 or a byte encoding). Numeric bases get a '-' sign if negative."""
+    base = _check_base(base)
+    if base == "base58":
+        _check_non_negative(value)
+        if value.bit_length() < RADIX_LEAF_DIGITS * 5:
+            return _format_chunked(value, 58, BASE58_ALPHABET)
+        return _format_divide_conquer(value, 58, BASE58_ALPHABET,
+                                      lambda leaf: _format_chunked(leaf, 58, BASE58_ALPHABET))
+    if base == "base64":
+        return base64.b64encode(_int_to_bytes(value)).decode("ascii")
+    if base == "base85":
+        return base64.b85encode(_int_to_bytes(value)).decode("ascii")
+
+    sign, value = ("-", -value) if value < 0 else ("", value)
+    alphabet = RADIX_DIGITS if uppercase else RADIX_DIGITS.lower()
+    if base in (2, 8, 16):
+        text = format(value, {2: "b", 8: "o", 16: "X" if uppercase else "x"}[base]) # Linear-time builtins
+    elif value.bit_length() < RADIX_LEAF_DIGITS * base.bit_length():
+        text = str(value) if base == 10 else _format_chunked(value, base, alphabet) # Fits in a leaf or two
+    else:
+        format_leaf = _format_base10_leaf if base == 10 else lambda leaf: _format_chunked(leaf, base, alphabet)
+        text = _format_divide_conquer(value, base, alphabet, format_leaf)
+    return sign + text
+
+def convert_radix(text, from_base, to_base, uppercase=True):
+    """Parses text in from_base (None auto-detects a 0x/0b/0o prefix) and writes it in to_base."""
+    return format_number(parse_number(text, from_base), to_base, uppercase)
+
+# Bench harness for --bench-radix: the engine against the original digit-at-a-time loop
+
+def naive_dec_to_base(number, base):
+    """The converter's original digit-at-a-time loop (repeated %, // and string prepends), for comparison."""
+    if number == 0:
+        return "0"
+    result = ""
+    while number > 0:
+        remainder = number % base
+        result = RADIX_DIGITS[remainder] + result
+        number //= base
+    return result
+
+def benchmark_radix(digit_counts=(1000, 10000, 100000, 1000000), bases=(10, 36, "base58"), repeat=3):
+    """
+    Times the engine on random values of roughly each number of decimal digits, against
+    the original digit-at-a-time loop (naive_dec_to_base), the word-chunked loop and, for
+    base 10, CPython's own str()/int() with the digit limit lifted. Comparisons that would
+    take minutes at a size are skipped (None). "tree" is the one-off cost of building the
+    power tree and reciprocals, paid by the first conversion in each base. Returns a list
+    of dicts of seconds.
+    """
+    rng = random.Random(1)
+    limits = {"naive": 20000, "chunked": 200000, "builtin": 300000} # Largest digit count each is run at
+    rows = []
+    for digit_count in digit_counts:
+        value = rng.getrandbits(int(digit_count * 3.3219280948873626)) | 1 # ~digit_count decimal digits
+        runs = repeat if digit_count < 100000 else 1
+        for base in bases:
+            _power_trees.pop(58 if base == "base58" else base, None)
+            cold = _time_call(format_number, value, base)
+            warm = min(_time_call(format_number, value, base) for _ in range(runs))
+            text = format_number(value, base)
+            row = {"digits": digit_count, "base": base, "format": warm, "tree": max(0.0, cold - warm),
+                   "parse": min(_time_call(parse_number, text, base) for _ in range(runs)),
+                   "naive": None, "chunked": None, "builtin str": None, "builtin int": None}
+            if isinstance(base, int) and digit_count <= limits["naive"]:
+                row["naive"] = min(_time_call(naive_dec_to_base, value, base) for _ in range(runs))
+            if digit_count <= limits["chunked"]:
+                alphabet = BASE58_ALPHABET if base == "base58" else RADIX_DIGITS
+                row["chunked"] = min(_time_call(_format_chunked, value, 58 if base == "base58" else base, alphabet)
+                                     for _ in range(runs))
+            if base == 10 and digit_count <= limits["builtin"]:
+                previous_limit = sys.get_int_max_str_digits() if hasattr(sys, "get_int_max_str_digits") else None
+                try:
+                    if previous_limit is not None:
+                        sys.set_int_max_str_digits(0)
+                    row["builtin str"] = min(_time_call(str, value) for _ in range(runs))
+                    row["builtin int"] = min(_time_call(int, text) for _ in range(runs))
+                finally:
+                    if previous_limit is not None:
+                        sys.set_int_max_str_digits(previous_limit)
+            rows.append(row)
+    return rows
+
+def _time_call(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return time.perf_counter() - start
+
+def format_radix_benchmark_rows(rows):
+    columns = ("format", "tree", "parse", "naive", "chunked", "builtin str", "builtin int")
+    lines = [f"{'digits':>8} {'base':>7} " + " ".join(f"{column:>11}" for column in columns) + f" {'vs naive':>9}",
+             "(seconds; '-' = skipped at this size)"]
+    for row in rows:
+        cells = " ".join(f"{row[column]:11.4f}" if row[column] is not None else f"{'-':>11}" for column in columns)
+        speedup = f"{row['naive'] / row['format']:8.1f}x" if row["naive"] else f"{'-':>9}"
+        lines.append(f"{row['digits']:>8} {row['base']!s:>7} {cells} {speedup}")
+    return "\n".join(lines)
+
 # --- Measurement Conversion Constants ---
 
 LENGTH_CONVERSIONS = {
@@ -187,7 +3730,7 @@ CONVERSION_MAP = {
 # --- Main Application Class ---
 
 class SystemUtilityApp:
-    def __init__(self, master):
+    def __init__(self, master, metrics_address=None):
         self.master = master
         master.title("System Utility, Converter, Customizer, and Pong")
         
@@ -213,7 +3756,46 @@ class SystemUtilityApp:
         # Data storage
         self.adapter_data = {}
         self.app_data = {} 
-        self.base_map = {"Binary": 2, "Octal": 8, "Decimal": 10, "Hex": 16}
+        self.base_map = dict(RADIX_CHOICES) # Display name -> base 2..36 or byte encoding
+        self.converted_full_value = None # Complete result for Copy; the label may show it abbreviated
+        self.convert_generation = 0
+
+        # Thread hand-off: background workers put (callback, args) here for the Tk loop to run
+        self.ui_queue = queue.Queue()
+        self.network_monitor = None
+        self.network_refresh_generation = 0 # Only the newest refresh may update the UI
+        self.network_snapshot = NetworkSnapshotService()
+        self.throughput_sampler = ThroughputSampler()
+        self.throughput_ring = ThroughputRing()
+        self.throughput_job = None
+        self.link_stats_sampler = LinkStatsSampler()
+        self.link_stats_job = None
+        self.lan_sweeper = None
+        self.socket_owner_index = SocketOwnerIndex()
+        self.connections_rows = []
+        self.route_trie = None
+        self.route_items = {}
+        self.history_snapshots = {}
+        self.history_flush_job = None
+        self.throughput_server = None
+        self.latency_monitor = None
+        self.latency_series = {}
+        self.latency_lines = {}
+        self.latency_redraw_pending = False
+        self.subnet_generation = 0
+        self.dns_resolver = ReverseDnsResolver()
+        self.metrics_server = None
+        self.fleet_collector = None
+        self.fleet_rows = []
+        self.fleet_sort = (None, False) # (column, descending)
+        self.diagnostic_stream = None
+        self.diagnostic_pending = deque(maxlen=DIAGNOSTIC_SCROLLBACK) # Lines waiting for the next console flush
+        self.diagnostic_job = None
+        try:
+            self.network_history = NetworkHistoryLog(
+                os.path.join(self.script_dir, NETWORK_DATA_FOLDER_NAME, HISTORY_FILE_NAME))
+        except OSError:
+            self.network_history = None # Read-only install: run without history
 
         # --- CRITICAL: Initialize status_var and is_updating BEFORE setup functions ---
         self.status_var = tk.StringVar(value="Ready.")
@@ -256,8 +3838,28 @@ class SystemUtilityApp:
         self.color_tab = tk.Frame(self.notebook, bg=self.background_color) 
         self.customization_tab = tk.Frame(self.notebook, bg=self.background_color) 
         self.pong_tab = tk.Frame(self.notebook, bg=self.background_color) 
+        self.sweep_tab = tk.Frame(self.notebook, bg=self.background_color)
+        self.connections_tab = tk.Frame(self.notebook, bg=self.background_color)
+        self.neighbors_tab = tk.Frame(self.notebook, bg=self.background_color)
+        self.routes_tab = tk.Frame(self.notebook, bg=self.background_color)
+        self.history_tab = tk.Frame(self.notebook, bg=self.background_color)
+        self.throughput_test_tab = tk.Frame(self.notebook, bg=self.background_color)
+        self.latency_tab = tk.Frame(self.notebook, bg=self.background_color)
+        self.subnet_tab = tk.Frame(self.notebook, bg=self.background_color)
+        self.fleet_tab = tk.Frame(self.notebook, bg=self.background_color)
+        self.diagnostics_tab = tk.Frame(self.notebook, bg=self.background_color)
 
         self.notebook.add(self.system_tab, text='IP-Check & AppLauncher')
+        self.notebook.add(self.sweep_tab, text='LAN Sweep')
+        self.notebook.add(self.connections_tab, text='Connections')
+        self.notebook.add(self.neighbors_tab, text='Neighbors')
+        self.notebook.add(self.routes_tab, text='Routes')
+        self.notebook.add(self.history_tab, text='History')
+        self.notebook.add(self.throughput_test_tab, text='Throughput Test')
+        self.notebook.add(self.latency_tab, text='Latency')
+        self.notebook.add(self.subnet_tab, text='Subnet Calculator')
+        self.notebook.add(self.fleet_tab, text='Fleet')
+        self.notebook.add(self.diagnostics_tab, text='Diagnostics')
         self.notebook.add(self.converter_tab, text='Base Converter')
         self.notebook.add(self.measurement_tab, text='Unit Converter') 
         self.notebook.add(self.color_tab, text='Color Picker') 
@@ -267,6 +3869,16 @@ class SystemUtilityApp:
         # --- Setup Sections ---
         self.setup_network_info_section(self.system_tab)
         self.setup_launcher_section(self.system_tab) 
+        self.setup_lan_sweep_section(self.sweep_tab)
+        self.setup_connections_section(self.connections_tab)
+        self.setup_neighbors_section(self.neighbors_tab)
+        self.setup_routes_section(self.routes_tab)
+        self.setup_history_section(self.history_tab)
+        self.setup_throughput_test_section(self.throughput_test_tab)
+        self.setup_latency_section(self.latency_tab)
+        self.setup_subnet_section(self.subnet_tab)
+        self.setup_fleet_section(self.fleet_tab)
+        self.setup_diagnostics_section(self.diagnostics_tab)
         self.setup_converter_section(self.converter_tab)
         self.setup_measurement_converter_section(self.measurement_tab)
         self.setup_color_picker_section(self.color_tab) 
@@ -282,18 +3894,67 @@ class SystemUtilityApp:
         
         # Initial data load
         self.load_initial_data()
+        self.start_network_monitor()
+        if metrics_address:
+            self.start_metrics_server(*metrics_address)
+        self.process_ui_queue()
+        self.throughput_tick()
+        self.notebook.bind("<<NotebookTabChanged>>", lambda event: self.on_tab_changed())
+        self.update_link_stats_timer()
         
         # Stop game loop if the app is closed
         self.master.protocol("WM_DELETE_WINDOW", self.on_close)
 
     def on_close(self):
-        """Clean up game loop on closing the app."""
+        """Clean up game loop and background workers on closing the app."""
         if self.is_game_running:
             try:
                 self.master.after_cancel(self.pong_game_id)
             except AttributeError:
                 pass
+        if self.network_monitor:
+            self.network_monitor.stop()
+        if self.throughput_job:
+            self.master.after_cancel(self.throughput_job)
+        if self.link_stats_job:
+            self.master.after_cancel(self.link_stats_job)
+        self.link_stats_sampler.close()
+        if self.lan_sweeper:
+            self.lan_sweeper.cancel()
+        if self.history_flush_job:
+            self.master.after_cancel(self.history_flush_job)
+        if self.throughput_server:
+            self.throughput_server.stop()
+        if self.latency_monitor:
+            self.latency_monitor.stop()
+        if self.fleet_collector:
+            self.fleet_collector.cancel()
+        if self.diagnostic_job:
+            self.master.after_cancel(self.diagnostic_job)
+        self.dns_resolver.shutdown()
+        get_command_executor().shutdown()
+        if self.metrics_server:
+            self.metrics_server.stop()
+        if self.network_history:
+            try:
+                self.network_history.close()
+            except OSError:
+                pass
         self.master.destroy()
+
+    def run_on_ui_thread(self, callback, *args):
+        """Thread-safe: schedules callback(*args) to run on the Tk main loop."""
+        self.ui_queue.put((callback, args))
+
+    def process_ui_queue(self):
+        """Runs callbacks queued by background threads, then re-arms itself."""
+        try:
+            while True:
+                callback, args = self.ui_queue.get_nowait()
+                callback(*args)
+        except queue.Empty:
+            pass
+        self.master.after(20, self.process_ui_queue)
         
     def _get_font(self, size, style='normal'):
         """Helper to dynamically generate font tuples."""
@@ -359,7 +4020,8 @@ class SystemUtilityApp:
             elif isinstance(widget, tk.Button):
                 # Standard Button styling
                 button_text = widget.cget('text')
-                if button_text in ["Launch Selected", "Convert", "Apply Styles"]:
+                if button_text in ["Launch Selected", "Convert", "Apply Styles", "Start Sweep", "Find Route", "Run Test", 
+                                   "Start Monitor", "Calculate", "Collect", "Run"]:
                     # Primary Buttons
                     widget.config(font=self.font_normal, bg=self.primary_color, fg="white", 
                                 activebackground=self.primary_color, activeforeground="white")
@@ -404,6 +4066,7 @@ class SystemUtilityApp:
                                   font=self.font_large, bg=self.card_color, fg=self.text_color,
                                   padx=15, pady=15, bd=1, relief=tk.RIDGE)
         net_frame.pack(pady=15, fill="x", padx=10)
+        self.net_frame = net_frame
         
         # Data container for labels
         self.network_labels = {}
@@ -421,20 +4084,37 @@ class SystemUtilityApp:
         self.adapter_menu.grid(row=0, column=1, sticky="ew", padx=5, pady=5)
 
         # Row 1: Refresh Button
-        tk.Button(net_frame, text="Refresh", command=self.update_network_data,
+        self.refresh_button = tk.Button(net_frame, text="Refresh", command=self.update_network_data,
                   font=self.font_normal_small, bg=self.primary_color, fg="white", bd=0, 
                   padx=5, pady=1, relief=tk.GROOVE, 
-                  activebackground="#0056b3", activeforeground="white").grid(row=0, column=2, sticky="e", padx=5)
+                  activebackground="#0056b3", activeforeground="white")
+        self.refresh_button.grid(row=0, column=2, sticky="e", padx=5)
 
-        # Row 2 & 3: Info Labels (Placeholder creation)
+        # Rows 2-6: Info Labels (Placeholder creation)
         self.network_labels["ipv4"] = self._create_info_label(net_frame, "IPv4 Address:", "Retrieving...", 2)
-        self.network_labels["mac"] = self._create_info_label(net_frame, "MAC Address:", "Retrieving...", 3)
+        self.network_labels["ipv6"] = self._create_info_label(net_frame, "IPv6 Address:", "Retrieving...", 3)
+        self.network_labels["mac"] = self._create_info_label(net_frame, "MAC Address:", "Retrieving...", 4)
+        self.network_labels["gateway"] = self._create_info_label(net_frame, "Gateway:", "Retrieving...", 5)
+        self.network_labels["link"] = self._create_info_label(net_frame, "Link:", "Retrieving...", 6)
 
-        # Row 4: Copy Button
+        # Rows 7-8: Link Quality and Error Counters (sampled only while this tab is visible)
+        self.network_labels["wireless"] = self._create_info_label(net_frame, "Wireless:", "Sampling...", 7)
+        self.network_labels["errors"] = self._create_info_label(net_frame, "Errors/Drops:", "Sampling...", 8)
+
+        # Row 9: Copy Button
         tk.Button(net_frame, text="Copy IP", command=self.copy_ipv4,
                   font=self.font_normal_small, bg=self.secondary_color, fg="white", bd=0, 
                   padx=5, pady=1, relief=tk.GROOVE, 
-                  activebackground="#4db850", activeforeground="white").grid(row=4, column=0, sticky="w", padx=5, pady=5)
+                  activebackground="#4db850", activeforeground="white").grid(row=9, column=0, sticky="w", padx=5, pady=5)
+
+        # Row 10 & 11: Live Throughput (RX/TX rates and sparkline)
+        self.network_labels["throughput"] = self._create_info_label(net_frame, "Throughput:", "Sampling...", 10)
+        self.throughput_canvas = tk.Canvas(net_frame, height=50, bg=self.background_color, highlightthickness=0)
+        self.throughput_canvas.grid(row=11, column=0, columnspan=3, sticky="ew", padx=5, pady=(2, 5))
+        # The two lines are created once; each tick only moves their coordinates
+        self.rx_spark_line = self.throughput_canvas.create_line(0, 0, 0, 0, fill=self.primary_color, width=2)
+        self.tx_spark_line = self.throughput_canvas.create_line(0, 0, 0, 0, fill=self.secondary_color, width=2)
+        self._spark_coords = [0.0] * (self.throughput_ring.capacity * 2)
                   
         net_frame.grid_columnconfigure(1, weight=1)
 
@@ -459,44 +4139,268 @@ class SystemUtilityApp:
         else:
             self.update_app_launcher_dropdown()
 
-    def update_network_data(self):
-        """Fetches network data and updates adapter dropdown."""
+    def update_network_data(self, force=True):
+        """
+        Starts a network refresh on a worker thread; a newer refresh supersedes older ones.
+        A forced refresh (the Refresh button) bypasses the snapshot cache.
+        """
+        if force:
+            self.network_snapshot.invalidate()
+        self.network_refresh_generation += 1
+        generation = self.network_refresh_generation
+
+        self._set_network_refreshing(True)
         self.status_var.set("Fetching network information...")
-        self.adapter_data = get_network_info()
+        threading.Thread(target=self._network_refresh_worker, args=(generation,),
+                         name="NetworkRefresh", daemon=True).start()
+
+    def _network_refresh_worker(self, generation):
+        """Runs off the Tk thread: the OS query may block for seconds (e.g. 'ipconfig /all')."""
+        adapters, error = self.network_snapshot.get()
+        self.run_on_ui_thread(self._finish_network_refresh, generation, adapters, error)
+
+    def _set_network_refreshing(self, refreshing):
+        """Shows or clears the 'refreshing' state on the adapter panel."""
+        self.net_frame.config(text="Network Details (refreshing...)" if refreshing else "Network Details")
+        self.refresh_button.config(text="Refreshing..." if refreshing else "Refresh")
+
+    def _finish_network_refresh(self, generation, adapter_data, error):
+        """Applies a finished refresh on the Tk thread, ignoring results that were superseded."""
+        if generation != self.network_refresh_generation:
+            return
+
+        self._set_network_refreshing(False)
+        previous_data = self.adapter_data
+        self.adapter_data = adapter_data
+        if not error:
+            self.record_network_history(adapter_data)
         
         adapters = list(self.adapter_data.keys())
+        self._populate_adapter_menu(adapters)
+        selected = self.adapter_var.get()
         
-        # Clear existing menu options
-        menu = self.adapter_menu["menu"]
-        menu.delete(0, "end")
-        
-        if adapters:
-            for adapter in adapters:
-                menu.add_command(label=adapter, 
-                                 command=lambda value=adapter: self.adapter_var.set(value))
-            
-            self.adapter_var.set(adapters[0])
-            self.display_selected_adapter(adapters[0])
+        if selected in adapter_data:
+            # Same adapter still selected: only redraw the labels whose fields changed
+            previous_record = previous_data.get(selected)
+            self.display_selected_adapter(
+                selected, previous_record.diff(adapter_data[selected]) if previous_record else None)
+            self.status_var.set(f"Network data refreshed. Found {len(adapters)} adapters.")
+        elif adapters:
+            self.adapter_var.set(adapters[0]) # The variable trace redraws the labels
             self.status_var.set(f"Network data refreshed. Found {len(adapters)} adapters.")
         else:
             self.adapter_var.set("No Adapters Found")
-            self.network_labels["ipv4"].config(text="N/A")
-            self.network_labels["mac"].config(text="N/A")
-            self.status_var.set("Network data refreshed. No active connections found.")
+            if error:
+                self.status_var.set(f"Network refresh failed: {error}")
+            else:
+                self.status_var.set("Network data refreshed. No active connections found.")
+
+    def _populate_adapter_menu(self, adapters):
+        """Replaces the adapter dropdown entries."""
+        menu = self.adapter_menu["menu"]
+        menu.delete(0, "end")
+        for adapter in adapters:
+            menu.add_command(label=adapter, 
+                             command=lambda value=adapter: self.adapter_var.set(value))
+
+    def start_network_monitor(self):
+        """Subscribes to kernel adapter change notifications (Linux only)."""
+        if platform.system() != "Linux":
+            return
+        try:
+            self.network_monitor = NetlinkChangeMonitor(self._on_network_change, 
+                                                         on_error=self._on_network_monitor_error)
+            self.network_monitor.start()
+        except OSError as e:
+            self.network_monitor = None
+            self.status_var.set(f"Live network updates unavailable: {e}")
+
+    def start_metrics_server(self, host, port):
+        """Serves the shared snapshot as Prometheus metrics (opt-in with --metrics-port)."""
+        try:
+            self.metrics_server = MetricsServer(self.network_snapshot, host, port)
+        except OSError as e:
+            self.status_var.set(f"Metrics endpoint unavailable: {e}")
+            return
+        self.metrics_server.start()
+        self.status_var.set(f"Serving metrics on http://{host}:{self.metrics_server.address[1]}/metrics")
+
+    def _on_network_change(self, adapters, diff):
+        """Monitor thread: refresh the shared snapshot, then hand the diff to the Tk loop."""
+        self.network_snapshot.update(adapters)
+        self.run_on_ui_thread(self.apply_network_changes, adapters, diff)
+
+    def _on_network_monitor_error(self, error):
+        """Monitor thread: live updates have stopped; the UI falls back to manual refresh."""
+        self.run_on_ui_thread(self._network_monitor_failed, error)
+
+    def _network_monitor_failed(self, error):
+        self.network_monitor = None
+        self.network_snapshot.invalidate()
+        self.status_var.set(f"Live network updates stopped ({error}). Use Refresh to update.")
+
+    def apply_network_changes(self, adapter_data, diff):
+        """Applies a pushed adapter diff, touching only the widgets that changed."""
+        self.adapter_data = adapter_data
+        self.record_network_history(adapter_data)
+        selected = self.adapter_var.get()
+
+        if diff["added"] or diff["removed"]:
+            adapters = list(adapter_data.keys())
+            self._populate_adapter_menu(adapters)
+            if selected not in adapter_data:
+                self.adapter_var.set(adapters[0] if adapters else "No Adapters Found")
+                selected = self.adapter_var.get()
+
+        if selected in diff["changed"]:
+            self.display_selected_adapter(selected, diff["changed"][selected])
+
+        summary = [f"+{name}" for name in diff["added"]] + [f"-{name}" for name in diff["removed"]]
+        summary += [f"{name} ({', '.join(sorted(fields))})" for name, fields in diff["changed"].items()]
+        self.status_var.set(f"Network change detected: {'; '.join(summary)}")
+
+
+    def throughput_tick(self):
+        """Samples /proc/net/dev once per second for the selected adapter and redraws the sparkline."""
+        self.throughput_job = self.master.after(1000, self.throughput_tick)
 
+        try:
+            rates = self.throughput_sampler.sample(self.adapter_var.get())
+        except OSError:
+            self.network_labels["throughput"].config(text="Not available on this OS")
+            self.master.after_cancel(self.throughput_job)
+            self.throughput_job = None
+            return
+
+        if rates is None:
+            return
+
+        rx_bps, tx_bps, rx_pps, tx_pps = rates
+        self.throughput_ring.append(rx_bps, tx_bps, rx_pps, tx_pps)
+        self.network_labels["throughput"].config(
+            text=f"RX {format_rate(rx_bps)} ({rx_pps:.0f} pkt/s) | TX {format_rate(tx_bps)} ({tx_pps:.0f} pkt/s)")
+        self._draw_throughput_sparkline()
+
+    def _draw_throughput_sparkline(self):
+        """Moves the RX/TX lines to the current history, reusing one coordinate list."""
+        ring = self.throughput_ring
+        if ring.count < 2:
+            return
+
+        width = self.throughput_canvas.winfo_width() or 300
+        height = self.throughput_canvas.winfo_height() or 50
+        slots = [ring.ordered_index(n) for n in range(ring.count)]
+        peak = max(1.0, max(ring.rx_bps[i] for i in slots), max(ring.tx_bps[i] for i in slots))
+        step = width / (ring.capacity - 1)
+        scale = (height - 4) / peak
+        coords = self._spark_coords
+        used = ring.count * 2
+
+        for series, line in ((ring.rx_bps, self.rx_spark_line), (ring.tx_bps, self.tx_spark_line)):
+            for n, slot in enumerate(slots):
+                x_index = ring.capacity - ring.count + n # Newest sample is always at the right edge
+                coords[2 * n] = x_index * step
+                coords[2 * n + 1] = height - 2 - series[slot] * scale
+            self.throughput_canvas.coords(line, coords[:used])
+
+    def on_tab_changed(self):
+        """Starts or stops per-tab timers and refreshes tab-local views when the visible tab changes."""
+        self.update_link_stats_timer()
+        if self.notebook.select() == str(self.diagnostics_tab):
+            self.show_command_stats()
+
+    def update_link_stats_timer(self):
+        """Runs the link stats timer only while the adapter panel's tab is the visible one."""
+        visible = self.notebook.select() == str(self.system_tab)
+        if visible and not self.link_stats_job:
+            self.link_stats_tick()
+        elif not visible and self.link_stats_job:
+            self.master.after_cancel(self.link_stats_job)
+            self.link_stats_job = None
+
+    def link_stats_tick(self):
+        """Samples wireless quality and error/drop/carrier counters for the selected adapter."""
+        self.link_stats_job = self.master.after(LINK_STATS_INTERVAL_MS, self.link_stats_tick)
+        adapter = self.adapter_var.get()
+        if adapter not in self.adapter_data:
+            return # Nothing selected yet
 
-    def display_selected_adapter(self, adapter_name):
-        """Updates IPv4 and MAC labels based on selected adapter."""
-        data = self.adapter_data.get(adapter_name, {"ipv4": "N/A", "mac": "N/A"})
+        try:
+            wireless, counters, deltas = self.link_stats_sampler.sample(adapter)
+        except OSError:
+            unsupported = platform.system() != "Linux"
+            if unsupported:
+                # No sysfs at all: stop sampling for good
+                self.master.after_cancel(self.link_stats_job)
+                self.link_stats_job = None
+            for key in ("wireless", "errors"):
+                self.network_labels[key].config(text="Not available on this OS" if unsupported else "N/A")
+            return
+
+        self.network_labels["wireless"].config(text=format_wireless_stats(wireless))
+        self.network_labels["errors"].config(text=format_link_counters(counters, deltas))
+
+    # Adapter panel label -> the AdapterRecord fields it is drawn from
+    ADAPTER_LABEL_FIELDS = {
+        "ipv4": ("ipv4",),
+        "ipv6": ("ipv6",),
+        "mac": ("mac",),
+        "gateway": ("gateway",),
+        "link": ("state", "speed", "mtu"),
+    }
+
+    def _format_adapter_label(self, key, record):
+        """Renders one adapter panel label from an AdapterRecord."""
+        if key in ("ipv4", "ipv6"):
+            addresses = getattr(record, key)
+            return ", ".join(f"{addr}/{prefix}" if prefix is not None else addr
+                             for addr, prefix in addresses) or "Not Found"
+        if key == "mac":
+            if not record.mac:
+                return "Not Found"
+            vendor = get_oui_database(self.script_dir).lookup(record.mac)
+            return f"{record.mac} ({vendor})" if vendor else record.mac
+        if key == "gateway":
+            return ", ".join(record.gateway) or "None"
+        link = [record.state]
+        if record.speed:
+            link.append(f"{record.speed} Mb/s")
+        if record.mtu:
+            link.append(f"MTU {record.mtu}")
+        return ", ".join(link)
+
+    def display_selected_adapter(self, adapter_name, changed_fields=None):
+        """
+        Updates the adapter labels for the selected adapter. With changed_fields (from a
+        record diff) only the labels drawn from those fields are touched.
+        """
+        if adapter_name != getattr(self, "_throughput_adapter", None):
+            # New adapter: its history starts from scratch
+            self._throughput_adapter = adapter_name
+            self.throughput_ring.clear()
+            self.throughput_sampler.reset()
+            if self.throughput_job:
+                self.network_labels["throughput"].config(text="Sampling...")
+            if self.link_stats_job:
+                # Show the new adapter's counters now rather than on the next tick
+                self.master.after_cancel(self.link_stats_job)
+                self.link_stats_job = None
+                self.link_stats_tick()
+        record = self.adapter_data.get(adapter_name)
         
-        self.network_labels["ipv4"].config(text=data.get("ipv4", "N/A"))
-        self.network_labels["mac"].config(text=data.get("mac", "N/A"))
-        self.status_var.set(f"Displaying details for adapter: {adapter_name}")
+        for key, fields in self.ADAPTER_LABEL_FIELDS.items():
+            if changed_fields is None or any(field in changed_fields for field in fields):
+                self.network_labels[key].config(
+                    text=self._format_adapter_label(key, record) if record else "N/A")
+        if changed_fields is None:
+            self.status_var.set(f"Displaying details for adapter: {adapter_name}")
         
     def copy_ipv4(self):
-        """Copies the currently displayed IPv4 address."""
-        ipv4 = self.network_labels["ipv4"].cget("text")
-        if ipv4 in ["Retrieving...", "N/A"]:
+        """Copies the primary IPv4 address of the selected adapter."""
+        adapters, _error, _taken_at = self.network_snapshot.peek()
+        record = adapters.get(self.adapter_var.get())
+        ipv4 = record.primary_ipv4 if record else None
+        if not ipv4:
             self.status_var.set("Copy failed: No valid IPv4 address available.")
             return
 
@@ -637,18 +4541,1065 @@ class SystemUtilityApp:
             self.status_var.set(f"Launch failed: {e}")
             messagebox.showerror("Launch Error", f"An error occurred during launch: {e}")
 
+    # --- Hostname Resolution Helpers ---
+
+    def fill_hostname_cell(self, tree, item, column, ip):
+        """Shows the reverse-DNS name of ip in a table cell, from the cache or once the lookup finishes."""
+        found, hostname = self.dns_resolver.peek(ip)
+        if found:
+            tree.set(item, column, hostname or "-")
+            return
+        tree.set(item, column, "...")
+        self.dns_resolver.resolve(ip).add_done_callback(
+            lambda future: self.run_on_ui_thread(self._set_hostname_cell, tree, item, column, future))
+
+    def _set_hostname_cell(self, tree, item, column, future):
+        if not tree.exists(item):
+            return # The table was refreshed while the lookup ran
+        try:
+            hostname = future.result()
+        except Exception:
+            hostname = None
+        tree.set(item, column, hostname or "-")
+
+    # --- LAN Sweep Methods ---
+
+    def setup_lan_sweep_section(self, parent_frame):
+        # Frame for LAN host discovery
+        sweep_frame = tk.LabelFrame(parent_frame, text="LAN Host Discovery (TCP Connect Sweep)", 
+                                    font=self.font_large, bg=self.card_color, fg=self.text_color,
+                                    padx=15, pady=15, bd=1, relief=tk.RIDGE)
+        sweep_frame.pack(pady=15, fill="both", expand=True, padx=10)
+
+        # Row 0: Subnet
+        tk.Label(sweep_frame, text="Subnet (CIDR):", font=self._get_font(10, 'bold'), 
+                 bg=self.card_color, fg=self.text_color).grid(row=0, column=0, sticky="w", padx=5, pady=5)
+        self.sweep_cidr_var = tk.StringVar()
+        tk.Entry(sweep_frame, textvariable=self.sweep_cidr_var, font=self.font_normal, 
+                 bg="#EFEFEF", fg=self.text_color, bd=1, relief=tk.FLAT).grid(row=0, column=1, sticky="ew", padx=5, pady=5)
+        tk.Button(sweep_frame, text="Use Selected Adapter", command=self.fill_sweep_subnet,
+                  font=self.font_normal_small, bg="#C0C0C0", fg=self.text_color, bd=0, 
+                  padx=5, pady=1, relief=tk.GROOVE).grid(row=0, column=2, sticky="ew", padx=5)
+
+        # Row 1: Ports and Start/Stop
+        tk.Label(sweep_frame, text="Ports:", font=self._get_font(10, 'bold'), 
+                 bg=self.card_color, fg=self.text_color).grid(row=1, column=0, sticky="w", padx=5, pady=5)
+        self.sweep_ports_var = tk.StringVar(value=", ".join(str(port) for port in SWEEP_PORTS))
+        tk.Entry(sweep_frame, textvariable=self.sweep_ports_var, font=self.font_normal, 
+                 bg="#EFEFEF", fg=self.text_color, bd=1, relief=tk.FLAT).grid(row=1, column=1, sticky="ew", padx=5, pady=5)
+        self.sweep_button = tk.Button(sweep_frame, text="Start Sweep", command=self.toggle_lan_sweep,
+                                      font=self.font_normal, bg=self.primary_color, fg="white", bd=0, 
+                                      padx=10, pady=5, relief=tk.GROOVE, 
+                                      activebackground="#0056b3", activeforeground="white")
+        self.sweep_button.grid(row=1, column=2, sticky="ew", padx=5)
+
+        # Row 2: Progress
+        self.sweep_progress_var = tk.StringVar(value="Idle.")
+        tk.Label(sweep_frame, textvariable=self.sweep_progress_var, font=self.font_normal_small, 
+                 bg=self.card_color, fg=self.text_color, anchor="w").grid(row=2, column=0, columnspan=3, sticky="ew", padx=5)
+
+        # Row 3: Results table (hosts are streamed in as they answer)
+        self.sweep_tree = ttk.Treeview(sweep_frame, columns=("host", "hostname", "ports", "rtt"), show="headings", height=12)
+        self.sweep_tree.heading("host", text="Host")
+        self.sweep_tree.heading("hostname", text="Hostname")
+        self.sweep_tree.heading("ports", text="Open Ports")
+        self.sweep_tree.heading("rtt", text="RTT (ms)")
+        self.sweep_tree.column("host", width=140)
+        self.sweep_tree.column("hostname", width=180)
+        self.sweep_tree.column("ports", width=260)
+        self.sweep_tree.column("rtt", width=80, anchor="e")
+        self.sweep_tree.grid(row=3, column=0, columnspan=3, sticky="nsew", padx=5, pady=5)
+
+        sweep_frame.grid_columnconfigure(1, weight=1)
+        sweep_frame.grid_rowconfigure(3, weight=1)
+
+    def fill_sweep_subnet(self):
+        """Fills the subnet entry from the adapter selected on the network panel."""
+        adapters, _error, _taken_at = self.network_snapshot.peek()
+        network, note = sweep_network_for_adapter((adapters or {}).get(self.adapter_var.get()))
+        if network:
+            self.sweep_cidr_var.set(str(network))
+        self.status_var.set(note or f"Sweep subnet set to {network}.")
+
+    def toggle_lan_sweep(self):
+        """Starts a sweep on a worker thread, or cancels the one in progress."""
+        if self.lan_sweeper:
+            self.lan_sweeper.cancel()
+            self.sweep_progress_var.set("Cancelling...")
+            return
+
+        if not self.sweep_cidr_var.get().strip():
+            self.fill_sweep_subnet()
+        try:
+            network = ipaddress.ip_network(self.sweep_cidr_var.get().strip(), strict=False)
+            ports = parse_port_list(self.sweep_ports_var.get())
+            if network.num_addresses > SWEEP_MAX_HOSTS:
+                raise ValueError(f"{network} has more than {SWEEP_MAX_HOSTS} addresses.")
+        except ValueError as e:
+            self.status_var.set(f"Sweep failed: {e}")
+            messagebox.showerror("Sweep Error", str(e))
+            return
+
+        hosts = list(network.hosts()) or [network.network_address]
+        self.sweep_tree.delete(*self.sweep_tree.get_children())
+        self.sweep_started_at = time.perf_counter()
+        self.sweep_found = 0
+        self.sweep_progress_var.set(f"Sweeping {len(hosts)} hosts on {len(ports)} ports...")
+        self.sweep_button.config(text="Stop Sweep")
+
+        sweeper = self.lan_sweeper = LanSweeper(ports)
+
+        def worker():
+            live = sweeper.sweep(hosts, lambda host, open_ports, rtt: 
+                                 self.run_on_ui_thread(self._add_sweep_result, sweeper, host, open_ports, rtt))
+            self.run_on_ui_thread(self._finish_lan_sweep, sweeper, live, len(hosts))
+
+        threading.Thread(target=worker, name="LanSweep", daemon=True).start()
+
+    def _add_sweep_result(self, sweeper, host, open_ports, rtt):
+        """Streams one live host into the results table."""
+        if sweeper is not self.lan_sweeper:
+            return # Result from a sweep that has since been replaced
+        self.sweep_found += 1
+        ports_text = ", ".join(map(str, open_ports)) or "(closed, host answered)"
+        item = self.sweep_tree.insert("", "end", values=(host, "", ports_text, f"{rtt * 1000:.1f}"))
+        self.fill_hostname_cell(self.sweep_tree, item, "hostname", host)
+        self.sweep_progress_var.set(f"Sweeping... {self.sweep_found} live hosts so far.")
+
+    def _finish_lan_sweep(self, sweeper, live, host_count):
+        if sweeper is not self.lan_sweeper:
+            return
+        self.lan_sweeper = None
+        self.sweep_button.config(text="Start Sweep")
+        elapsed = time.perf_counter() - self.sweep_started_at
+        if live is None:
+            self.sweep_progress_var.set(f"Sweep cancelled after {elapsed:.1f}s ({self.sweep_found} live hosts).")
+        else:
+            self.sweep_progress_var.set(f"Sweep finished: {live} of {host_count} hosts alive in {elapsed:.1f}s.")
+        self.status_var.set(self.sweep_progress_var.get())
+
+    # --- Connections Methods ---
+
+    def setup_connections_section(self, parent_frame):
+        # Frame for the socket inventory
+        conn_frame = tk.LabelFrame(parent_frame, text="Sockets and Owning Processes", 
+                                   font=self.font_large, bg=self.card_color, fg=self.text_color,
+                                   padx=15, pady=15, bd=1, relief=tk.RIDGE)
+        conn_frame.pack(pady=15, fill="both", expand=True, padx=10)
+
+        # Row 0: Filter and Refresh
+        tk.Label(conn_frame, text="Show:", font=self._get_font(10, 'bold'), 
+                 bg=self.card_color, fg=self.text_color).grid(row=0, column=0, sticky="w", padx=5, pady=5)
+        self.connections_filter_var = tk.StringVar(value="Listening + Established")
+        filter_menu = tk.OptionMenu(conn_frame, self.connections_filter_var, *CONNECTION_FILTERS, 
+                                    command=lambda _choice: self.show_connections())
+        filter_menu.config(font=self.font_normal, bg="#E0E0E0", activebackground="#D0D0D0", relief=tk.FLAT)
+        filter_menu.grid(row=0, column=1, sticky="w", padx=5, pady=5)
+        self.connections_button = tk.Button(conn_frame, text="Refresh", command=self.update_connections,
+                                            font=self.font_normal_small, bg=self.primary_color, fg="white", bd=0, 
+                                            padx=5, pady=1, relief=tk.GROOVE, 
+                                            activebackground="#0056b3", activeforeground="white")
+        self.connections_button.grid(row=0, column=2, sticky="e", padx=5)
+        self.connections_resolve_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(conn_frame, text="Resolve remote hostnames", variable=self.connections_resolve_var, 
+                       command=self.show_connections, font=self.font_normal_small, 
+                       bg=self.card_color, fg=self.text_color).grid(row=0, column=1, sticky="e", padx=5)
+
+        # Row 1: Summary
+        self.connections_summary_var = tk.StringVar(value="Press Refresh to list sockets.")
+        tk.Label(conn_frame, textvariable=self.connections_summary_var, font=self.font_normal_small, 
+                 bg=self.card_color, fg=self.text_color, anchor="w").grid(row=1, column=0, columnspan=3, sticky="ew", padx=5)
+
+        # Row 2: Table
+        columns = (("proto", "Proto", 50), ("local", "Local Address", 180), ("remote", "Remote Address", 180), 
+                   ("remote_host", "Remote Host", 160), ("state", "State", 95), ("pid", "PID", 60), 
+                   ("process", "Process", 120))
+        self.connections_tree = ttk.Treeview(conn_frame, columns=[c[0] for c in columns], show="headings", height=14)
+        for column, heading, width in columns:
+            self.connections_tree.heading(column, text=heading)
+            self.connections_tree.column(column, width=width, anchor="w")
+        scrollbar = ttk.Scrollbar(conn_frame, orient="vertical", command=self.connections_tree.yview)
+        self.connections_tree.configure(yscrollcommand=scrollbar.set)
+        self.connections_tree.grid(row=2, column=0, columnspan=3, sticky="nsew", padx=(5, 0), pady=5)
+        scrollbar.grid(row=2, column=3, sticky="ns", pady=5)
+
+        conn_frame.grid_columnconfigure(1, weight=1)
+        conn_frame.grid_rowconfigure(2, weight=1)
+
+    def update_connections(self):
+        """Reads the socket tables on a worker thread; the PID cache lives across refreshes."""
+        self.connections_button.config(state=tk.DISABLED)
+        self.connections_summary_var.set("Reading socket tables...")
+
+        def worker():
+            start = time.perf_counter()
+            rows, error = get_socket_inventory(self.socket_owner_index)
+            elapsed = time.perf_counter() - start
+            self.run_on_ui_thread(self._finish_connections_refresh, rows, error, elapsed)
+
+        threading.Thread(target=worker, name="SocketInventory", daemon=True).start()
+
+    def _finish_connections_refresh(self, rows, error, elapsed):
+        self.connections_button.config(state=tk.NORMAL)
+        if error:
+            self.connections_rows = []
+            self.connections_summary_var.set(f"Not available: {error}")
+            return
+        self.connections_rows = rows
+        self.connections_elapsed = elapsed
+        self.show_connections()
+
+    def show_connections(self):
+        """Redraws the table from the last inventory using the selected filter."""
+        states = CONNECTION_FILTERS[self.connections_filter_var.get()]
+        tree = self.connections_tree
+        tree.delete(*tree.get_children())
+        resolve = self.connections_resolve_var.get()
+        shown = 0
+        for proto, local_ip, local_port, remote_ip, remote_port, state, _inode, pid, process in self.connections_rows:
+            if states and state not in states:
+                continue
+            local = f"[{local_ip}]:{local_port}" if ":" in local_ip else f"{local_ip}:{local_port}"
+            remote = f"[{remote_ip}]:{remote_port}" if ":" in remote_ip else f"{remote_ip}:{remote_port}"
+            item = tree.insert("", "end", values=(proto, local, remote, "", state, pid if pid is not None else "-", 
+                                                  process or "-"))
+            if resolve and remote_port:
+                self.fill_hostname_cell(tree, item, "remote_host", remote_ip)
+            shown += 1
+        if self.connections_rows:
+            self.connections_summary_var.set(
+                f"{shown} of {len(self.connections_rows)} sockets shown; read in {self.connections_elapsed * 1000:.1f} ms "
+                f"({self.socket_owner_index.last_scanned} processes scanned).")
+
+    # --- Neighbor Table Methods ---
+
+    def setup_neighbors_section(self, parent_frame):
+        # Frame for the ARP/NDP neighbor table
+        neigh_frame = tk.LabelFrame(parent_frame, text="Neighbors (ARP / NDP Cache)", 
+                                    font=self.font_large, bg=self.card_color, fg=self.text_color,
+                                    padx=15, pady=15, bd=1, relief=tk.RIDGE)
+        neigh_frame.pack(pady=15, fill="both", expand=True, padx=10)
+
+        # Row 0: Summary and Refresh
+        self.neighbors_summary_var = tk.StringVar(value="Press Refresh to read the neighbor table.")
+        tk.Label(neigh_frame, textvariable=self.neighbors_summary_var, font=self.font_normal_small, 
+                 bg=self.card_color, fg=self.text_color, anchor="w").grid(row=0, column=0, sticky="ew", padx=5, pady=5)
+        tk.Button(neigh_frame, text="Refresh", command=self.update_neighbors,
+                  font=self.font_normal_small, bg=self.primary_color, fg="white", bd=0, 
+                  padx=5, pady=1, relief=tk.GROOVE, 
+                  activebackground="#0056b3", activeforeground="white").grid(row=0, column=1, sticky="e", padx=5)
+
+        # Row 1: Table
+        columns = (("ip", "IP Address", 200), ("hostname", "Hostname", 180), ("mac", "MAC Address", 140), 
+                   ("vendor", "Vendor", 200), ("ifname", "Interface", 80), ("state", "State", 90))
+        self.neighbors_tree = ttk.Treeview(neigh_frame, columns=[c[0] for c in columns], show="headings", height=14)
+        for column, heading, width in columns:
+            self.neighbors_tree.heading(column, text=heading)
+            self.neighbors_tree.column(column, width=width, anchor="w")
+        self.neighbors_tree.grid(row=1, column=0, columnspan=2, sticky="nsew", padx=5, pady=5)
+
+        neigh_frame.grid_columnconfigure(0, weight=1)
+        neigh_frame.grid_rowconfigure(1, weight=1)
+
+    def update_neighbors(self):
+        """Reads the neighbor table and resolves vendors on a worker thread."""
+        self.neighbors_summary_var.set("Reading neighbor table...")
+
+        def worker():
+            neighbors, error = get_neighbors()
+            oui = get_oui_database(self.script_dir)
+            rows = [(ip, "", mac or "-", oui.lookup(mac) or "-", ifname, state) for ip, mac, ifname, state in neighbors]
+            self.run_on_ui_thread(self._finish_neighbors_refresh, rows, error)
+
+        threading.Thread(target=worker, name="NeighborTable", daemon=True).start()
+
+    def _finish_neighbors_refresh(self, rows, error):
+        self.neighbors_tree.delete(*self.neighbors_tree.get_children())
+        if error:
+            self.neighbors_summary_var.set(f"Not available: {error}")
+            return
+        for row in rows:
+            item = self.neighbors_tree.insert("", "end", values=row)
+            if not row[0].startswith(("ff", "0.0.0.0")): # Multicast and placeholder entries have no name
+                self.fill_hostname_cell(self.neighbors_tree, item, "hostname", row[0])
+        oui = get_oui_database(self.script_dir)
+        if oui.partial:
+            self.neighbors_summary_var.set(
+                f"{len(rows)} neighbors. Vendor list is a partial seed ({len(oui)} prefixes), so most show '-'. "
+                f"Save the IEEE {OUI_REGISTRY_FILE} in '{NETWORK_DATA_FOLDER_NAME}' for full coverage.")
+        else:
+            self.neighbors_summary_var.set(f"{len(rows)} neighbors ({len(oui)} vendor prefixes loaded).")
+
+    # --- Routing Table Methods ---
+
+    def setup_routes_section(self, parent_frame):
+        # Frame for the routing table
+        route_frame = tk.LabelFrame(parent_frame, text="Routing Table", 
+                                    font=self.font_large, bg=self.card_color, fg=self.text_color,
+                                    padx=15, pady=15, bd=1, relief=tk.RIDGE)
+        route_frame.pack(pady=15, fill="both", expand=True, padx=10)
+
+        # Row 0: Route lookup
+        tk.Label(route_frame, text="Which route for IP?", font=self._get_font(10, 'bold'), 
+                 bg=self.card_color, fg=self.text_color).grid(row=0, column=0, sticky="w", padx=5, pady=5)
+        self.route_query_var = tk.StringVar()
+        route_entry = tk.Entry(route_frame, textvariable=self.route_query_var, font=self.font_normal, 
+                               bg="#EFEFEF", fg=self.text_color, bd=1, relief=tk.FLAT)
+        route_entry.grid(row=0, column=1, sticky="ew", padx=5, pady=5)
+        route_entry.bind("<Return>", lambda event: self.find_route())
+        tk.Button(route_frame, text="Find Route", command=self.find_route,
+                  font=self.font_normal, bg=self.primary_color, fg="white", bd=0, padx=10, pady=5, 
+                  relief=tk.GROOVE, activebackground="#0056b3", activeforeground="white").grid(row=0, column=2, sticky="ew", padx=5)
+        tk.Button(route_frame, text="Refresh", command=self.update_routes,
+                  font=self.font_normal_small, bg=self.primary_color, fg="white", bd=0, 
+                  padx=5, pady=1, relief=tk.GROOVE, 
+                  activebackground="#0056b3", activeforeground="white").grid(row=0, column=3, sticky="ew", padx=5)
+
+        # Row 1: Lookup result
+        self.route_result_var = tk.StringVar(value="Press Refresh to read the routing table.")
+        tk.Label(route_frame, textvariable=self.route_result_var, font=self.font_normal_small, 
+                 bg=self.card_color, fg=self.text_color, anchor="w").grid(row=1, column=0, columnspan=4, sticky="ew", padx=5)
+
+        # Row 2: Table
+        columns = (("destination", "Destination", 260), ("gateway", "Gateway", 200), 
+                   ("ifname", "Interface", 90), ("metric", "Metric", 70))
+        self.routes_tree = ttk.Treeview(route_frame, columns=[c[0] for c in columns], show="headings", height=14)
+        for column, heading, width in columns:
+            self.routes_tree.heading(column, text=heading)
+            self.routes_tree.column(column, width=width, anchor="w")
+        self.routes_tree.grid(row=2, column=0, columnspan=4, sticky="nsew", padx=5, pady=5)
+
+        route_frame.grid_columnconfigure(1, weight=1)
+        route_frame.grid_rowconfigure(2, weight=1)
+
+    def update_routes(self):
+        """Reads the routing tables and builds the lookup trie on a worker thread."""
+        if platform.system() != "Linux":
+            self.route_result_var.set("Not available: OS Not Supported")
+            return
+        self.route_result_var.set("Reading routing table...")
+
+        def worker():
+            routes = read_linux_routes()
+            self.run_on_ui_thread(self._finish_routes_refresh, routes, RoutePrefixTrie(routes))
+
+        threading.Thread(target=worker, name="RouteTable", daemon=True).start()
+
+    def _finish_routes_refresh(self, routes, trie):
+        self.route_trie = trie
+        self.route_items = {}
+        self.routes_tree.delete(*self.routes_tree.get_children())
+        for route in routes:
+            item = self.routes_tree.insert("", "end", values=(format_route_destination(route), route[3] or "on-link", 
+                                                              route[4], route[5]))
+            self.route_items[route] = item
+        self.route_result_var.set(f"{len(routes)} routes loaded.")
+
+    def find_route(self):
+        """Longest-prefix match for the entered address; highlights the chosen route."""
+        if self.route_trie is None:
+            self.update_routes()
+            return
+        try:
+            route = self.route_trie.lookup(self.route_query_var.get())
+        except ValueError as e:
+            self.route_result_var.set(f"Invalid address: {e}")
+            return
+        if route is None:
+            self.route_result_var.set(f"No route to {self.route_query_var.get().strip()}.")
+            self.routes_tree.selection_set(())
+            return
+        via = f"via {route[3]}" if route[3] else "directly (on-link)"
+        self.route_result_var.set(f"{self.route_query_var.get().strip()} goes out {route[4]} {via} "
+                                  f"(matched {format_route_destination(route)}, metric {route[5]}).")
+        item = self.route_items.get(route)
+        if item:
+            self.routes_tree.selection_set(item)
+            self.routes_tree.see(item)
+
+    # --- Network History Methods ---
+
+    def setup_history_section(self, parent_frame):
+        # Frame for the snapshot history
+        history_frame = tk.LabelFrame(parent_frame, text="Network State History", 
+                                      font=self.font_large, bg=self.card_color, fg=self.text_color,
+                                      padx=15, pady=15, bd=1, relief=tk.RIDGE)
+        history_frame.pack(pady=15, fill="both", expand=True, padx=10)
+
+        # Row 0: Summary and Refresh
+        self.history_summary_var = tk.StringVar(value="Press Refresh to load recorded snapshots.")
+        tk.Label(history_frame, textvariable=self.history_summary_var, font=self.font_normal_small, 
+                 bg=self.card_color, fg=self.text_color, anchor="w").grid(row=0, column=0, sticky="ew", padx=5, pady=5)
+        tk.Button(history_frame, text="Refresh", command=self.show_network_history,
+                  font=self.font_normal_small, bg=self.primary_color, fg="white", bd=0, 
+                  padx=5, pady=1, relief=tk.GROOVE, 
+                  activebackground="#0056b3", activeforeground="white").grid(row=0, column=1, sticky="e", padx=5)
+
+        # Row 1: Snapshot list (newest first)
+        self.history_tree = ttk.Treeview(history_frame, columns=("time", "adapters", "changes"), show="headings", height=8)
+        self.history_tree.heading("time", text="Recorded")
+        self.history_tree.heading("adapters", text="Adapters")
+        self.history_tree.heading("changes", text="Changes")
+        self.history_tree.column("time", width=150)
+        self.history_tree.column("adapters", width=70, anchor="e")
+        self.history_tree.column("changes", width=420)
+        self.history_tree.grid(row=1, column=0, columnspan=2, sticky="nsew", padx=5, pady=5)
+        self.history_tree.bind("<<TreeviewSelect>>", lambda event: self.show_history_diff())
+
+        # Row 2: Diff of the selected snapshot against the one before it
+        self.history_diff_text = tk.Text(history_frame, height=8, font=self.font_normal_small, 
+                                         bg="#EFEFEF", fg=self.text_color, bd=1, relief=tk.FLAT, wrap="word")
+        self.history_diff_text.grid(row=2, column=0, columnspan=2, sticky="nsew", padx=5, pady=5)
+
+        history_frame.grid_columnconfigure(0, weight=1)
+        history_frame.grid_rowconfigure(1, weight=1)
+
+    def record_network_history(self, adapter_data):
+        """Appends the snapshot to the history log (a no-op when nothing changed)."""
+        if not self.network_history:
+            return
+        try:
+            self.network_history.append(adapter_data)
+        except OSError as e:
+            self.network_history = None
+            self.status_var.set(f"Network history disabled: {e}")
+            return
+
+        # A lone change must still reach the disk within flush_interval, not wait for the next one
+        due_in = self.network_history.flush_due_in()
+        if due_in is not None and self.history_flush_job is None:
+            self.history_flush_job = self.master.after(int(due_in * 1000) + 1, self.flush_network_history)
+
+    def flush_network_history(self):
+        """Timer callback: writes the pending history batch."""
+        self.history_flush_job = None
+        if not self.network_history:
+            return
+        try:
+            self.network_history.flush()
+        except OSError as e:
+            self.network_history = None
+            self.status_var.set(f"Network history disabled: {e}")
+
+    def show_network_history(self):
+        """Lists recorded snapshots with a one-line summary of what changed in each."""
+        self.history_tree.delete(*self.history_tree.get_children())
+        self.history_snapshots = {}
+        if not self.network_history:
+            self.history_summary_var.set("Network history is not available.")
+            return
+
+        previous = {}
+        rows = []
+        for seq, timestamp, adapters in self.network_history.snapshots():
+            diff = diff_adapters(previous, adapters)
+            if diff is None:
+                summary = "No changes"
+            else:
+                summary = "; ".join([f"+{name}" for name in diff["added"]] + [f"-{name}" for name in diff["removed"]] +
+                                    [f"{name} ({', '.join(fields)})" for name, fields in diff["changed"].items()])
+            self.history_snapshots[str(seq)] = (previous, adapters)
+            rows.append((str(seq), time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp)), len(adapters), summary))
+            previous = adapters
+
+        for seq, recorded, count, summary in reversed(rows):
+            self.history_tree.insert("", "end", iid=seq, values=(recorded, count, summary))
+        summary = f"{len(rows)} snapshots recorded (newest first)."
+        if self.network_history.dropped:
+            summary += (f" {self.network_history.dropped} snapshot(s) this session were too large for a "
+                        f"{self.network_history.record_size}-byte slot and were not recorded.")
+        self.history_summary_var.set(summary)
+
+    def show_history_diff(self):
+        """Shows the full diff between the selected snapshot and the one before it."""
+        selection = self.history_tree.selection()
+        if not selection or selection[0] not in self.history_snapshots:
+            return
+        previous, adapters = self.history_snapshots[selection[0]]
+        self.history_diff_text.delete("1.0", tk.END)
+        self.history_diff_text.insert(tk.END, "\n".join(describe_snapshot_diff(previous, adapters)))
+
+    # --- Throughput Test Methods ---
+
+    def setup_throughput_test_section(self, parent_frame):
+        # Frame for the server/client throughput tester
+        test_frame = tk.LabelFrame(parent_frame, text="Throughput Test (sendfile / recv_into)", 
+                                   font=self.font_large, bg=self.card_color, fg=self.text_color,
+                                   padx=15, pady=15, bd=1, relief=tk.RIDGE)
+        test_frame.pack(pady=15, fill="both", expand=True, padx=10)
+
+        # Row 0: Server mode
+        tk.Label(test_frame, text="Server Port:", font=self._get_font(10, 'bold'), 
+                 bg=self.card_color, fg=self.text_color).grid(row=0, column=0, sticky="w", padx=5, pady=5)
+        self.test_server_port_var = tk.StringVar(value=str(THROUGHPUT_TEST_PORT))
+        tk.Entry(test_frame, textvariable=self.test_server_port_var, font=self.font_normal, width=8, 
+                 bg="#EFEFEF", fg=self.text_color, bd=1, relief=tk.FLAT).grid(row=0, column=1, sticky="w", padx=5, pady=5)
+        self.test_server_button = tk.Button(test_frame, text="Start Server", command=self.toggle_throughput_server,
+                                            font=self.font_normal_small, bg="#C0C0C0", fg=self.text_color, bd=0, 
+                                            padx=5, pady=1, relief=tk.GROOVE)
+        self.test_server_button.grid(row=0, column=2, sticky="ew", padx=5)
+
+        # Row 1: Client mode
+        tk.Label(test_frame, text="Target (host:port):", font=self._get_font(10, 'bold'), 
+                 bg=self.card_color, fg=self.text_color).grid(row=1, column=0, sticky="w", padx=5, pady=5)
+        self.test_target_var = tk.StringVar(value=f"127.0.0.1:{THROUGHPUT_TEST_PORT}")
+        tk.Entry(test_frame, textvariable=self.test_target_var, font=self.font_normal, 
+                 bg="#EFEFEF", fg=self.text_color, bd=1, relief=tk.FLAT).grid(row=1, column=1, sticky="ew", padx=5, pady=5)
+        self.test_run_button = tk.Button(test_frame, text="Run Test", command=self.run_throughput_test_ui,
+                                         font=self.font_normal, bg=self.primary_color, fg="white", bd=0, 
+                                         padx=10, pady=5, relief=tk.GROOVE, 
+                                         activebackground="#0056b3", activeforeground="white")
+        self.test_run_button.grid(row=1, column=2, sticky="ew", padx=5)
+
+        # Row 2: Amount to send
+        tk.Label(test_frame, text="Data (MiB):", font=self._get_font(10, 'bold'), 
+                 bg=self.card_color, fg=self.text_color).grid(row=2, column=0, sticky="w", padx=5, pady=5)
+        self.test_size_var = tk.StringVar(value="256")
+        tk.Entry(test_frame, textvariable=self.test_size_var, font=self.font_normal, width=8, 
+                 bg="#EFEFEF", fg=self.text_color, bd=1, relief=tk.FLAT).grid(row=2, column=1, sticky="w", padx=5, pady=5)
+
+        # Row 3: Results
+        self.test_result_text = tk.Text(test_frame, height=16, font=("Consolas", 9), 
+                                        bg="#EFEFEF", fg=self.text_color, bd=1, relief=tk.FLAT)
+        self.test_result_text.grid(row=3, column=0, columnspan=3, sticky="nsew", padx=5, pady=5)
+
+        test_frame.grid_columnconfigure(1, weight=1)
+        test_frame.grid_rowconfigure(3, weight=1)
+
+    def toggle_throughput_server(self):
+        """Starts or stops the local test server other machines can run the client against."""
+        if self.throughput_server:
+            self.throughput_server.stop()
+            self.throughput_server = None
+            self.test_server_button.config(text="Start Server")
+            self.status_var.set("Throughput test server stopped.")
+            return
+        try:
+            self.throughput_server = ThroughputTestServer(port=int(self.test_server_port_var.get()))
+        except (ValueError, OSError) as e:
+            messagebox.showerror("Server Error", f"Could not start the test server: {e}")
+            return
+        self.throughput_server.start()
+        self.test_server_button.config(text="Stop Server")
+        self.status_var.set(f"Throughput test server listening on port {self.throughput_server.address[1]}.")
+
+    def run_throughput_test_ui(self):
+        """Runs the client against the target on a worker thread."""
+        try:
+            host, port = parse_host_port(self.test_target_var.get(), THROUGHPUT_TEST_PORT)
+            total_bytes = int(float(self.test_size_var.get()) * (1 << 20))
+            if total_bytes <= 0:
+                raise ValueError("Data size must be positive.")
+        except ValueError as e:
+            messagebox.showerror("Input Error", str(e))
+            return
+
+        self.test_run_button.config(state=tk.DISABLED)
+        self.test_result_text.delete("1.0", tk.END)
+        self.test_result_text.insert(tk.END, f"Testing against {host}:{port}...")
+
+        def worker():
+            try:
+                text = format_throughput_result(run_throughput_test(host, port, total_bytes))
+            except OSError as e:
+                text = f"Test failed: {e}"
+            self.run_on_ui_thread(self._finish_throughput_test, text)
+
+        threading.Thread(target=worker, name="ThroughputTestClient", daemon=True).start()
+
+    def _finish_throughput_test(self, text):
+        self.test_run_button.config(state=tk.NORMAL)
+        self.test_result_text.delete("1.0", tk.END)
+        self.test_result_text.insert(tk.END, text)
+        self.status_var.set(text.splitlines()[0])
+
+    # --- Latency Monitor Methods ---
+
+    LATENCY_COLORS = ("#007bff", "#28a745", "#dc3545", "#fd7e14", "#6f42c1", "#17a2b8", "#e83e8c", "#343a40")
+
+    def setup_latency_section(self, parent_frame):
+        # Frame for the TCP connect latency monitor
+        latency_frame = tk.LabelFrame(parent_frame, text="Latency Monitor (TCP Connect RTT)", 
+                                      font=self.font_large, bg=self.card_color, fg=self.text_color,
+                                      padx=15, pady=15, bd=1, relief=tk.RIDGE)
+        latency_frame.pack(pady=15, fill="both", expand=True, padx=10)
+
+        # Row 0: Targets
+        tk.Label(latency_frame, text="Targets (host:port, ...):", font=self._get_font(10, 'bold'), 
+                 bg=self.card_color, fg=self.text_color).grid(row=0, column=0, sticky="w", padx=5, pady=5)
+        self.latency_targets_var = tk.StringVar(value=LATENCY_DEFAULT_TARGETS)
+        tk.Entry(latency_frame, textvariable=self.latency_targets_var, font=self.font_normal, 
+                 bg="#EFEFEF", fg=self.text_color, bd=1, relief=tk.FLAT).grid(row=0, column=1, sticky="ew", padx=5, pady=5)
+        self.latency_button = tk.Button(latency_frame, text="Start Monitor", command=self.toggle_latency_monitor,
+                                        font=self.font_normal, bg=self.primary_color, fg="white", bd=0, 
+                                        padx=10, pady=5, relief=tk.GROOVE, 
+                                        activebackground="#0056b3", activeforeground="white")
+        self.latency_button.grid(row=0, column=2, sticky="ew", padx=5)
+
+        # Row 1: Interval
+        tk.Label(latency_frame, text="Interval (s):", font=self._get_font(10, 'bold'), 
+                 bg=self.card_color, fg=self.text_color).grid(row=1, column=0, sticky="w", padx=5, pady=5)
+        self.latency_interval_var = tk.StringVar(value="1")
+        tk.Entry(latency_frame, textvariable=self.latency_interval_var, font=self.font_normal, width=6, 
+                 bg="#EFEFEF", fg=self.text_color, bd=1, relief=tk.FLAT).grid(row=1, column=1, sticky="w", padx=5, pady=5)
+
+        # Row 2: Per-target statistics
+        columns = (("target", "Target", 200), ("last", "Last (ms)", 80), ("p50", "p50", 70), ("p95", "p95", 70), 
+                   ("p99", "p99", 70), ("loss", "Loss", 60), ("samples", "Samples", 70))
+        self.latency_tree = ttk.Treeview(latency_frame, columns=[c[0] for c in columns], show="headings", height=5)
+        for column, heading, width in columns:
+            self.latency_tree.heading(column, text=heading)
+            self.latency_tree.column(column, width=width, anchor="w" if column == "target" else "e")
+        self.latency_tree.grid(row=2, column=0, columnspan=3, sticky="nsew", padx=5, pady=5)
+
+        # Row 3: Live graph, one polyline per target
+        self.latency_canvas = tk.Canvas(latency_frame, height=160, bg=self.background_color, highlightthickness=0)
+        self.latency_canvas.grid(row=3, column=0, columnspan=3, sticky="nsew", padx=5, pady=5)
+        self.latency_scale_text = self.latency_canvas.create_text(4, 4, anchor="nw", text="", 
+                                                                  font=self.font_normal_small, fill=self.text_color)
+
+        latency_frame.grid_columnconfigure(1, weight=1)
+        latency_frame.grid_rowconfigure(3, weight=1)
+
+    def toggle_latency_monitor(self):
+        """Starts probing the configured targets, or stops the running monitor."""
+        if self.latency_monitor:
+            self.latency_monitor.stop()
+            self.latency_monitor = None
+            self.latency_button.config(text="Start Monitor")
+            self.status_var.set("Latency monitor stopped.")
+            return
+
+        try:
+            targets = [parse_host_port(text, 443) for text in self.latency_targets_var.get().split(",") if text.strip()]
+            interval = float(self.latency_interval_var.get())
+            if not targets:
+                raise ValueError("Enter at least one host:port target.")
+            if interval < 0.1:
+                raise ValueError("The interval must be at least 0.1 seconds.")
+        except ValueError as e:
+            messagebox.showerror("Input Error", str(e))
+            return
+
+        self.latency_series = {target: LatencySeries() for target in targets}
+        self.latency_tree.delete(*self.latency_tree.get_children())
+        for line in self.latency_lines.values():
+            self.latency_canvas.delete(line)
+        self.latency_lines = {}
+        for n, target in enumerate(targets):
+            self.latency_tree.insert("", "end", iid=f"{target[0]}:{target[1]}", 
+                                     values=(f"{target[0]}:{target[1]}", "-", "-", "-", "-", "-", 0))
+            self.latency_lines[target] = self.latency_canvas.create_line(
+                0, 0, 0, 0, fill=self.LATENCY_COLORS[n % len(self.LATENCY_COLORS)], width=2)
+
+        monitor = self.latency_monitor = LatencyMonitor(
+            targets, lambda target, rtt: self.run_on_ui_thread(self._add_latency_sample, monitor, target, rtt), 
+            interval=interval)
+        monitor.start()
+        self.latency_button.config(text="Stop Monitor")
+        self.status_var.set(f"Latency monitor probing {len(targets)} targets every {interval:g}s.")
+
+    def _add_latency_sample(self, monitor, target, rtt):
+        """Records one probe on the Tk thread; the graph is redrawn once per batch of samples."""
+        if monitor is not self.latency_monitor:
+            return # Late result from a stopped monitor
+        series = self.latency_series[target]
+        series.add(rtt)
+        histogram = series.histogram
+        percentiles = [f"{histogram.percentile(p) / 1e6:.2f}" if histogram.total else "-" for p in (50, 95, 99)]
+        self.latency_tree.item(f"{target[0]}:{target[1]}", values=(
+            f"{target[0]}:{target[1]}", f"{rtt * 1000:.2f}" if rtt is not None else "timeout", *percentiles, 
+            f"{100 * series.lost / series.sent:.0f}%", series.sent))
+        if not self.latency_redraw_pending:
+            self.latency_redraw_pending = True
+            self.master.after_idle(self._draw_latency_graph)
+
+    def _draw_latency_graph(self):
+        """Moves every target's polyline to its recent history on a shared, auto-scaled axis."""
+        self.latency_redraw_pending = False
+        width = self.latency_canvas.winfo_width() or 600
+        height = self.latency_canvas.winfo_height() or 160
+        histories = {target: series.ordered() for target, series in self.latency_series.items()}
+        peak = max([value for values in histories.values() for value in values if value == value] or [1.0])
+        peak = max(peak * 1.1, 0.1)
+        step = width / (LATENCY_HISTORY_SAMPLES - 1)
+        scale = (height - 20) / peak
+
+        for target, values in histories.items():
+            if len(values) < 2:
+                continue
+            coords = []
+            offset = LATENCY_HISTORY_SAMPLES - len(values) # Newest sample is always at the right edge
+            for n, value in enumerate(values):
+                # A lost probe is drawn as a spike to the top edge
+                y = 16 if value != value else height - 2 - value * scale
+                coords += (float((offset + n) * step), y)
+            self.latency_canvas.coords(self.latency_lines[target], coords)
+        self.latency_canvas.itemconfig(self.latency_scale_text, text=f"{peak:.2f} ms")
+
+    # --- Subnet Calculator Methods ---
+
+    def setup_subnet_section(self, parent_frame):
+        # Frame for the bulk subnet calculator
+        subnet_frame = tk.LabelFrame(parent_frame, text="Bulk Subnet Calculator (paste CIDRs or firewall config)", 
+                                     font=self.font_large, bg=self.card_color, fg=self.text_color,
+                                     padx=15, pady=15, bd=1, relief=tk.RIDGE)
+        subnet_frame.pack(pady=15, fill="both", expand=True, padx=10)
+
+        # Row 0: Input and Calculate
+        self.subnet_input_text = tk.Text(subnet_frame, height=6, font=self.font_normal_small, 
+                                         bg="#EFEFEF", fg=self.text_color, bd=1, relief=tk.FLAT)
+        self.subnet_input_text.grid(row=0, column=0, sticky="nsew", padx=5, pady=5)
+        self.subnet_button = tk.Button(subnet_frame, text="Calculate", command=self.calculate_subnets,
+                                       font=self.font_normal, bg=self.primary_color, fg="white", bd=0, 
+                                       padx=10, pady=5, relief=tk.GROOVE, 
+                                       activebackground="#0056b3", activeforeground="white")
+        self.subnet_button.grid(row=0, column=1, sticky="new", padx=5, pady=5)
+
+        # Row 1: Summary
+        self.subnet_summary_var = tk.StringVar(value="Paste one or more CIDRs and press Calculate.")
+        tk.Label(subnet_frame, textvariable=self.subnet_summary_var, font=self.font_normal_small, 
+                 bg=self.card_color, fg=self.text_color, anchor="w", justify=tk.LEFT, 
+                 wraplength=700).grid(row=1, column=0, columnspan=2, sticky="ew", padx=5)
+
+        # Row 2: Results table
+        columns = (("cidr", "Input", 130), ("network", "Network", 130), ("broadcast", "Broadcast", 110), 
+                   ("first", "First Host", 110), ("last", "Last Host", 110), ("hosts", "Hosts", 80), 
+                   ("note", "Overlap", 160))
+        self.subnet_tree = ttk.Treeview(subnet_frame, columns=[c[0] for c in columns], show="headings", height=10)
+        for column, heading, width in columns:
+            self.subnet_tree.heading(column, text=heading)
+            self.subnet_tree.column(column, width=width, anchor="e" if column == "hosts" else "w")
+        scrollbar = ttk.Scrollbar(subnet_frame, orient="vertical", command=self.subnet_tree.yview)
+        self.subnet_tree.configure(yscrollcommand=scrollbar.set)
+        self.subnet_tree.grid(row=2, column=0, columnspan=2, sticky="nsew", padx=(5, 0), pady=5)
+        scrollbar.grid(row=2, column=2, sticky="ns", pady=5)
+
+        subnet_frame.grid_columnconfigure(0, weight=1)
+        subnet_frame.grid_rowconfigure(2, weight=1)
+
+    def calculate_subnets(self):
+        """Parses the pasted list and streams the per-block results into the table from a worker thread."""
+        text = self.subnet_input_text.get("1.0", tk.END)
+        self.subnet_generation += 1
+        generation = self.subnet_generation
+        self.subnet_tree.delete(*self.subnet_tree.get_children())
+        self.subnet_summary_var.set("Calculating...")
+
+        def worker():
+            entries, errors = parse_cidr_list(text)
+            for rows in iter_subnet_rows(entries):
+                self.run_on_ui_thread(self._add_subnet_rows, generation, rows)
+            collapsed = collapse_cidrs([network for _token, network in entries])
+            self.run_on_ui_thread(self._finish_subnet_calculation, generation, len(entries), errors, collapsed)
+
+        threading.Thread(target=worker, name="SubnetCalculator", daemon=True).start()
+
+    def _add_subnet_rows(self, generation, rows):
+        if generation != self.subnet_generation:
+            return # A newer calculation replaced this one
+        for row in rows:
+            self.subnet_tree.insert("", "end", values=row)
+
+    def _finish_subnet_calculation(self, generation, count, errors, collapsed):
+        if generation != self.subnet_generation:
+            return
+        summary = f"{count} blocks; collapse to {len(collapsed)}: {', '.join(map(str, collapsed[:20]))}"
+        if len(collapsed) > 20:
+            summary += f", ... ({len(collapsed) - 20} more)"
+        if errors:
+            summary += f"\n{len(errors)} invalid: " + "; ".join(f"line {line_no} '{token}'" for line_no, token, _e in errors[:5])
+        self.subnet_summary_var.set(summary)
+        self.status_var.set(f"Subnet calculation finished: {count} blocks, {len(errors)} invalid.")
+
+    # --- Fleet Collector Methods ---
+
+    def setup_fleet_section(self, parent_frame):
+        # Frame for querying remote agents (started with --headless --agent-port)
+        fleet_frame = tk.LabelFrame(parent_frame, text="Fleet Collector (Remote Agents)", 
+                                    font=self.font_large, bg=self.card_color, fg=self.text_color,
+                                    padx=15, pady=15, bd=1, relief=tk.RIDGE)
+        fleet_frame.pack(pady=15, fill="both", expand=True, padx=10)
+
+        # Row 0: Agents and Collect
+        tk.Label(fleet_frame, text="Agents (host[:port]):", font=self._get_font(10, 'bold'), 
+                 bg=self.card_color, fg=self.text_color).grid(row=0, column=0, sticky="w", padx=5, pady=5)
+        self.fleet_targets_var = tk.StringVar(value=f"127.0.0.1:{FLEET_AGENT_PORT}")
+        tk.Entry(fleet_frame, textvariable=self.fleet_targets_var, font=self.font_normal, 
+                 bg="#EFEFEF", fg=self.text_color, bd=1, relief=tk.FLAT).grid(row=0, column=1, sticky="ew", padx=5, pady=5)
+        self.fleet_button = tk.Button(fleet_frame, text="Collect", command=self.toggle_fleet_collect,
+                                      font=self.font_normal, bg=self.primary_color, fg="white", bd=0, 
+                                      padx=10, pady=5, relief=tk.GROOVE, 
+                                      activebackground="#0056b3", activeforeground="white")
+        self.fleet_button.grid(row=0, column=2, sticky="ew", padx=5)
+
+        # Row 1: Shared token (only needed for agents started with one)
+        tk.Label(fleet_frame, text="Token:", font=self._get_font(10, 'bold'), 
+                 bg=self.card_color, fg=self.text_color).grid(row=1, column=0, sticky="w", padx=5, pady=5)
+        self.fleet_token_var = tk.StringVar(value=os.environ.get(FLEET_TOKEN_ENV, ""))
+        tk.Entry(fleet_frame, textvariable=self.fleet_token_var, show="*", font=self.font_normal, 
+                 bg="#EFEFEF", fg=self.text_color, bd=1, relief=tk.FLAT).grid(row=1, column=1, sticky="ew", padx=5, pady=5)
+
+        # Row 2: Progress
+        self.fleet_progress_var = tk.StringVar(value="Start agents with --headless --agent-port, then press Collect.")
+        tk.Label(fleet_frame, textvariable=self.fleet_progress_var, font=self.font_normal_small, 
+                 bg=self.card_color, fg=self.text_color, anchor="w").grid(row=2, column=0, columnspan=3, sticky="ew", padx=5)
+
+        # Row 3: Aggregated table (click a heading to sort)
+        columns = (("agent", "Agent", 130), ("hostname", "Hostname", 130), ("adapter", "Adapter", 110), 
+                   ("state", "State", 60), ("ipv4", "IPv4", 150), ("mac", "MAC", 130), ("gateway", "Gateway", 110), 
+                   ("speed", "Speed", 80), ("rtt", "RTT (ms)", 70))
+        self.fleet_headings = {column: heading for column, heading, _width in columns}
+        self.fleet_tree = ttk.Treeview(fleet_frame, columns=[c[0] for c in columns], show="headings", height=14)
+        for column, heading, width in columns:
+            self.fleet_tree.heading(column, text=heading, command=lambda c=column: self.sort_fleet_table(c))
+            self.fleet_tree.column(column, width=width, anchor="e" if column == "rtt" else "w")
+        scrollbar = ttk.Scrollbar(fleet_frame, orient="vertical", command=self.fleet_tree.yview)
+        self.fleet_tree.configure(yscrollcommand=scrollbar.set)
+        self.fleet_tree.grid(row=3, column=0, columnspan=3, sticky="nsew", padx=(5, 0), pady=5)
+        scrollbar.grid(row=3, column=3, sticky="ns", pady=5)
+
+        fleet_frame.grid_columnconfigure(1, weight=1)
+        fleet_frame.grid_rowconfigure(3, weight=1)
+
+    def toggle_fleet_collect(self):
+        """Queries every listed agent on a worker thread, or cancels the collection in progress."""
+        if self.fleet_collector:
+            self.fleet_collector.cancel()
+            self.fleet_progress_var.set("Cancelling...")
+            return
+
+        try:
+            targets = parse_fleet_targets(self.fleet_targets_var.get())
+            if not targets:
+                raise ValueError("Enter at least one agent address.")
+        except ValueError as e:
+            messagebox.showerror("Input Error", str(e))
+            return
+
+        self.fleet_rows = []
+        self.fleet_tree.delete(*self.fleet_tree.get_children())
+        self.fleet_started_at = time.perf_counter()
+        self.fleet_answered = 0
+        self.fleet_progress_var.set(f"Querying {len(targets)} agents...")
+        self.fleet_button.config(text="Stop")
+
+        collector = self.fleet_collector = FleetCollector(token=self.fleet_token_var.get().strip() or None)
+
+        def worker():
+            answered = collector.collect(targets, lambda target, reply, error, rtt: 
+                                         self.run_on_ui_thread(self._add_fleet_result, collector, target, reply, error, rtt))
+            self.run_on_ui_thread(self._finish_fleet_collect, collector, answered, len(targets))
+
+        threading.Thread(target=worker, name="FleetCollect", daemon=True).start()
+
+    def _add_fleet_result(self, collector, target, reply, error, rtt):
+        """Adds one agent's adapters (or its error) to the table, keeping the current sort."""
+        if collector is not self.fleet_collector:
+            return
+        rows = fleet_result_rows(target, reply, error, rtt)
+        if reply and reply.get("adapters"):
+            self.fleet_answered += 1
+        self.fleet_rows.extend(rows)
+        column, descending = self.fleet_sort
+        if column:
+            self.sort_fleet_table(column, descending)
+        else:
+            for row in rows:
+                self.fleet_tree.insert("", "end", values=row)
+
+    def _finish_fleet_collect(self, collector, answered, target_count):
+        if collector is not self.fleet_collector:
+            return
+        self.fleet_collector = None
+        self.fleet_button.config(text="Collect")
+        elapsed = time.perf_counter() - self.fleet_started_at
+        if answered is None:
+            self.fleet_progress_var.set(f"Collection cancelled after {elapsed:.1f}s.")
+        else:
+            self.fleet_progress_var.set(f"{answered} of {target_count} agents answered in {elapsed:.2f}s "
+                                        f"({len(self.fleet_rows)} rows).")
+        self.status_var.set(self.fleet_progress_var.get())
+
+    @staticmethod
+    def _fleet_sort_key(value):
+        """Numbers sort numerically, addresses by value, everything else case-insensitively."""
+        text = str(value).split(",")[0].strip()
+        try:
+            return (0, float(text.split()[0]), "")
+        except (ValueError, IndexError):
+            pass
+        try:
+            address = ipaddress.ip_address(text.rsplit(":", 1)[0].strip("[]") if text.count(":") == 1 or "]:" in text 
+                                           else text.split("/")[0])
+            return (1, address.version * (1 << 128) + int(address), text)
+        except ValueError:
+            return (2, 0, text.lower())
+
+    def sort_fleet_table(self, column, descending=None):
+        """Sorts the aggregated rows by a column; clicking the same heading again reverses the order."""
+        if descending is None:
+            last_column, last_descending = self.fleet_sort
+            descending = not last_descending if column == last_column else False
+        self.fleet_sort = (column, descending)
+        index = self.fleet_tree["columns"].index(column)
+        self.fleet_rows.sort(key=lambda row: self._fleet_sort_key(row[index]), reverse=descending)
+        self.fleet_tree.delete(*self.fleet_tree.get_children())
+        for row in self.fleet_rows:
+            self.fleet_tree.insert("", "end", values=row)
+        for name, heading in self.fleet_headings.items():
+            arrow = (" \u25bc" if descending else " \u25b2") if name == column else ""
+            self.fleet_tree.heading(name, text=heading + arrow)
+
+    # --- Diagnostic Console Methods ---
+
+    def setup_diagnostics_section(self, parent_frame):
+        # Frame for streaming the output of diagnostic commands
+        diag_frame = tk.LabelFrame(parent_frame, text="Run Diagnostic", 
+                                   font=self.font_large, bg=self.card_color, fg=self.text_color,
+                                   padx=15, pady=15, bd=1, relief=tk.RIDGE)
+        diag_frame.pack(pady=15, fill="both", expand=True, padx=10)
+
+        # Row 0: Preset selector
+        tk.Label(diag_frame, text="Diagnostic:", font=self._get_font(10, 'bold'), 
+                 bg=self.card_color, fg=self.text_color).grid(row=0, column=0, sticky="w", padx=5, pady=5)
+        self.diagnostic_preset_var = tk.StringVar(value=next(iter(DIAGNOSTIC_COMMANDS)))
+        preset_menu = tk.OptionMenu(diag_frame, self.diagnostic_preset_var, *DIAGNOSTIC_COMMANDS, 
+                                    command=lambda choice: self.diagnostic_command_var.set(
+                                        shlex.join(DIAGNOSTIC_COMMANDS[choice])))
+        preset_menu.config(font=self.font_normal, bg="#E0E0E0", activebackground="#D0D0D0", relief=tk.FLAT)
+        preset_menu.grid(row=0, column=1, sticky="w", padx=5, pady=5)
+
+        # Row 1: Command (editable) and Run/Stop
+        tk.Label(diag_frame, text="Command:", font=self._get_font(10, 'bold'), 
+                 bg=self.card_color, fg=self.text_color).grid(row=1, column=0, sticky="w", padx=5, pady=5)
+        self.diagnostic_command_var = tk.StringVar(value=shlex.join(DIAGNOSTIC_COMMANDS[self.diagnostic_preset_var.get()]))
+        command_entry = tk.Entry(diag_frame, textvariable=self.diagnostic_command_var, font=self.font_normal, 
+                                 bg="#EFEFEF", fg=self.text_color, bd=1, relief=tk.FLAT)
+        command_entry.grid(row=1, column=1, sticky="ew", padx=5, pady=5)
+        command_entry.bind("<Return>", lambda event: self.toggle_diagnostic())
+        self.diagnostic_button = tk.Button(diag_frame, text="Run", command=self.toggle_diagnostic,
+                                           font=self.font_normal, bg=self.primary_color, fg="white", bd=0, 
+                                           padx=10, pady=5, relief=tk.GROOVE, 
+                                           activebackground="#0056b3", activeforeground="white")
+        self.diagnostic_button.grid(row=1, column=2, sticky="ew", padx=5)
+
+        # Row 2: Console (output is appended in batches, oldest lines dropped past the scrollback)
+        self.diagnostic_text = tk.Text(diag_frame, height=18, font=("Consolas", 9), wrap="none", state=tk.DISABLED,
+                                       bg="#EFEFEF", fg=self.text_color, bd=1, relief=tk.FLAT)
+        scrollbar = ttk.Scrollbar(diag_frame, orient="vertical", command=self.diagnostic_text.yview)
+        self.diagnostic_text.configure(yscrollcommand=scrollbar.set)
+        self.diagnostic_text.grid(row=2, column=0, columnspan=3, sticky="nsew", padx=(5, 0), pady=5)
+        scrollbar.grid(row=2, column=3, sticky="ns", pady=5)
+
+        # Row 3: Command cache and executor counters
+        self.command_stats_var = tk.StringVar()
+        tk.Label(diag_frame, textvariable=self.command_stats_var, font=self.font_normal_small, 
+                 bg=self.card_color, fg=self.text_color, anchor="w", justify="left", wraplength=700).grid(
+                     row=3, column=0, columnspan=2, sticky="ew", padx=5)
+        tk.Button(diag_frame, text="Clear Cache", command=self.clear_command_cache,
+                  font=self.font_normal_small, bg="#C0C0C0", fg=self.text_color, bd=0, 
+                  padx=5, pady=1, relief=tk.GROOVE).grid(row=3, column=2, sticky="ew", padx=5)
+        self.show_command_stats()
+
+        diag_frame.grid_columnconfigure(1, weight=1)
+        diag_frame.grid_rowconfigure(2, weight=1)
+
+    def show_command_stats(self):
+        """Refreshes the cache hit/miss line (when the tab is shown and after each diagnostic)."""
+        self.command_stats_var.set(format_command_cache_stats(get_command_cache().stats(), get_command_executor()))
+
+    def clear_command_cache(self):
+        get_command_cache().clear()
+        self.show_command_stats()
+        self.status_var.set("Command cache cleared.")
+
+    def toggle_diagnostic(self):
+        """Streams the command's output into the console, or stops the one running."""
+        if self.diagnostic_stream:
+            self.diagnostic_stream.cancel()
+            return
+
+        try:
+            argv = split_command_line(self.diagnostic_command_var.get())
+            if not argv:
+                raise ValueError("Enter a command to run.")
+            stream = self.diagnostic_stream = get_command_executor().stream(argv, DIAGNOSTIC_TIMEOUT)
+        except ValueError as e:
+            messagebox.showerror("Input Error", str(e))
+            return
+
+        self.diagnostic_pending.clear()
+        self.diagnostic_text.config(state=tk.NORMAL)
+        self.diagnostic_text.delete("1.0", tk.END)
+        self.diagnostic_text.config(state=tk.DISABLED)
+        self.diagnostic_pending.append(f"$ {shlex.join(argv)}\n")
+        self.diagnostic_button.config(text="Stop")
+        self.diagnostic_started_at = time.perf_counter()
+        if not self.diagnostic_job:
+            self.diagnostic_tick()
+
+        def worker():
+            pending = self.diagnostic_pending
+            try:
+                for line in stream:
+                    pending.append(line) # deque.append is thread-safe; the Tk tick drains it
+                summary = f"Exited with status {stream.returncode}"
+            except subprocess.TimeoutExpired:
+                summary = f"Killed after {DIAGNOSTIC_TIMEOUT:g}s timeout"
+            except concurrent.futures.CancelledError:
+                summary = "Stopped"
+            except OSError as e:
+                summary = f"Could not start: {e}"
+            self.run_on_ui_thread(self._finish_diagnostic, stream, summary)
+
+        threading.Thread(target=worker, name="DiagnosticStream", daemon=True).start()
+
+    def _finish_diagnostic(self, stream, summary):
+        if stream is not self.diagnostic_stream:
+            return
+        self.diagnostic_stream = None
+        self.diagnostic_button.config(text="Run")
+        summary += f" ({time.perf_counter() - self.diagnostic_started_at:.1f}s)."
+        self.diagnostic_pending.append(f"--- {summary}\n")
+        self.status_var.set(f"Diagnostic: {summary}")
+        self.show_command_stats()
+
+    def diagnostic_tick(self):
+        """Flushes queued output into the console in one insert, then trims it to the scrollback."""
+        lines = []
+        pending = self.diagnostic_pending
+        while pending:
+            lines.append(pending.popleft())
+        if lines:
+            text = self.diagnostic_text
+            at_bottom = text.yview()[1] >= 0.999 # Only follow the output if the user has not scrolled up
+            text.config(state=tk.NORMAL)
+            text.insert(tk.END, "".join(lines))
+            line_count = int(text.index("end-1c").split(".")[0])
+            if line_count > DIAGNOSTIC_SCROLLBACK:
+                text.delete("1.0", f"{line_count - DIAGNOSTIC_SCROLLBACK + 1}.0")
+            text.config(state=tk.DISABLED)
+            if at_bottom:
+                text.see(tk.END)
+        # Keep ticking while a command runs; stop once it has finished and everything is shown
+        if self.diagnostic_stream or pending:
+            self.diagnostic_job = self.master.after(DIAGNOSTIC_TICK_MS, self.diagnostic_tick)
+        else:
+            self.diagnostic_job = None
+
     # --- Base Converter Methods ---
     
     def setup_converter_section(self, parent_frame):
         # Frame for Base Converter
-        converter_frame = tk.LabelFrame(parent_frame, text="Number Base Converter (Binary, Octal, Decimal, Hex)", 
+        converter_frame = tk.LabelFrame(parent_frame, text="Number Base Converter (Base 2-36, Base58/64/85)", 
                                   font=self.font_large, bg=self.card_color, fg=self.text_color,
                                   padx=15, pady=15, bd=1, relief=tk.RIDGE)
         converter_frame.pack(pady=15, fill="x", padx=10)
 
         # Variables
         self.input_value_var = tk.StringVar()
-        self.input_base_var = tk.StringVar(value="Decimal")
+        self.input_base_var = tk.StringVar(value="Auto-detect")
         self.output_base_var = tk.StringVar(value="Hex")
         self.converted_value_var = tk.StringVar(value="Result will appear here.")
         
@@ -664,7 +5615,7 @@ class SystemUtilityApp:
         tk.Label(converter_frame, text="Input Base:", font=self.font_normal, 
                  bg=self.card_color, fg=self.text_color).grid(row=0, column=1, sticky="w", padx=5, pady=5)
                  
-        input_base_menu = tk.OptionMenu(converter_frame, self.input_base_var, *bases)
+        input_base_menu = tk.OptionMenu(converter_frame, self.input_base_var, "Auto-detect", *bases)
         input_base_menu.config(font=self.font_normal, bg="#E0E0E0", activebackground="#D0D0D0", relief=tk.FLAT)
         input_base_menu["menu"].config(font=self.font_normal)
         input_base_menu.grid(row=1, column=1, sticky="ew", padx=5)
@@ -716,42 +5667,59 @@ class SystemUtilityApp:
             self.status_var.set("Base conversion failed: Empty input.")
             return
 
-        input_base = self.base_map[input_base_name]
+        input_base = self.base_map.get(input_base_name) # None: 0x/0b/0o prefix, otherwise decimal
         output_base = self.base_map[output_base_name]
+        self.converted_full_value = None
+        self.convert_generation += 1
+        generation = self.convert_generation
+        names = (input_base_name, output_base_name)
 
-        try:
-            # 1. Convert input to decimal (base 10)
-            decimal_value = int(input_str, input_base)
-            
-            # 2. Convert from decimal to the output base
-            if output_base == 10:
-                converted_value = str(decimal_value)
-            elif output_base == 2:
-                converted_value = bin(decimal_value)[2:] # Remove '0b' prefix
-            elif output_base == 8:
-                converted_value = oct(decimal_value)[2:] # Remove '0o' prefix
-            elif output_base == 16:
-                converted_value = hex(decimal_value)[2:].upper() # Remove '0x' prefix and make uppercase
-            else:
-                raise ValueError("Unsupported output base.")
-
-            self.converted_value_var.set(converted_value)
-            self.status_var.set(f"Conversion successful: {input_base_name} to {output_base_name}.")
+        if len(input_str) < CONVERTER_BACKGROUND_DIGITS:
+            self._finish_conversion(generation, names, *self._run_conversion(input_str, input_base, output_base))
+            return
 
-        except ValueError:
-            self.converted_value_var.set(f"Error: Invalid input for base {input_base}.")
-            self.result_label.config(bg="#FFCCCC")
-            self.status_var.set("Base conversion failed: Invalid input.")
+        # Very long numbers take a moment even with the subquadratic engine: keep the UI responsive
+        self.converted_value_var.set(f"Converting {len(input_str):,} digits...")
+        self.status_var.set("Converting...")
+        threading.Thread(target=lambda: self.run_on_ui_thread(
+            self._finish_conversion, generation, names, *self._run_conversion(input_str, input_base, output_base)),
+            name="BaseConversion", daemon=True).start()
+
+    @staticmethod
+    def _run_conversion(input_str, input_base, output_base):
+        """Returns (converted text, None, seconds) or (None, error message, seconds)."""
+        start = time.perf_counter()
+        try:
+            return convert_radix(input_str, input_base, output_base), None, time.perf_counter() - start
+        except ValueError as e:
+            return None, f"Error: {e}.", time.perf_counter() - start
         except Exception as e:
-            self.converted_value_var.set(f"An unexpected error occurred: {e}")
+            return None, f"An unexpected error occurred: {e}", time.perf_counter() - start
+
+    def _finish_conversion(self, generation, names, converted_value, error, elapsed):
+        if generation != self.convert_generation:
+            return # A newer conversion was started meanwhile
+        input_base_name, output_base_name = names
+        if error:
+            self.converted_value_var.set(error)
             self.result_label.config(bg="#FFCCCC")
-            self.status_var.set("Base conversion failed: Unexpected error.")
+            self.status_var.set("Base conversion failed: " + 
+                                ("Invalid input." if error.startswith("Error") else "Unexpected error."))
+            return
+
+        self.converted_full_value = converted_value
+        if len(converted_value) > CONVERTER_PREVIEW_DIGITS:
+            half = CONVERTER_PREVIEW_DIGITS // 2
+            converted_value = f"{converted_value[:half]}...{converted_value[-half:]} ({len(converted_value):,} digits)"
+        self.converted_value_var.set(converted_value)
+        self.status_var.set(f"Conversion successful: {input_base_name} to {output_base_name}"
+                            + (f" in {elapsed:.2f}s." if elapsed >= 0.1 else "."))
             
     def copy_converted_value(self):
         """Copies the converted base value to the clipboard."""
-        output_value = self.converted_value_var.get()
+        output_value = self.converted_full_value
         
-        if "Error" in output_value or "Result will appear here" in output_value:
+        if not output_value:
             self.status_var.set("Copy failed: No valid conversion result available.")
             messagebox.showwarning("Copy Failed", "Cannot copy error message or placeholder text.")
             return
@@ -760,7 +5728,8 @@ class SystemUtilityApp:
             self.master.clipboard_clear()
             self.master.clipboard_append(output_value)
             self.master.update()
-            self.status_var.set(f"Copied '{output_value}' to clipboard.")
+            preview = output_value if len(output_value) <= 40 else f"{output_value[:40]}... ({len(output_value):,} digits)"
+            self.status_var.set(f"Copied '{preview}' to clipboard.")
         except Exception as e:
             self.status_var.set(f"Copy error: {e}")
             messagebox.showerror("Copy Error", f"Failed to copy value: {e}")
@@ -1405,11 +6374,121 @@ def minimize_console_window():
             pass
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="System Utility, Converter, Customizer, and Pong")
+    parser.add_argument("--bench-network", action="store_true",
+                        help="Benchmark the native Linux network reader against the 'ip a' subprocess and exit.")
+    parser.add_argument("--bench-connections", action="store_true",
+                        help="Benchmark the /proc socket inventory (cold vs incremental PID scan) and exit.")
+    parser.add_argument("--build-oui", metavar="OUI_CSV",
+                        help=f"Convert the IEEE oui.csv registry into '{NETWORK_DATA_FOLDER_NAME}/{OUI_DATABASE_FILE}' and exit.")
+    parser.add_argument("--bench-radix", action="store_true",
+                        help="Benchmark the radix engine against the original digit-at-a-time conversion and exit.")
+    parser.add_argument("--bench-routes", action="store_true",
+                        help="Benchmark longest-prefix match (trie vs linear scan) on a synthetic 50k-route table and exit.")
+    parser.add_argument("--throughput-server", metavar="[HOST:]PORT", nargs="?", const=str(THROUGHPUT_TEST_PORT),
+                        help="Run the throughput test server without the UI.")
+    parser.add_argument("--throughput-client", metavar="HOST[:PORT]",
+                        help="Run a throughput test against a server, print the result and exit.")
+    parser.add_argument("--metrics-port", type=int, metavar="PORT",
+                        help=f"Serve Prometheus metrics on this port (e.g. {METRICS_DEFAULT_PORT}).")
+    parser.add_argument("--metrics-host", default="127.0.0.1",
+                        help="Address the metrics endpoint binds to (default: 127.0.0.1).")
+    parser.add_argument("--agent-port", type=int, metavar="PORT", nargs="?", const=FLEET_AGENT_PORT,
+                        help=f"With --headless, serve this machine's adapters to fleet collectors (default port {FLEET_AGENT_PORT}).")
+    parser.add_argument("--agent-host", default="127.0.0.1",
+                        help="Address the fleet agent binds to (default: 127.0.0.1). Any other address needs a token.")
+    parser.add_argument("--agent-token", default=os.environ.get(FLEET_TOKEN_ENV),
+                        help=f"Shared token collectors must send (default: ${FLEET_TOKEN_ENV}, which keeps it out of ps).")
+    parser.add_argument("--headless", action="store_true",
+                        help="Run the background services (e.g. --metrics-port, --agent-port) without the UI.")
+    parser.add_argument("--bench-parsers", action="store_true",
+                        help=f"Benchmark the command output parsers on '{NETWORK_FIXTURES_FOLDER_NAME}' and exit.")
+    args = parser.parse_args()
+
+    if args.bench_network:
+        for backend, seconds in benchmark_network_backends().items():
+            print(f"{backend:<20} {seconds * 1000:8.3f} ms/call")
+        sys.exit(0)
+
+    if args.bench_connections:
+        results = benchmark_socket_inventory()
+        print(f"{results.pop('sockets')} sockets")
+        for mode, seconds in results.items():
+            print(f"{mode:<20} {seconds * 1000:8.3f} ms/call")
+        sys.exit(0)
+
+    if args.build_oui:
+        script_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
+        database = OuiDatabase.from_ieee_csv(args.build_oui)
+        os.makedirs(os.path.join(script_dir, NETWORK_DATA_FOLDER_NAME), exist_ok=True)
+        database.save(os.path.join(script_dir, NETWORK_DATA_FOLDER_NAME, OUI_DATABASE_FILE))
+        print(f"Wrote {len(database)} prefixes ({len(database.names)} vendors).")
+        sys.exit(0)
+
+    if args.bench_radix:
+        print(format_radix_benchmark_rows(benchmark_radix()))
+        sys.exit(0)
+
+    if args.bench_routes:
+        results = benchmark_route_lookup()
+        print(f"{results.pop('routes')} routes, trie built in {results.pop('trie build') * 1000:.1f} ms")
+        for mode, seconds in results.items():
+            print(f"{mode:<20} {seconds * 1e6:10.2f} us/lookup")
+        sys.exit(0)
+
+    if args.throughput_server:
+        host, port = parse_host_port(args.throughput_server if ":" in args.throughput_server 
+                                     else f":{args.throughput_server}", THROUGHPUT_TEST_PORT)
+        server = ThroughputTestServer(host or "0.0.0.0", port)
+        print(f"Throughput test server listening on {server.address[0]}:{server.address[1]} (Ctrl+C to stop)")
+        server.start()
+        try:
+            while server.is_alive():
+                server.join(0.5)
+        except KeyboardInterrupt:
+            server.stop()
+        sys.exit(0)
+
+    if args.throughput_client:
+        host, port = parse_host_port(args.throughput_client, THROUGHPUT_TEST_PORT)
+        print(format_throughput_result(run_throughput_test(host, port)))
+        sys.exit(0)
+
+    if args.bench_parsers:
+        script_dir = os.path.dirname(os.path.abspath(sys.argv[0]))
+        for file_name, parser_name, adapter_count, seconds in benchmark_parsers(script_dir):
+            print(f"{file_name:<36} {parser_name:<32} {adapter_count:>2} adapters {seconds * 1e6:9.1f} us/parse")
+        sys.exit(0)
+
+    if args.headless:
+        snapshot = NetworkSnapshotService()
+        services = [SnapshotRefresher(snapshot)]
+        if args.metrics_port is not None:
+            services.append(MetricsServer(snapshot, args.metrics_host, args.metrics_port))
+            print(f"Serving metrics on http://{args.metrics_host}:{services[-1].address[1]}/metrics")
+        if args.agent_port is not None:
+            if not args.agent_token and not is_loopback_host(args.agent_host):
+                parser.error(f"--agent-host {args.agent_host} exposes adapter details to the network; "
+                             f"set a token with --agent-token or ${FLEET_TOKEN_ENV}")
+            services.append(FleetAgent(snapshot, args.agent_host, args.agent_port, args.agent_token))
+            print(f"Fleet agent listening on {args.agent_host}:{services[-1].address[1]}")
+        if len(services) == 1:
+            parser.error("--headless needs a service to run, e.g. --metrics-port or --agent-port")
+        for service in services:
+            service.start()
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            for service in services:
+                service.stop()
+        sys.exit(0)
+
     minimize_console_window()
     
     if platform.system() not in ["Windows", "Linux", "Darwin"]:
         messagebox.showwarning("OS Warning", "This application relies on OS-specific commands (for network and launcher) and may not function fully on this operating system.")
         
     root = tk.Tk()
-    app = SystemUtilityApp(root)
+    app = SystemUtilityApp(root, (args.metrics_host, args.metrics_port) if args.metrics_port is not None else None)
     root.mainloop()
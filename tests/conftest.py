@@ -0,0 +1,29 @@
+import importlib.util
+import os
+import socket
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(REPO_ROOT, "Geo Multi Util App.py")
+
+# The app is a single script with spaces in its name, so it is loaded by path
+def _load_app():
+    spec = importlib.util.spec_from_file_location("geo_multi_util_app", APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+@pytest.fixture(scope="session")
+def app():
+    """The application module (no Tk window is created on import)."""
+    return sys.modules.get("geo_multi_util_app") or _load_app()
+
+@pytest.fixture
+def closed_port():
+    """A local TCP port with nothing listening on it, so connects are refused."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
@@ -0,0 +1,125 @@
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+@pytest.fixture
+def executor(app):
+    executor = app.CommandExecutor(timeout=20)
+    yield executor
+    executor.shutdown()
+
+def _python(script):
+    return [sys.executable, "-c", script]
+
+def _counted(path, seconds=0.0, output="done"):
+    """A command that appends a line to path on every run, so tests can count real executions."""
+    return _python(f"import time\nopen({str(path)!r}, 'a').write('run\\n')\ntime.sleep({seconds})\nprint({output!r})")
+
+def _runs(path):
+    return path.read_text().count("run\n") if path.exists() else 0
+
+def _run(cache, argv, ttl=60, **kwargs):
+    """cache.run(), then waits for the done-callback that stores the result."""
+    try:
+        return cache.run(argv, ttl, **kwargs)
+    finally:
+        deadline = time.monotonic() + 5
+        while cache.stats()["running"] and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+def test_concurrent_callers_share_one_execution(app, executor, tmp_path):
+    cache = app.CommandResultCache(executor)
+    argv = _counted(tmp_path / "runs", seconds=0.3)
+    barrier = threading.Barrier(8)
+    results = []
+
+    def call():
+        barrier.wait()
+        results.append(cache.run(argv, 60))
+
+    threads = [threading.Thread(target=call) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+
+    assert _runs(tmp_path / "runs") == 1
+    assert len(results) == 8
+    assert all(result is results[0] for result in results)
+    assert results[0].stdout.strip() == b"done"
+    stats = cache.stats()
+    assert stats["misses"] == 1
+    assert stats["hits"] + stats["coalesced"] == 7
+
+def test_entries_expire_after_their_ttl(app, executor, tmp_path):
+    cache = app.CommandResultCache(executor)
+    argv = _counted(tmp_path / "runs")
+
+    first = _run(cache, argv, ttl=0.5)
+    assert _run(cache, argv, ttl=0.5) is first
+    time.sleep(0.6)
+    assert _run(cache, argv, ttl=0.5) is not first
+
+    assert _runs(tmp_path / "runs") == 2
+    assert cache.stats()["hits"] == 1
+
+def test_zero_ttl_is_not_cached(app, executor, tmp_path):
+    cache = app.CommandResultCache(executor)
+    argv = _counted(tmp_path / "runs")
+    _run(cache, argv, ttl=0)
+    _run(cache, argv, ttl=0)
+
+    assert _runs(tmp_path / "runs") == 2
+    assert len(cache) == 0
+
+def test_least_recently_used_entries_are_evicted_over_the_byte_budget(app, executor):
+    cache = app.CommandResultCache(executor, max_bytes=250)
+    commands = {name: _python(f"import sys\nsys.stdout.write({name!r} * 100)") for name in "abc"}
+
+    _run(cache, commands["a"])
+    _run(cache, commands["b"])
+    _run(cache, commands["a"]) # Hit: b is now the least recently used
+    _run(cache, commands["c"])
+
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"], stats["evictions"]) == (2, 200, 1)
+    _run(cache, commands["a"])
+    _run(cache, commands["c"])
+    assert cache.stats()["hits"] == 3
+    _run(cache, commands["b"])
+    assert cache.stats()["misses"] == 4
+
+def test_output_larger_than_the_budget_is_not_cached(app, executor):
+    cache = app.CommandResultCache(executor, max_bytes=250)
+    result = _run(cache, _python("import sys\nsys.stdout.write('x' * 300)"))
+
+    assert len(result.stdout) == 300
+    assert (len(cache), cache.bytes) == (0, 0)
+
+def test_failures_are_not_cached(app, executor, tmp_path):
+    cache = app.CommandResultCache(executor)
+    missing = [str(tmp_path / "no-such-command")]
+    for _ in range(2):
+        with pytest.raises(OSError):
+            _run(cache, missing)
+
+    slow = _counted(tmp_path / "runs", seconds=5)
+    for _ in range(2):
+        with pytest.raises(subprocess.TimeoutExpired):
+            _run(cache, slow, timeout=0.5)
+
+    assert _runs(tmp_path / "runs") == 2
+    assert cache.stats()["misses"] == 4
+    assert len(cache) == 0
+
+def test_non_zero_exit_status_is_cached(app, executor, tmp_path):
+    cache = app.CommandResultCache(executor)
+    argv = _python(f"open({str(tmp_path / 'runs')!r}, 'a').write('run\\n')\nraise SystemExit(2)")
+
+    first = _run(cache, argv)
+    assert first.returncode == 2
+    assert _run(cache, argv) is first
+    assert _runs(tmp_path / "runs") == 1
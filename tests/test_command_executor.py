@@ -0,0 +1,37 @@
+import codecs
+import locale
+import sys
+
+import pytest
+
+def _stream(app, script):
+    executor = app.CommandExecutor(timeout=20)
+    try:
+        stream = executor.stream([sys.executable, "-c", script])
+        return list(stream), stream.returncode
+    finally:
+        executor.shutdown()
+
+@pytest.mark.skipif(codecs.lookup(locale.getpreferredencoding(False)).name != "utf-8",
+                    reason="needs a UTF-8 locale")
+def test_stream_keeps_multibyte_characters_across_flushes(app):
+    # 2-byte characters after one ASCII byte, with no newline well past the 64 KiB flush,
+    # written in 4 KiB pieces so every read ends in the middle of a character
+    script = ("import sys, time\n"
+              "data = ('x' + '\\u00e9' * 50000).encode('utf-8') + b'!\\r\\nnext\\r'\n"
+              "for i in range(0, len(data), 4096):\n"
+              "    sys.stdout.buffer.write(data[i:i + 4096]); sys.stdout.flush(); time.sleep(0.001)\n"
+              "sys.stdout.buffer.write(b'\\nlast')\n")
+
+    lines, returncode = _stream(app, script)
+
+    assert returncode == 0
+    assert "\ufffd" not in "".join(lines)
+    assert "".join(lines) == "x" + "\u00e9" * 50000 + "!\nnext\nlast"
+    assert lines[-2:] == ["next\n", "last"]
+
+def test_stream_merges_stderr_and_reports_exit_status(app):
+    lines, returncode = _stream(app, "import sys\nprint('out', flush=True)\nprint('err', file=sys.stderr)\nsys.exit(3)")
+
+    assert lines == ["out\n", "err\n"]
+    assert returncode == 3
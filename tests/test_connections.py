@@ -0,0 +1,150 @@
+import os
+import sys
+
+import pytest
+
+TCP = """\
+  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode
+   0: 0100007F:1F90 00000000:0000 0A 00000000:00000000 00:00000000 00000000     0        0 1001 1 0000000000000000 100 0 0 10 0
+   1: 2A01A8C0:C350 0101A8C0:01BB 01 00000000:00000000 02:000A7D1C 00000000  1000        0 1002 2 0000000000000000 20 4 30 10 -1
+   2: 2A01A8C0:C352 0101A8C0:01BB 06 00000000:00000000 03:00000F6D 00000000     0        0 0 3 0000000000000000
+"""
+TCP6 = """\
+  sl  local_address                         remote_address                        st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode
+   0: 00000000000000000000000001000000:0016 00000000000000000000000000000000:0000 0A 00000000:00000000 00:00000000 00000000     0        0 1003 1 0000000000000000 100 0 0 10 0
+"""
+UDP = """\
+  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode ref pointer drops
+  10: 00000000:0044 00000000:0000 07 00000000:00000000 00:00000000 00000000     0        0 1004 2 0000000000000000 0
+  11: 2A01A8C0:D431 08080808:0035 01 00000000:00000000 00:00000000 00000000  1000        0 1005 2 0000000000000000 0
+"""
+
+pytestmark = pytest.mark.skipif(sys.byteorder != "little", reason="fixtures hold little-endian /proc addresses")
+
+class FakeProc:
+    """A /proc tree in a temporary directory: net/{tcp,tcp6,udp} plus <pid>/comm and <pid>/fd symlinks."""
+
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(os.path.join(root, "net"))
+        for name, text in (("tcp", TCP), ("tcp6", TCP6), ("udp", UDP)):
+            with open(os.path.join(root, "net", name), "w") as f:
+                f.write(text)
+
+    def add_process(self, pid, comm, *targets):
+        os.makedirs(os.path.join(self.root, str(pid), "fd"))
+        with open(os.path.join(self.root, str(pid), "comm"), "w") as f:
+            f.write(comm + "\n")
+        for target in targets:
+            self.open_fd(pid, target)
+
+    def open_fd(self, pid, target):
+        fd_dir = os.path.join(self.root, str(pid), "fd")
+        fd = len(os.listdir(fd_dir))
+        while os.path.lexists(os.path.join(fd_dir, str(fd))):
+            fd += 1
+        os.symlink(f"socket:[{target}]" if isinstance(target, int) else target, os.path.join(fd_dir, str(fd)))
+        return fd
+
+    def close_fd(self, pid, fd):
+        os.unlink(os.path.join(self.root, str(pid), "fd", str(fd)))
+
+@pytest.fixture
+def proc(tmp_path):
+    return FakeProc(str(tmp_path))
+
+@pytest.fixture
+def owner_index(app, proc):
+    class RecordingIndex(app.SocketOwnerIndex):
+        """Counts fds like Linux 6.2+ does for /proc/<pid>/fd, and records which PIDs were scanned."""
+
+        def __init__(self, proc_path):
+            super().__init__(proc_path)
+            self.scanned = []
+
+        def _fd_count(self, pid):
+            try:
+                return len(os.listdir(os.path.join(self.proc_path, pid, "fd")))
+            except OSError:
+                return None
+
+        def _scan_pid(self, pid):
+            self.scanned.append(pid)
+            super()._scan_pid(pid)
+
+    return RecordingIndex(proc.root)
+
+def test_read_proc_net_sockets_decodes_addresses_and_states(app, proc):
+    sockets = app.read_proc_net_sockets(proc.root)
+
+    assert sockets == [
+        ("tcp", "127.0.0.1", 8080, "0.0.0.0", 0, "LISTEN", 1001),
+        ("tcp", "192.168.1.42", 50000, "192.168.1.1", 443, "ESTABLISHED", 1002),
+        ("tcp", "192.168.1.42", 50002, "192.168.1.1", 443, "TIME_WAIT", 0),
+        ("tcp6", "::1", 22, "::", 0, "LISTEN", 1003),
+        ("udp", "0.0.0.0", 68, "0.0.0.0", 0, "LISTEN", 1004), # Unconnected UDP
+        ("udp", "192.168.1.42", 54321, "8.8.8.8", 53, "ESTABLISHED", 1005),
+    ]
+
+def test_owner_index_maps_inodes_to_processes(app, proc, owner_index):
+    proc.add_process(100, "nginx", 1001, "/var/log/nginx/access.log")
+    proc.add_process(200, "firefox", 1002, 1005)
+    proc.add_process(300, "bash", "/dev/pts/0")
+
+    owners = owner_index.refresh([1001, 1002, 1005, 1004, 0])
+
+    assert owners == {1001: (100, "nginx"), 1002: (200, "firefox"), 1005: (200, "firefox")}
+    assert sorted(owner_index.scanned) == ["100", "200", "300"]
+
+def test_refresh_rescans_only_processes_whose_fd_count_changed(app, proc, owner_index):
+    proc.add_process(100, "nginx", 1001)
+    proc.add_process(200, "firefox", 1002)
+    proc.add_process(300, "bash", "/dev/pts/0")
+    owner_index.refresh([1001, 1002])
+    owner_index.scanned.clear()
+
+    proc.open_fd(200, 1005)
+    owners = owner_index.refresh([1001, 1002, 1005])
+
+    assert owners[1005] == (200, "firefox")
+    assert owner_index.scanned == ["200"]
+    assert owner_index.last_scanned == 1
+
+    owner_index.scanned.clear()
+    assert owner_index.refresh([1001, 1002, 1005]) == owners
+    assert owner_index.scanned == [] # Nothing new: no scans at all
+
+def test_refresh_finds_a_socket_swapped_in_at_the_same_fd_count(app, proc, owner_index):
+    proc.add_process(100, "nginx", 1001)
+    proc.add_process(200, "firefox", 1002)
+    proc.add_process(300, "bash", "/dev/pts/0")
+    owner_index.refresh([1001, 1002])
+    owner_index.scanned.clear()
+
+    proc.close_fd(200, 0) # A reconnect: one socket closed, another opened
+    proc.open_fd(200, 1005)
+    owners = owner_index.refresh([1001, 1005])
+
+    assert owners == {1001: (100, "nginx"), 1005: (200, "firefox")}
+    assert sorted(owner_index.scanned) == ["100", "200"] # Socket owners only, not bash
+
+def test_unresolvable_inodes_do_not_trigger_rescans(app, proc, owner_index):
+    proc.add_process(100, "nginx", 1001)
+    assert owner_index.refresh([1001, 1004]) == {1001: (100, "nginx")}
+    owner_index.scanned.clear()
+
+    assert owner_index.refresh([1001, 1004]) == {1001: (100, "nginx")}
+    assert owner_index.scanned == []
+
+def test_exited_processes_are_forgotten(app, proc, owner_index):
+    proc.add_process(100, "nginx", 1001)
+    proc.add_process(200, "firefox", 1002)
+    owner_index.refresh([1001, 1002])
+
+    for name in os.listdir(os.path.join(proc.root, "200", "fd")):
+        proc.close_fd(200, name)
+    os.unlink(os.path.join(proc.root, "200", "comm"))
+    os.rmdir(os.path.join(proc.root, "200", "fd"))
+    os.rmdir(os.path.join(proc.root, "200"))
+
+    assert owner_index.refresh([1001, 1002]) == {1001: (100, "nginx")}
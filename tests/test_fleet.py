@@ -0,0 +1,75 @@
+import inspect
+
+import pytest
+
+def _snapshot(app, adapters):
+    service = app.NetworkSnapshotService(loader=lambda: (adapters, None), ttl=60)
+    service.get()
+    return service
+
+@pytest.fixture
+def agents(app):
+    started = []
+
+    def start(hostname, adapters, token=None):
+        agent = app.FleetAgent(_snapshot(app, adapters), "127.0.0.1", 0, token=token)
+        agent.hostname = hostname
+        agent.start()
+        started.append(agent)
+        return agent
+
+    yield start
+    for agent in started:
+        agent.stop()
+        agent._thread.join(2)
+
+def _collect(app, targets, **kwargs):
+    results = {}
+    answered = app.FleetCollector(timeout=2, **kwargs).collect(
+        targets, lambda target, reply, error, rtt: results.__setitem__(target, (reply, error, rtt)))
+    rows = [row for target in targets for row in app.fleet_result_rows(target, *results[target])]
+    return answered, results, rows
+
+def test_collects_agents_and_reports_closed_port(app, agents, closed_port):
+    first = agents("alpha", {"eth0": app.AdapterRecord("eth0", mac="00-1B-21-3A-4F-5C", state="up",
+                                                        ipv4=[("192.168.1.42", 24)], gateway=["192.168.1.1"], speed=1000)})
+    second = agents("beta", {"eth0": app.AdapterRecord("eth0", state="up", ipv4=[("10.0.0.5", 8)]),
+                             "wlan0": app.AdapterRecord("wlan0", state="down")})
+    third = agents("gamma", {})
+    closed = ("127.0.0.1", closed_port)
+    targets = [first.address[:2], second.address[:2], third.address[:2], closed]
+
+    answered, results, rows = _collect(app, targets)
+
+    assert answered == 3 # Every reachable agent answers, even one with no adapters
+    agent_names = [f"127.0.0.1:{port}" for _host, port in targets]
+    assert [row[:8] for row in rows] == [
+        (agent_names[0], "alpha", "eth0", "up", "192.168.1.42/24", "00-1B-21-3A-4F-5C", "192.168.1.1", "1000 Mbps"),
+        (agent_names[1], "beta", "eth0", "up", "10.0.0.5/8", "-", "-", "-"),
+        (agent_names[1], "beta", "wlan0", "down", "-", "-", "-", "-"),
+        (agent_names[2], "gamma", "-", "-", "No adapters reported", "-", "-", "-"),
+        (agent_names[3], "-", "-", "error", results[closed][1], "-", "-", "-"),
+    ]
+    assert results[closed][0] is None and results[closed][1]
+    assert rows[-1][-1] == "-" # No RTT for an agent that never answered
+    assert all(float(row[-1]) >= 0 for row in rows[:-1])
+
+def test_token_is_required_when_set(app, agents):
+    agent = agents("alpha", {"eth0": app.AdapterRecord("eth0", state="up")}, token="s3cret")
+    target = agent.address[:2]
+
+    for token in (None, "wrong"):
+        _answered, results, rows = _collect(app, [target], token=token)
+        reply, error, _rtt = results[target]
+        assert "adapters" not in reply and "hostname" not in reply
+        assert error == "Missing or wrong agent token"
+        assert rows[0][3:5] == ("error", error)
+
+    _answered, results, rows = _collect(app, [target], token="s3cret")
+    assert results[target][1] is None
+    assert rows[0][1:3] == ("alpha", "eth0")
+
+def test_agent_defaults_to_loopback(app):
+    assert inspect.signature(app.FleetAgent).parameters["host"].default == "127.0.0.1"
+    assert app.is_loopback_host("127.0.0.1") and app.is_loopback_host("::1") and app.is_loopback_host("localhost")
+    assert not app.is_loopback_host("0.0.0.0") and not app.is_loopback_host("192.168.1.10")
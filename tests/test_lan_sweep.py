@@ -0,0 +1,41 @@
+import ipaddress
+import socket
+
+import pytest
+
+@pytest.fixture
+def listener():
+    """A stand-in service on 127.0.0.2 (any 127.0.0.0/8 address is local on Linux)."""
+    try:
+        sock = socket.create_server(("127.0.0.2", 0))
+    except OSError:
+        pytest.skip("127.0.0.2 is not routable to loopback on this OS")
+    with sock:
+        yield sock.getsockname()[1]
+
+def test_sweep_reports_open_and_refusing_hosts(app, listener, closed_port):
+    results = {}
+    sweeper = app.LanSweeper(ports=(listener, closed_port), timeout=1.0)
+
+    live = sweeper.sweep(ipaddress.ip_network("127.0.0.0/30").hosts(),
+                         lambda host, open_ports, rtt: results.update({host: (open_ports, rtt)}))
+
+    assert live == 2
+    assert results["127.0.0.2"][0] == [listener]
+    assert results["127.0.0.1"][0] == [] # Refused connects still prove the host is up
+    assert all(rtt >= 0 for _ports, rtt in results.values())
+
+def test_sweep_single_host_open_and_closed_port(app, closed_port):
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        port = server.getsockname()[1]
+        results = []
+        live = app.LanSweeper(ports=(port, closed_port), timeout=1.0).sweep(
+            ["127.0.0.1"], lambda *result: results.append(result))
+
+    assert live == 1
+    assert [(host, ports) for host, ports, _rtt in results] == [("127.0.0.1", [port])]
+
+def test_cancelled_sweep_returns_none(app, closed_port):
+    sweeper = app.LanSweeper(ports=(closed_port,))
+    sweeper.cancel()
+    assert sweeper.sweep(["127.0.0.1"], lambda *result: None) is None
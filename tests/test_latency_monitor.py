@@ -0,0 +1,67 @@
+import asyncio
+import socket
+import time
+
+import pytest
+
+@pytest.fixture
+def listener():
+    with socket.create_server(("127.0.0.1", 0)) as sock:
+        yield sock.getsockname()
+
+def _delayed_open_connection(delays):
+    """open_connection stand-in that waits delays[n] seconds before the n-th connect."""
+    calls = []
+
+    async def open_connection(host, port):
+        calls.append(time.monotonic())
+        delay = delays[len(calls) - 1] if len(calls) <= len(delays) else 0.0
+        await asyncio.sleep(delay)
+        return await asyncio.open_connection(host, port)
+
+    return open_connection, calls
+
+def test_round_against_local_listener_with_injected_delay(app, listener):
+    open_connection, _calls = _delayed_open_connection([0.05, 0.05, 0.05])
+    samples = []
+    monitor = app.LatencyMonitor([listener], lambda target, rtt: samples.append((target, rtt)),
+                                 interval=0.01, timeout=2.0, open_connection=open_connection)
+    asyncio.run(monitor.run_rounds(3))
+
+    assert [target for target, _rtt in samples] == [listener] * 3
+    assert all(rtt >= 0.05 for _target, rtt in samples) # The injected delay is part of the RTT
+
+    series = app.LatencySeries()
+    for _target, rtt in samples:
+        series.add(rtt)
+    assert series.sent == 3 and series.lost == 0
+    assert series.histogram.percentile(50) >= 0.05e9
+
+def test_unreachable_target_is_a_lost_sample(app, closed_port):
+    samples = []
+    monitor = app.LatencyMonitor([("127.0.0.1", closed_port)], lambda target, rtt: samples.append(rtt), timeout=1.0)
+    asyncio.run(monitor.run_rounds(1))
+    assert samples == [None]
+
+def test_missed_rounds_are_skipped_not_burst(app, listener):
+    # Round 1 stalls for 3.5 intervals; the rounds it overlapped must not fire back to back
+    open_connection, calls = _delayed_open_connection([0.35])
+    monitor = app.LatencyMonitor([listener], lambda target, rtt: None, interval=0.1,
+                                 open_connection=open_connection)
+    asyncio.run(monitor.run_rounds(4))
+
+    gaps = [later - earlier for earlier, later in zip(calls, calls[1:])]
+    assert gaps[0] >= 0.35
+    assert all(gap >= 0.08 for gap in gaps[2:])
+
+def test_started_monitor_stops(app, listener):
+    samples = []
+    monitor = app.LatencyMonitor([listener], lambda target, rtt: samples.append(rtt), interval=0.02)
+    monitor.start()
+    deadline = time.monotonic() + 2
+    while len(samples) < 3 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    monitor.stop()
+    monitor._thread.join(2)
+    assert not monitor._thread.is_alive()
+    assert len(samples) >= 3 and all(rtt is not None for rtt in samples)
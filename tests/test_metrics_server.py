@@ -0,0 +1,90 @@
+import http.client
+import re
+
+import pytest
+
+METRIC_LINE = re.compile(r'^[a-zA-Z_:][a-zA-Z0-9_:]*(\{([a-zA-Z_][a-zA-Z0-9_]*="(?:[^"\\]|\\.)*",?)*\})? -?[0-9.]+$')
+
+@pytest.fixture
+def snapshot(app):
+    calls = []
+    adapters = {"eth0": app.AdapterRecord("eth0", mac="00-1B-21-3A-4F-5C", state="up", mtu=1500,
+                                          ipv4=[("192.168.1.42", 24)]),
+                'we"ird': app.AdapterRecord('we"ird', state="down")}
+    service = app.NetworkSnapshotService(loader=lambda: calls.append(1) or (adapters, None), ttl=60)
+    service.get()
+    service.loader_calls = calls
+    return service
+
+@pytest.fixture
+def server(app, snapshot):
+    server = app.MetricsServer(snapshot, "127.0.0.1", 0)
+    server.start()
+    yield server
+    server.stop()
+    server._thread.join(2)
+
+def _request(server, method, path, connection=None):
+    connection = connection or http.client.HTTPConnection(*server.address, timeout=5)
+    connection.request(method, path)
+    response = connection.getresponse()
+    return response.status, response.getheader("Content-Type"), response.read().decode("utf-8")
+
+def test_metrics_text_format(app, server, snapshot):
+    status, content_type, body = _request(server, "GET", "/metrics")
+
+    assert status == 200
+    assert content_type == "text/plain; version=0.0.4; charset=utf-8"
+    assert body.endswith("\n")
+    for line in body.splitlines():
+        if line.startswith("#"):
+            assert re.match(r"^# (HELP|TYPE) geo_[a-z_]+ .+$", line), line
+        else:
+            assert METRIC_LINE.match(line), line
+    assert 'geo_adapter_info{adapter="eth0",mac="00-1B-21-3A-4F-5C",ipv4="192.168.1.42",state="up"} 1' in body
+    assert 'geo_adapter_up{adapter="we\\"ird"} 0' in body
+    assert "geo_adapter_mtu_bytes{adapter=\"eth0\"} 1500" in body
+    assert "geo_snapshot_error 0" in body
+    assert snapshot.loader_calls == [1] # A scrape only reads the cache
+
+def test_health_gauges_are_rendered_on_every_scrape(app, server, snapshot):
+    first = _request(server, "GET", "/metrics")[2]
+    second = _request(server, "GET", "/metrics")[2]
+
+    assert "geo_metrics_scrapes_total 1\n" in first
+    assert "geo_metrics_scrapes_total 2\n" in second
+    assert "geo_app_uptime_seconds " in second
+    adapter_section = first.partition("# HELP geo_snapshot_age_seconds")[0]
+    assert "geo_adapter_info" in adapter_section
+    assert second.startswith(adapter_section) # Reused within cache_seconds
+
+def test_adapter_section_is_rerendered_when_the_snapshot_changes(app, server, snapshot):
+    assert 'adapter="eth1"' not in _request(server, "GET", "/metrics")[2]
+    snapshot.loader = lambda: ({"eth1": app.AdapterRecord("eth1", state="up")}, None)
+    snapshot.invalidate()
+    snapshot.get()
+
+    body = _request(server, "GET", "/metrics")[2]
+    assert 'geo_adapter_up{adapter="eth1"} 1' in body
+    assert 'adapter="eth0"' not in body
+
+def test_unknown_path_and_method(app, server):
+    assert _request(server, "GET", "/nope")[0] == 404
+    assert _request(server, "POST", "/metrics")[0] == 405
+
+def test_keep_alive_scrapes_share_a_connection(app, server):
+    connection = http.client.HTTPConnection(*server.address, timeout=5)
+    for _ in range(3):
+        status, _content_type, body = _request(server, "GET", "/metrics?x=1", connection)
+        assert status == 200
+    connection.close()
+    assert server.scrapes == 3
+
+def test_stopped_server_closes_listener(app, snapshot):
+    server = app.MetricsServer(snapshot, "127.0.0.1", 0)
+    server.start()
+    assert _request(server, "GET", "/metrics")[0] == 200
+    server.stop()
+    server._thread.join(2)
+    with pytest.raises(OSError):
+        _request(server, "GET", "/metrics")
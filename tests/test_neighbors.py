@@ -0,0 +1,70 @@
+import pytest
+
+from conftest import REPO_ROOT
+
+def test_oui_round_trip(app, tmp_path):
+    database = app.OuiDatabase.from_entries([(0x001B21, "Intel Corporate"), (0x00E04C, "Realtek"),
+                                             (0x107C61, "Intel Corporate")])
+    path = tmp_path / "oui.bin.gz"
+    database.save(path)
+    loaded = app.OuiDatabase.load(path)
+
+    assert len(loaded) == 3
+    assert loaded.names == ["Intel Corporate", "Realtek"]
+    assert loaded.lookup("00-1b-21-3a-4f-5c") == "Intel Corporate"
+    assert loaded.lookup("00:E0:4C:68:1A:2B") == "Realtek"
+    assert loaded.lookup("00-00-00-00-00-01") is None
+    assert loaded.lookup("01:00:5e:00:00:fb") == "Multicast"
+
+def test_empty_oui_database_round_trip(app, tmp_path):
+    path = tmp_path / "empty.bin.gz"
+    app.OuiDatabase().save(path)
+    loaded = app.OuiDatabase.load(path)
+
+    assert len(loaded) == 0
+    assert loaded.names == []
+    assert loaded.lookup("00-1B-21-3A-4F-5C") is None
+
+def test_bundled_seed_is_flagged_partial(app, monkeypatch):
+    monkeypatch.setattr(app, "_oui_database", None)
+    database = app.get_oui_database(REPO_ROOT)
+    assert len(database) > 0
+    assert database.partial
+    assert database.lookup("00-1B-21-3A-4F-5C") == database.lookup("00-02-B3-00-00-01") == "Intel"
+
+@pytest.mark.parametrize("name, normalized", [
+    ("Intel Corporate", "Intel"),
+    ("Intel Corporation", "Intel"),
+    ("The Linksys Group, Inc.", "Linksys"),
+    ("Cisco-Linksys, LLC", "Linksys"),
+    ("Cisco Systems, Inc", "Cisco Systems"),
+    ("TP-LINK TECHNOLOGIES CO.,LTD.", "TP-LINK TECHNOLOGIES"),
+    ("  Raspberry Pi Trading Ltd ", "Raspberry Pi"),
+    ("Group", "Group"),
+])
+def test_normalize_vendor_name(app, name, normalized):
+    assert app.normalize_vendor_name(name) == normalized
+
+def test_user_supplied_ieee_list_is_preferred(app, tmp_path, monkeypatch):
+    data_dir = tmp_path / app.NETWORK_DATA_FOLDER_NAME
+    data_dir.mkdir()
+    (data_dir / app.OUI_REGISTRY_FILE).write_text(
+        "Registry,Assignment,Organization Name,Organization Address\n"
+        "MA-L,001B21,Intel Corporate,Lot 8 Jalan Hi-Tech 2/3 Kulim Kedah MY 09000\n"
+        'MA-L,00045A,"The Linksys Group, Inc.",17401 Armstrong Ave. Irvine CA US 92614\n'
+        "MA-M,70B3D5000,Not a 24-bit prefix,Somewhere\n", encoding="utf-8")
+    monkeypatch.setattr(app, "_oui_database", None)
+
+    database = app.get_oui_database(str(tmp_path))
+
+    assert len(database) == 2
+    assert database.lookup("00:1b:21:00:00:01") == "Intel"
+    assert database.lookup("00:04:5a:00:00:01") == "Linksys"
+
+def test_netlink_neighbor_dump(app):
+    try:
+        neighbors = app.NetlinkRouteClient().dump_neighbors()
+    except (AttributeError, OSError) as e:
+        pytest.skip(f"rtnetlink unavailable: {e}")
+    for ip, mac, ifname, state in neighbors:
+        assert ip and ifname and state
@@ -0,0 +1,86 @@
+def _snapshot(app, n):
+    """A one-adapter snapshot that differs for every n."""
+    record = app.AdapterRecord("eth0", mac="00-1B-21-3A-4F-5C", state="up",
+                               ipv4=[(f"192.168.1.{n % 250 + 1}", 24)])
+    return {"eth0": record}
+
+def _addresses(snapshots):
+    return [adapters["eth0"].ipv4[0][0] for _seq, _timestamp, adapters in snapshots]
+
+def test_unchanged_snapshots_are_not_recorded(app, tmp_path):
+    log = app.NetworkHistoryLog(str(tmp_path / "h.ring"), capacity=8)
+    assert log.append(_snapshot(app, 1))
+    assert not log.append(_snapshot(app, 1))
+    assert log.head_seq == 1
+    log.close()
+
+def test_reopen_after_wrap_past_checkpoint(app, tmp_path):
+    # checkpoint_every >= capacity: the ring wraps before a checkpoint is ever written
+    path = str(tmp_path / "h.ring")
+    log = app.NetworkHistoryLog(path, capacity=4, batch_size=1, checkpoint_every=10)
+    for n in range(1, 7):
+        log.append(_snapshot(app, n), timestamp=n)
+    assert log.checkpoint_seq == 0
+    log._file.close() # Simulate a crash: no close(), so no final checkpoint
+    log._file = None
+
+    reopened = app.NetworkHistoryLog(path)
+    assert reopened.head_seq == 6
+    assert _addresses(reopened.snapshots()) == ["192.168.1.4", "192.168.1.5", "192.168.1.6", "192.168.1.7"]
+
+    # The next append must continue the sequence, not overwrite live records
+    reopened.append(_snapshot(app, 7), timestamp=7)
+    reopened.close()
+    assert [seq for seq, _t, _a in app.NetworkHistoryLog(path).snapshots()] == [4, 5, 6, 7]
+
+def test_unrecognised_file_starts_empty(app, tmp_path):
+    path = str(tmp_path / "h.ring")
+    log = app.NetworkHistoryLog(path, capacity=4, batch_size=1)
+    for n in range(1, 4):
+        log.append(_snapshot(app, n))
+    log.close()
+    with open(path, "r+b") as f:
+        f.write(b"XXXX") # Corrupt the magic: the old slots must not be resurrected
+
+    assert app.NetworkHistoryLog(path).snapshots() == []
+
+def test_lone_change_is_due_for_flush(app, tmp_path):
+    path = str(tmp_path / "h.ring")
+    log = app.NetworkHistoryLog(path, capacity=8, batch_size=8, flush_interval=30.0)
+    assert log.flush_due_in() is None
+    log.append(_snapshot(app, 1))
+    due_in = log.flush_due_in()
+    assert 0 < due_in <= 30.0
+    assert app.NetworkHistoryLog(path).head_seq == 0 # Still buffered
+
+    log.flush()
+    assert log.flush_due_in() is None
+    assert app.NetworkHistoryLog(path).head_seq == 1
+
+def test_overdue_batch_is_written_on_append(app, tmp_path):
+    path = str(tmp_path / "h.ring")
+    log = app.NetworkHistoryLog(path, capacity=8, batch_size=8, flush_interval=0.0)
+    log.append(_snapshot(app, 1))
+    assert log.flush_due_in() is None
+    assert app.NetworkHistoryLog(path).head_seq == 1
+
+def test_oversized_snapshot_is_counted(app, tmp_path):
+    log = app.NetworkHistoryLog(str(tmp_path / "h.ring"), capacity=4, record_size=64)
+    assert not log.append(_snapshot(app, 1))
+    assert log.dropped == 1
+    assert log.head_seq == 0
+    log.close()
+
+def test_dropped_snapshot_is_not_remembered_as_recorded(app, tmp_path):
+    log = app.NetworkHistoryLog(str(tmp_path / "h.ring"), capacity=4, record_size=256)
+    small = _snapshot(app, 1)
+    big = {"eth0": app.AdapterRecord("eth0", state="up",
+                                     ipv4=[(f"10.{n * 7 % 256}.{n * 13 % 256}.{n}", 24) for n in range(60)])}
+
+    assert log.append(small)
+    assert not log.append(big)
+    assert not log.append(big) # Still too large: dropped again, not skipped as "unchanged"
+    assert log.dropped == 2
+    assert not log.append(small) # Same as the newest recorded snapshot
+    assert log.head_seq == 1
+    log.close()
@@ -0,0 +1,72 @@
+import threading
+import time
+
+class SlowLoader:
+    """Fake adapter loader: call N returns {"call": N}; the first call blocks until released."""
+
+    def __init__(self):
+        self.calls = 0
+        self.release_first = threading.Event()
+        self.first_started = threading.Event()
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+        if call == 1:
+            self.first_started.set()
+            self.release_first.wait(5)
+        return {"call": call}, None
+
+def _get_in_thread(service, results):
+    thread = threading.Thread(target=lambda: results.append(service.get()), daemon=True)
+    thread.start()
+    return thread
+
+def test_concurrent_callers_share_one_query(app):
+    loader = SlowLoader()
+    service = app.NetworkSnapshotService(loader=loader, ttl=60)
+    results = []
+    threads = [_get_in_thread(service, results)]
+    assert loader.first_started.wait(2)
+    threads += [_get_in_thread(service, results) for _ in range(4)]
+    time.sleep(0.05)
+    loader.release_first.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert loader.calls == 1
+    assert results == [({"call": 1}, None)] * 5
+
+def test_forced_refresh_does_not_wait_for_stuck_query(app):
+    loader = SlowLoader()
+    service = app.NetworkSnapshotService(loader=loader, ttl=60)
+    stuck = []
+    stuck_thread = _get_in_thread(service, stuck)
+    assert loader.first_started.wait(2)
+
+    service.invalidate() # What the Refresh button does
+    start = time.monotonic()
+    adapters, error = service.get()
+
+    assert time.monotonic() - start < 1
+    assert loader.calls == 2
+    assert (adapters, error) == ({"call": 2}, None)
+
+    # The stuck query finishing late must not replace the newer data
+    loader.release_first.set()
+    stuck_thread.join(2)
+    assert service.peek()[0] == {"call": 2}
+    assert service.get() == ({"call": 2}, None)
+    assert loader.calls == 2
+
+def test_query_after_invalidation_is_shared_again(app):
+    loader = SlowLoader()
+    loader.release_first.set()
+    service = app.NetworkSnapshotService(loader=loader, ttl=60)
+    assert service.get() == ({"call": 1}, None)
+    assert service.get() == ({"call": 1}, None)
+    service.invalidate()
+    assert service.get() == ({"call": 2}, None)
+    assert loader.calls == 2
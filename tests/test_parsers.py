@@ -0,0 +1,42 @@
+import pytest
+
+from conftest import REPO_ROOT
+
+@pytest.fixture(scope="module")
+def fixtures(app):
+    return app.load_network_fixtures(REPO_ROOT)
+
+def test_every_fixture_yields_adapters(app, fixtures):
+    assert fixtures
+    for file_name, (parser, text) in fixtures.items():
+        assert parser(text), file_name
+
+def test_crlf_capture_is_kept_and_parsed(app, fixtures):
+    parser, text = fixtures["ipconfig_all_windows10_crlf.txt"]
+    assert "\r\n" in text
+    interfaces = {i["name"]: i for i in parser(text)}
+
+    assert list(interfaces) == ["Ethernet 2", "Wi-Fi", "Bluetooth Network Connection"]
+    wifi = interfaces["Wi-Fi"]
+    assert wifi["ipv4"] == [("10.20.30.118", 22)]
+    assert wifi["gateway"] == ["10.20.28.1"]
+    assert wifi["dns"] == ["10.20.0.10", "10.20.0.11"]
+    assert interfaces["Ethernet 2"]["ipv4"] == [("169.254.127.21", 16)]
+    assert interfaces["Bluetooth Network Connection"]["state"] == "down"
+
+def test_crlf_and_lf_parse_the_same(app, fixtures):
+    for file_name, (parser, text) in fixtures.items():
+        lf = text.replace("\r\n", "\n")
+        assert parser(lf.replace("\n", "\r\n")) == parser(lf), file_name
+
+def test_single_pass_matches_linewise_baseline(app, fixtures):
+    for file_name, (parser, text) in fixtures.items():
+        if parser is not app.parse_ipconfig_output:
+            continue
+        baseline = app.parse_ipconfig_output_linewise(text)
+        for interface in parser(text):
+            if interface["name"] in baseline:
+                old = baseline[interface["name"]]
+                assert (interface["mac"] or "Not Found") == old["mac"], file_name
+                if old["ipv4"] != "Not Found":
+                    assert old["ipv4"] in [address for address, _prefix in interface["ipv4"]], file_name
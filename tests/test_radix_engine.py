@@ -0,0 +1,176 @@
+import base64
+import random
+import sys
+
+import pytest
+
+BASES = range(2, 37)
+
+@pytest.fixture
+def no_int_digit_limit():
+    """Lets the int(s, b) reference parse strings past CPython's 4300-digit default."""
+    if not hasattr(sys, "set_int_max_str_digits"): # Python < 3.11 has no limit
+        yield
+        return
+    previous = sys.get_int_max_str_digits()
+    sys.set_int_max_str_digits(0)
+    yield
+    sys.set_int_max_str_digits(previous)
+
+def _random_digits(app, rng, base, length):
+    digits = app.RADIX_DIGITS[:base]
+    return rng.choice(digits[1:]) + "".join(rng.choice(digits) for _ in range(length - 1))
+
+@pytest.mark.parametrize("base", BASES)
+def test_round_trip_matches_int_and_format(app, base):
+    rng = random.Random(base)
+    for value in (0, 1, base - 1, base, base ** 2 - 1, rng.getrandbits(64), rng.getrandbits(2000)):
+        text = app.format_number(value, base)
+        assert int(text, base) == value
+        assert app.parse_number(text, base) == value
+        assert app.parse_number(text.lower(), base) == value
+        assert app.format_number(value, base, uppercase=False) == text.lower()
+        if base in (2, 8, 10, 16):
+            assert text == format(value, {2: "b", 8: "o", 10: "d", 16: "X"}[base])
+    for length in (1, 7, 40, 300):
+        digits = _random_digits(app, rng, base, length)
+        assert app.parse_number(digits, base) == int(digits, base)
+
+@pytest.mark.parametrize("base", [3, 10, 36])
+def test_round_trip_past_the_int_digit_limit(app, no_int_digit_limit, base):
+    digits = _random_digits(app, random.Random(base), base, 10000)
+    value = int(digits, base)
+
+    assert app.parse_number(digits, base) == value
+    assert app.format_number(value, base) == digits
+
+@pytest.mark.parametrize("base", [3, 10, 36])
+def test_divide_and_conquer_matches_int(app, no_int_digit_limit, base):
+    leaf = app.RADIX_LEAF_DIGITS
+    rng = random.Random(leaf + base)
+    for length in (leaf, leaf + 1, 2 * leaf + 1, 5 * leaf + 3):
+        digits = _random_digits(app, rng, base, length)
+        value = int(digits, base)
+        assert app.parse_number(digits, base) == value
+        assert app.format_number(value, base) == digits
+    # Low halves full of zeros must keep their padding
+    for value in (base ** (2 * leaf), base ** (4 * leaf) + 1, base ** (3 * leaf) * (base - 1)):
+        text = app.format_number(value, base)
+        assert int(text, base) == value
+        assert app.parse_number(text, base) == value
+
+def test_divide_and_conquer_base58_matches_the_chunked_loop(app):
+    value = random.Random(58).getrandbits(app.RADIX_LEAF_DIGITS * 5 * 3)
+    text = app.format_number(value, "base58")
+
+    assert text == app._format_chunked(value, 58, app.BASE58_ALPHABET)
+    assert app.parse_number(text, "base58") == value
+
+def test_long_numbers_do_not_touch_the_int_digit_limit(app):
+    digits = "7" * (app.RADIX_LEAF_DIGITS * 6)
+    value = app.parse_number(digits, 10)
+
+    assert value % 10 ** 6 == 777777
+    assert app.format_number(value, 10) == digits
+
+@pytest.mark.parametrize("value, base, text", [
+    (-255, 16, "-FF"),
+    (-5, 2, "-101"),
+    (-35, 36, "-Z"),
+    (-1234567890123456789, 10, "-1234567890123456789"),
+])
+def test_negatives(app, value, base, text):
+    assert app.format_number(value, base) == text
+    assert app.parse_number(text, base) == value
+    assert app.parse_number(" " + text.lower() + " ", base) == value
+
+@pytest.mark.parametrize("text, base, value", [
+    ("0x1F", None, 31),
+    ("0X1f", None, 31),
+    ("0b101", None, 5),
+    ("0o17", None, 15),
+    ("17", None, 17), # No prefix: decimal
+    ("-0x10", None, -16),
+    ("+ 0x10", None, 16),
+    ("0x1F", 16, 31), # A prefix matching the chosen base is stripped
+    ("0b1", 16, 0xB1), # A different prefix is just digits of the chosen base
+    ("DEAD BEEF", 16, 0xDEADBEEF),
+    ("1_000_000", 10, 1000000),
+])
+def test_sign_and_prefix_handling(app, text, base, value):
+    assert app.parse_number(text, base) == value
+
+@pytest.mark.parametrize("text, base", [
+    ("", None), ("   ", 10), ("-", 10), ("0x", None), ("0b", 2), ("_", 16),
+    ("", "base58"), ("  ", "base64"), ("", "base85"),
+])
+def test_empty_input_is_rejected(app, text, base):
+    with pytest.raises(ValueError, match="Empty input"):
+        app.parse_number(text, base)
+
+@pytest.mark.parametrize("text, base, digit", [
+    ("12a", 10, "a"),
+    ("102", 2, "2"),
+    ("0x1G", None, "G"),
+    ("1.5", 10, "."),
+    ("١٢", 10, "١"), # Arabic-Indic digits, which int() would accept
+    ("Z", 35, "Z"),
+    ("2l1", "base58", "l"), # Not in the Bitcoin alphabet
+    ("0OI", "base58", "0"),
+])
+def test_invalid_digits_are_named(app, text, base, digit):
+    with pytest.raises(ValueError, match=f"Invalid digit {digit!r}"):
+        app.parse_number(text, base)
+
+@pytest.mark.parametrize("text, base", [("A*==", "base64"), ("QUJ", "base64"), ("~~~~~", "base85")])
+def test_invalid_byte_encodings_are_rejected(app, text, base):
+    with pytest.raises(ValueError, match=f"Invalid {base} input"):
+        app.parse_number(text, base)
+
+@pytest.mark.parametrize("base", [0, 1, 37, "base32", "16"])
+def test_unsupported_bases_are_rejected(app, base):
+    with pytest.raises(ValueError, match="Unsupported base"):
+        app.format_number(10, base)
+    with pytest.raises(ValueError, match="Unsupported base"):
+        app.parse_number("10", base)
+
+def test_base58_leading_zeros(app):
+    # '1' is the zero digit, so leading 1s add nothing to the value (as in a Bitcoin
+    # address, where each stands for a leading zero byte that an int cannot keep)
+    assert app.format_number(0, "base58") == "1"
+    assert app.format_number(57, "base58") == "z"
+    assert app.format_number(58, "base58") == "21"
+    assert app.parse_number("1", "base58") == 0
+    assert app.parse_number("1112", "base58") == 1
+    assert app.parse_number("11z", "base58") == app.parse_number("z", "base58") == 57
+
+def test_base58_round_trip(app):
+    rng = random.Random(58)
+    alphabet = app.BASE58_ALPHABET
+    for value in (1, 57, 58, 58 ** 5, rng.getrandbits(256), rng.getrandbits(4096)):
+        text = app.format_number(value, "base58")
+        assert text[0] != "1"
+        assert all(char in alphabet for char in text)
+        assert app.parse_number(text, "base58") == value
+    # Bitcoin's own test vector: b"Hello World!"
+    assert app.format_number(int.from_bytes(b"Hello World!", "big"), "base58") == "2NEpo7TZRRrLZSi2U"
+
+@pytest.mark.parametrize("encoding, encode", [("base64", base64.b64encode), ("base85", base64.b85encode)])
+def test_byte_encodings_write_big_endian_bytes(app, encoding, encode):
+    for data in (b"\x00", b"\x01", b"\xff\xfe", bytes(range(1, 200))):
+        value = int.from_bytes(data, "big")
+        text = app.format_number(value, encoding)
+        assert text == encode(data).decode("ascii")
+        assert app.parse_number(text, encoding) == value
+    assert app.parse_number(encode(b"\x00\x00\x01").decode("ascii"), encoding) == 1 # Leading zero bytes
+
+@pytest.mark.parametrize("encoding", ["base58", "base64", "base85"])
+def test_byte_encodings_reject_negatives(app, encoding):
+    with pytest.raises(ValueError, match="non-negative"):
+        app.format_number(-1, encoding)
+
+def test_convert_radix(app):
+    assert app.convert_radix("0xff", None, 2) == "11111111"
+    assert app.convert_radix("255", 10, "base64") == "/w=="
+    assert app.convert_radix("/w==", "base64", 16, uppercase=False) == "ff"
+    assert app.convert_radix("-42", None, 36) == "-16"
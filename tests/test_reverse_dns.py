@@ -0,0 +1,117 @@
+import socket
+import struct
+import threading
+import time
+
+import pytest
+
+def _encode_name(name):
+    return b"".join(bytes([len(label)]) + label.encode("ascii") for label in name.split(".") if label) + b"\0"
+
+class StubDnsServer(threading.Thread):
+    """Answers PTR queries on loopback from a {reverse name: hostname} table; anything else is NXDOMAIN."""
+
+    def __init__(self, names, host="127.0.0.1", soa_ttl=600, soa_minimum=60):
+        super().__init__(daemon=True)
+        self.names = names
+        self.soa_ttl = soa_ttl
+        self.soa_minimum = soa_minimum
+        self.queries = 0
+        family = socket.AF_INET6 if ":" in host else socket.AF_INET
+        self.sock = socket.socket(family, socket.SOCK_DGRAM)
+        self.sock.bind((host, 0))
+        self.sock.settimeout(0.1)
+        self.address = self.sock.getsockname()[:2]
+        self._stop_event = threading.Event()
+
+    def run(self):
+        with self.sock:
+            while not self._stop_event.is_set():
+                try:
+                    query, peer = self.sock.recvfrom(512)
+                except socket.timeout:
+                    continue
+                self.queries += 1
+                self.sock.sendto(self._reply(query), peer)
+
+    def _reply(self, query):
+        query_id = struct.unpack_from("!H", query)[0]
+        offset, labels = 12, []
+        while query[offset]:
+            labels.append(query[offset + 1:offset + 1 + query[offset]].decode())
+            offset += 1 + query[offset]
+        question = query[12:offset + 5]
+        hostname = self.names.get(".".join(labels))
+        if hostname:
+            rdata = _encode_name(hostname)
+            answer = struct.pack("!HHHIH", 0xC00C, 12, 1, 300, len(rdata)) + rdata
+            return struct.pack("!HHHHHH", query_id, 0x8180, 1, 1, 0, 0) + question + answer
+        rdata = (_encode_name("ns.stub.test") + _encode_name("admin.stub.test") +
+                 struct.pack("!5I", 1, 3600, 600, 86400, self.soa_minimum))
+        authority = struct.pack("!HHHIH", 0xC00C, 6, 1, self.soa_ttl, len(rdata)) + rdata
+        return struct.pack("!HHHHHH", query_id, 0x8183, 1, 0, 1, 0) + question + authority
+
+    def stop(self):
+        self._stop_event.set()
+        self.join(2)
+
+@pytest.fixture
+def stub():
+    server = StubDnsServer({"5.0.0.127.in-addr.arpa": "stub-host.test"})
+    server.start()
+    yield server
+    server.stop()
+
+def test_ptr_lookup_against_stub_server(app, stub):
+    resolver = app.ReverseDnsResolver(nameserver=stub.address[0], port=stub.address[1], timeout=1.0)
+    try:
+        assert resolver.resolve("127.0.0.5").result(5) == "stub-host.test"
+        assert resolver.resolve("127.0.0.5").result(5) == "stub-host.test"
+        assert stub.queries == 1 and resolver.hits == 1
+        assert resolver.peek("127.0.0.5") == (True, "stub-host.test")
+    finally:
+        resolver.shutdown()
+
+def test_nxdomain_is_cached_for_soa_negative_ttl(app, stub):
+    resolver = app.ReverseDnsResolver(nameserver=stub.address[0], port=stub.address[1], timeout=1.0)
+    try:
+        assert resolver.resolve("127.0.0.9").result(5) is None
+        assert resolver.resolve("127.0.0.9").result(5) is None
+        assert stub.queries == 1
+        expires_in = resolver._cache["127.0.0.9"][1] - time.monotonic()
+        assert 55 < expires_in <= 60 # min(SOA ttl 600, minimum 60)
+    finally:
+        resolver.shutdown()
+
+def test_silent_server_is_a_cached_failure(app):
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as silent:
+        silent.bind(("127.0.0.1", 0))
+        resolver = app.ReverseDnsResolver(nameserver="127.0.0.1", port=silent.getsockname()[1],
+                                          timeout=0.1, attempts=1, failure_ttl=30)
+        try:
+            assert resolver.resolve("127.0.0.5").result(5) is None
+            assert resolver.peek("127.0.0.5") == (True, None)
+        finally:
+            resolver.shutdown()
+
+def test_ipv6_loopback_nameserver(app):
+    try:
+        server = StubDnsServer({"5.0.0.127.in-addr.arpa": "stub-host.test"}, host="::1")
+    except OSError:
+        pytest.skip("No IPv6 loopback")
+    server.start()
+    resolver = app.ReverseDnsResolver(nameserver="::1", port=server.address[1], timeout=1.0)
+    try:
+        assert resolver.resolve("127.0.0.5").result(5) == "stub-host.test"
+    finally:
+        resolver.shutdown()
+        server.stop()
+
+def test_scoped_nameserver_keeps_scope_id(app):
+    try:
+        scope = socket.if_nametoindex("lo")
+    except OSError:
+        pytest.skip("No 'lo' interface")
+    family, sockaddr = app.nameserver_sockaddr("fe80::1%lo", 53)
+    assert family == socket.AF_INET6
+    assert sockaddr == ("fe80::1", 53, 0, scope) # connect(("fe80::1%lo", 53)) would fail with EINVAL
@@ -0,0 +1,74 @@
+import socket
+import sys
+
+import pytest
+
+# Kernel order: default routes first; one down route and one reject route the reader must skip
+ROUTE = """\
+Iface\tDestination\tGateway \tFlags\tRefCnt\tUse\tMetric\tMask\t\tMTU\tWindow\tIRTT
+wlan0\t00000000\t0100000A\t0003\t0\t0\t600\t00000000\t0\t0\t0
+eth0\t00000000\t0101A8C0\t0003\t0\t0\t100\t00000000\t0\t0\t0
+eth0\t0001A8C0\t00000000\t0001\t0\t0\t100\t00FFFFFF\t0\t0\t0
+tun0\t0000000A\t00000000\t0001\t0\t0\t50\t000000FF\t0\t0\t0
+tun0\t0000010A\t00000000\t0001\t0\t0\t50\t0000FFFF\t0\t0\t0
+eth1\t0010A8C0\t00000000\t0000\t0\t0\t0\t00FFFFFF\t0\t0\t0
+eth0\t0002A8C0\t00000000\t0201\t0\t0\t0\t00FFFFFF\t0\t0\t0
+"""
+ZERO = "0" * 32
+IPV6_ROUTE = f"""\
+20010db8000000000000000000000000 20 {ZERO} 00 {ZERO} 00000100 00000001 00000000 00000001     eth0
+20010db8000100000000000000000000 30 {ZERO} 00 {ZERO} 00000100 00000001 00000000 00000001     tun0
+{ZERO} 00 {ZERO} 00 fe800000000000000000000000000001 00000400 00000001 00000000 00000003     eth0
+{ZERO} 00 {ZERO} 00 {ZERO} ffffffff 00000001 00000000 00200200       lo
+"""
+
+@pytest.fixture
+def routes(app, tmp_path):
+    (tmp_path / "net").mkdir()
+    (tmp_path / "net" / "route").write_text(ROUTE)
+    (tmp_path / "net" / "ipv6_route").write_text(IPV6_ROUTE)
+    return app.read_linux_routes(str(tmp_path))
+
+@pytest.mark.skipif(sys.byteorder != "little", reason="/proc/net/route holds host-order addresses")
+def test_proc_net_route_hex_decoding(app, routes):
+    assert [(app.format_route_destination(route),) + route[3:] for route in routes] == [
+        ("0.0.0.0/0", "10.0.0.1", "wlan0", 600),
+        ("0.0.0.0/0", "192.168.1.1", "eth0", 100),
+        ("192.168.1.0/24", None, "eth0", 100),
+        ("10.0.0.0/8", None, "tun0", 50),
+        ("10.1.0.0/16", None, "tun0", 50),
+        ("2001:db8::/32", None, "eth0", 256),
+        ("2001:db8:1::/48", None, "tun0", 256),
+        ("::/0", "fe80::1", "eth0", 1024),
+    ]
+
+@pytest.mark.skipif(sys.byteorder != "little", reason="/proc/net/route holds host-order addresses")
+@pytest.mark.parametrize("address, destination, ifname", [
+    ("192.168.1.7", "192.168.1.0/24", "eth0"),
+    ("10.1.2.3", "10.1.0.0/16", "tun0"), # Overlapping prefixes: the longest wins
+    ("10.2.0.1", "10.0.0.0/8", "tun0"),
+    ("8.8.8.8", "0.0.0.0/0", "eth0"), # Default route, lowest metric of the two
+    ("2001:db8:1::5", "2001:db8:1::/48", "tun0"),
+    ("2001:db8:2::1", "2001:db8::/32", "eth0"),
+    ("2606:4700::1111", "::/0", "eth0"),
+])
+def test_longest_prefix_match(app, routes, address, destination, ifname):
+    route = app.RoutePrefixTrie(routes).lookup(address)
+    assert (app.format_route_destination(route), route[4]) == (destination, ifname)
+
+def test_lowest_metric_wins_in_any_insert_order(app):
+    low = (socket.AF_INET, 0x0A000000, 8, None, "tun0", 10)
+    high = (socket.AF_INET, 0x0A000000, 8, None, "tun1", 20)
+    for routes in ([low, high], [high, low]):
+        trie = app.RoutePrefixTrie(routes)
+        assert trie.lookup("10.9.9.9") is low
+        assert trie.count == 1
+
+def test_no_match_without_a_default_route(app):
+    trie = app.RoutePrefixTrie([(socket.AF_INET, 0xC0A80100, 24, None, "eth0", 0),
+                                (socket.AF_INET, 0xC0A80105, 32, None, "eth1", 0)])
+    assert trie.lookup("192.168.1.5")[4] == "eth1" # Host route
+    assert trie.lookup("192.168.2.1") is None
+    assert trie.lookup("2001:db8::1") is None # No IPv6 routes at all
+    with pytest.raises(ValueError):
+        trie.lookup("not-an-address")
@@ -0,0 +1,28 @@
+import ipaddress
+
+def _parsed(app, text):
+    networks, errors = app.parse_cidr_list(text)
+    assert errors == []
+    return [str(network) for _token, network in networks]
+
+def test_netmask_and_wildcard_pairs_are_joined(app):
+    text = """
+    ip route 10.1.0.0 255.255.0.0 192.0.2.1
+    access-list 101 permit ip 10.0.0.0 0.0.0.255 any
+    ip route 0.0.0.0 0.0.0.0 192.0.2.1
+    permit ip 0.0.0.0 255.255.255.255 host 10.9.9.9
+    """
+    assert _parsed(app, text) == ["10.1.0.0/16", "192.0.2.1/32", "10.0.0.0/24", "0.0.0.0/0",
+                                  "192.0.2.1/32", "0.0.0.0/0", "10.9.9.9/32"]
+
+def test_single_host_masks(app):
+    assert _parsed(app, "10.0.0.7 0.0.0.0\n10.0.0.8 255.255.255.255") == ["10.0.0.7/32", "10.0.0.8/32"]
+
+def test_neighbouring_addresses_are_not_mistaken_for_masks(app):
+    assert _parsed(app, "10.0.0.1 10.0.0.2, 192.168.1.0/24 2001:db8::/32") == [
+        "10.0.0.1/32", "10.0.0.2/32", "192.168.1.0/24", "2001:db8::/32"]
+
+def test_wildcard_overlap_report(app):
+    networks = [network for _token, network in app.parse_cidr_list("10.0.0.0 0.0.255.255\n10.0.5.0 0.0.0.255")[0]]
+    assert networks == [ipaddress.ip_network("10.0.0.0/16"), ipaddress.ip_network("10.0.5.0/24")]
+    assert app.find_cidr_overlaps(networks) == {1: ("inside", 0)}
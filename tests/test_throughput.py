@@ -0,0 +1,33 @@
+import socket
+import time
+
+import pytest
+
+@pytest.fixture
+def server(app):
+    server = app.ThroughputTestServer("127.0.0.1", 0, buffer_size=64 << 10)
+    server.start()
+    yield server
+    server.stop()
+    server.join(2)
+
+def test_loopback_throughput_run(app, server):
+    result = app.run_throughput_test(*server.address, total_bytes=8 << 20, pings=200, file_size=1 << 20)
+
+    assert result["bytes"] == 8 << 20
+    assert result["seconds"] > 0 and result["gbps"] > 0
+    assert result["server_seconds"] > 0
+    assert result["rtt"].total == 200
+    assert 0 < result["rtt"].percentile(50) <= result["rtt"].percentile(99)
+    assert "Gbit/s" in app.format_throughput_result(result)
+
+def test_server_survives_bad_client_and_serves_next(app, server):
+    with socket.create_connection(server.address, timeout=5) as sock:
+        sock.sendall(b"\0" * app._THROUGHPUT_HELLO.size) # Wrong magic
+
+    result = app.run_throughput_test(*server.address, total_bytes=1 << 20, pings=10, file_size=1 << 20)
+    assert result["rtt"].total == 10
+    deadline = time.monotonic() + 2 # The server counts the test after its last echo
+    while server.tests_served < 1 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert server.tests_served == 1